@@ -0,0 +1,7 @@
+"""
+Benchmarks for the MetaRepos event system.
+
+Run from the ``meta`` directory, e.g. ``python -m benchmarks.bench_batching``.
+``bench_load`` is the overall load generator; ``--check`` compares a run with
+the baselines stored in ``baselines/``.
+"""
@@ -0,0 +1,84 @@
+"""
+Throughput of batched versus unbatched publishing in distributed mode.
+
+Usage: python -m benchmarks.bench_batching [--events N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from core.events import Event, EventManager
+
+async def run(protocol: str, batch_size: int, count: int, port: int) -> Dict:
+    """Publish ``count`` events and measure delivered events per second."""
+    config = {
+        "events": {
+            "host": "127.0.0.1",
+            "port": port,
+            "protocol": protocol,
+            "batch_size": batch_size,
+            "batch_interval": 0.002,
+        }
+    }
+    manager = EventManager(config)
+    manager._local_mode = False
+    await manager.start()
+    
+    received = 0
+    done = asyncio.Event()
+    
+    def on_event(event: Event) -> None:
+        nonlocal received
+        received += 1
+        if received == count:
+            done.set()
+    
+    manager.subscribe("bench:fs:modified", on_event)
+    await asyncio.sleep(0.3)  # Let the subscription reach the publisher
+    
+    events = [
+        Event.create("bench:fs:modified", payload={"path": f"src/file_{i}.py"})
+        for i in range(count)
+    ]
+    
+    start = time.perf_counter()
+    for i, event in enumerate(events):
+        await manager.emit(event)
+        if i % 256 == 0:
+            # Give the receive loop a chance to drain the socket
+            await asyncio.sleep(0)
+    await manager.flush()
+    try:
+        await asyncio.wait_for(done.wait(), timeout=30)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - start
+    
+    await manager.stop()
+    return {
+        "protocol": protocol,
+        "batch_size": batch_size,
+        "delivered": received,
+        "events_per_sec": received / elapsed,
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    
+    port = 5700
+    print(f"{'protocol':<8} {'batch':>6} {'delivered':>10} {'events/s':>12}")
+    for protocol in ("tcp", "ipc"):
+        for batch_size in (0, args.batch_size):
+            result = await run(protocol, batch_size, args.events, port)
+            port += 1
+            print(
+                f"{result['protocol']:<8} {result['batch_size']:>6} "
+                f"{result['delivered']:>10} {result['events_per_sec']:>12,.0f}"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
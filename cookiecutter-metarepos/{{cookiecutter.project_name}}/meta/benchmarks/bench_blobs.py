@@ -0,0 +1,67 @@
+"""
+Emit-to-callback latency of large payloads over ipc.
+
+Compares sending the data inside the JSON payload, as a blob frame and as
+a shared memory handle.
+
+Usage: python -m benchmarks.bench_blobs [--events N] [--size BYTES]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict
+
+from core.events import Event, EventManager
+
+async def run(mode: str, count: int, size: int) -> Dict:
+    """Measure round trips of ``count`` events carrying ``size`` bytes."""
+    config = {
+        "events": {
+            "protocol": "ipc",
+            "port": f"bench-blobs-{mode}",
+            "blob_shm_threshold": 1 if mode == "shm" else 0,
+        }
+    }
+    manager = EventManager(config)
+    manager._local_mode = False
+    await manager.start()
+    
+    arrived = asyncio.Event()
+    manager.subscribe("bench:blobs:data", lambda event: arrived.set(), queue_size=0)
+    await asyncio.sleep(0.3)  # Let the subscription reach the publisher
+    
+    data = b"x" * size
+    samples = []
+    for _ in range(count):
+        arrived.clear()
+        start = time.perf_counter()
+        if mode == "payload":
+            event = Event.create("bench:blobs:data", payload={"data": data.decode()})
+        else:
+            event = Event.create("bench:blobs:data", blobs={"data": data})
+        await manager.emit(event)
+        await arrived.wait()
+        samples.append(time.perf_counter() - start)
+    
+    await manager.stop()
+    samples.sort()
+    return {
+        "mode": mode,
+        "p50_ms": statistics.median(samples) * 1e3,
+        "p99_ms": samples[int(len(samples) * 0.99)] * 1e3,
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--size", type=int, default=4 << 20)
+    args = parser.parse_args()
+    
+    print(f"{'mode':<8} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in ("payload", "blob", "shm"):
+        result = await run(mode, args.events, args.size)
+        print(f"{result['mode']:<8} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Encode/decode cost and size of each registered event codec.
+
+Usage: python -m benchmarks.bench_codecs [--events N]
+"""
+import argparse
+import time
+from typing import Dict
+
+from core.events import Event, get_codec
+from core.events.codec import _codecs
+
+SAMPLES = {
+    "fs event": Event.create(
+        "plugin:fs_monitor:modified",
+        payload={"path": "src/projects/api/handlers/users.py", "is_directory": False}
+    ),
+    "lifecycle": Event.create("core:system:startup"),
+    "task output": Event.create(
+        "plugin:tasks:finished",
+        metadata={"host": "build-01", "attempt": 1},
+        payload={"task": "test", "exit_code": 0, "output": ["line"] * 200}
+    ),
+}
+
+def measure(codec_name: str, event: Event, count: int) -> Dict:
+    """Time ``count`` encodes and decodes of one event."""
+    codec = get_codec(codec_name)
+    
+    start = time.perf_counter()
+    for _ in range(count):
+        data = codec.encode(event)
+    encode_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(count):
+        codec.decode(data)
+    decode_time = time.perf_counter() - start
+    
+    return {
+        "bytes": len(data),
+        "encode_us": encode_time / count * 1e6,
+        "decode_us": decode_time / count * 1e6,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50000)
+    args = parser.parse_args()
+    
+    print(f"{'sample':<12} {'codec':<8} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for sample, event in SAMPLES.items():
+        for codec_name in sorted(_codecs):
+            result = measure(codec_name, event, args.events)
+            print(
+                f"{sample:<12} {codec_name:<8} {result['bytes']:>7} "
+                f"{result['encode_us']:>10.2f} {result['decode_us']:>10.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+CPU cost of compressing event messages against the bytes it saves.
+
+Encodes batches of fs events of increasing size, compresses them at a few
+zlib levels and reports the ratio, the time to compress and decompress, and
+the link speed below which compression pays for itself (the wire time
+saved exceeds the CPU time spent on both ends).
+
+Usage: python -m benchmarks.bench_compression [--repeat N]
+"""
+import argparse
+import hashlib
+import random
+import time
+import zlib
+from typing import Dict
+
+from core.events import Event, get_codec
+
+SIZES = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20)
+LEVELS = (1, 6)
+
+def make_event(size: int, rng: random.Random) -> Event:
+    """Build an fs batch event whose JSON encoding is about ``size`` bytes."""
+    dirs = ["src", "src/core", "src/core/events", "tests", "docs", "plugins/fs_monitor"]
+    changes = []
+    encoded = 0
+    while encoded < size:
+        path = f"{rng.choice(dirs)}/{rng.choice(['main', 'util', 'schema', 'test_io'])}{rng.randrange(500)}.py"
+        change = {
+            "path": path,
+            "type": rng.choice(["created", "modified", "deleted"]),
+            "is_directory": False,
+            "size": rng.randrange(1 << 20),
+            "sha1": hashlib.sha1(path.encode() + bytes([rng.randrange(256)])).hexdigest(),
+        }
+        changes.append(change)
+        encoded += 150
+    return Event.create("plugin:fs_monitor:batch", payload={"changes": changes})
+
+def measure(data: bytes, level: int, repeat: int) -> Dict[str, float]:
+    """Time compressing and decompressing one message."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = zlib.compress(data, level)
+    compress_time = (time.perf_counter() - start) / repeat
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        zlib.decompress(compressed)
+    decompress_time = (time.perf_counter() - start) / repeat
+    
+    saved = len(data) - len(compressed)
+    cpu = compress_time + decompress_time
+    return {
+        "ratio": len(compressed) / len(data),
+        "compress_us": compress_time * 1e6,
+        "decompress_us": decompress_time * 1e6,
+        # Link speed at which sending the saved bytes takes as long as the CPU work
+        "break_even_mbit": saved * 8 / cpu / 1e6 if cpu else float("inf"),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    
+    codec = get_codec("json")
+    rng = random.Random(42)
+    print(
+        f"{'size':>8} {'level':>5} {'ratio':>6} {'comp us':>9} "
+        f"{'decomp us':>9} {'pays below Mbit/s':>17}"
+    )
+    for size in SIZES:
+        data = codec.serialize(make_event(size, rng))
+        for level in LEVELS:
+            result = measure(data, level, args.repeat)
+            print(
+                f"{len(data):>8} {level:>5} {result['ratio']:>6.2f} "
+                f"{result['compress_us']:>9.1f} {result['decompress_us']:>9.1f} "
+                f"{result['break_even_mbit']:>17.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Memory and decode cost of Event against the former dataclass layout.
+
+The reference is the previous Event: a dataclass holding a datetime, eager
+metadata and payload dicts, a blobs dict and a cache dict, decoded in full
+by the binary codec. Reported for events created locally and for events
+decoded from the wire: bytes held per queued event (tracemalloc) and the
+decode time when a subscriber reads only the namespace, or the payload too.
+
+Usage: python -m benchmarks.bench_events [--events N]
+"""
+import argparse
+import json
+import struct
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from core.events import Event, get_codec
+
+_EPOCH = datetime(1970, 1, 1)
+_envelope = struct.Struct("!dHII")
+
+@dataclass
+class LegacyEvent:
+    """The former Event layout."""
+    namespace: str
+    timestamp: datetime
+    metadata: Optional[Dict] = None
+    payload: Optional[Dict] = None
+    blobs: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    _serialized: Dict[str, bytes] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        self.metadata = self.metadata or {}
+        self.payload = self.payload or {}
+
+def legacy_create(namespace: str, payload: Dict) -> LegacyEvent:
+    """Create an event as the former Event.create did."""
+    return LegacyEvent(
+        namespace=namespace, timestamp=datetime.utcnow(), metadata={}, payload=payload, blobs={}
+    )
+
+def legacy_decode(data: bytes) -> LegacyEvent:
+    """Decode a binary codec message as the former codec did."""
+    view = memoryview(data)
+    timestamp, ns_len, meta_len, payload_len = _envelope.unpack_from(view)
+    offset = _envelope.size
+    namespace = bytes(view[offset:offset + ns_len]).decode()
+    offset += ns_len
+    metadata = json.loads(bytes(view[offset:offset + meta_len])) if meta_len else {}
+    offset += meta_len
+    payload = json.loads(bytes(view[offset:offset + payload_len])) if payload_len else {}
+    event = LegacyEvent(
+        namespace=namespace,
+        timestamp=_EPOCH + timedelta(seconds=timestamp),
+        metadata=metadata,
+        payload=payload
+    )
+    event._serialized["binary"] = data
+    return event
+
+def sample_payload(i: int) -> Dict[str, Any]:
+    """Return the payload of a typical file event."""
+    return {"path": f"src/projects/api/handlers/users_{i}.py", "is_directory": False}
+
+def held_bytes(build: Callable[[int], Any], count: int) -> float:
+    """Return the bytes allocated per object while ``count`` of them are held."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / count
+
+def per_event_us(run: Callable[[], None], count: int) -> float:
+    """Return the time per event of a loop over ``count`` events."""
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) / count * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+    count = args.events
+    
+    codec = get_codec("binary")
+    namespace = "plugin:fs_monitor:modified"
+    messages: List[bytes] = [
+        codec.encode(Event.create(namespace, payload=sample_payload(i))) for i in range(count)
+    ]
+    
+    def read_namespace(decode: Callable[[bytes], Any]) -> Callable[[], None]:
+        def run() -> None:
+            for data in messages:
+                decode(data).namespace
+        return run
+    
+    def read_payload(decode: Callable[[bytes], Any]) -> Callable[[], None]:
+        def run() -> None:
+            for data in messages:
+                decode(data).payload["path"]
+        return run
+    
+    rows = [
+        ("created, bytes held",
+         held_bytes(lambda i: legacy_create(namespace, sample_payload(i)), count),
+         held_bytes(lambda i: Event.create(namespace, payload=sample_payload(i)), count)),
+        ("decoded, bytes held",
+         held_bytes(lambda i: legacy_decode(messages[i]), count),
+         held_bytes(lambda i: codec.deserialize(messages[i]), count)),
+        ("decode + namespace, us",
+         per_event_us(read_namespace(legacy_decode), count),
+         per_event_us(read_namespace(codec.deserialize), count)),
+        ("decode + payload, us",
+         per_event_us(read_payload(legacy_decode), count),
+         per_event_us(read_payload(codec.deserialize), count)),
+    ]
+    
+    print(f"{'measure':<24} {'dataclass':>10} {'Event':>10} {'change':>8}")
+    for name, legacy, current in rows:
+        print(f"{name:<24} {legacy:>10.2f} {current:>10.2f} {current / legacy - 1:>+8.0%}")
+
+if __name__ == "__main__":
+    main()
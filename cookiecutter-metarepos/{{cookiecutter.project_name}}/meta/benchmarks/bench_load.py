@@ -0,0 +1,254 @@
+"""
+Load generator for EventManager, with stored baselines.
+
+Each scenario runs producers emitting events round-robin over ``fanout``
+namespaces and consumers subscribed to one namespace each, in local mode
+or over tcp or ipc. Reported per scenario: delivered events per second,
+emit-to-callback latency percentiles and the peak RSS of the process.
+Every scenario runs in a fresh process so memory figures do not carry
+over between them.
+
+Results can be saved as baselines and later runs checked against them;
+a check fails (exit status 1) when throughput drops or p99 latency rises
+by more than the tolerance. Baselines are machine specific; the stored
+one records the machine it was taken on.
+
+Usage:
+    python -m benchmarks.bench_load [--scenario NAME ...]
+        [--mode MODE] [--producers N] [--consumers N] [--payload BYTES]
+        [--fanout N] [--events N] [--save | --check] [--tolerance FRACTION]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.events import Event, EventManager
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "bench_load.json"
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "local-1p-4c": {
+        "mode": "local", "producers": 1, "consumers": 4, "payload": 64, "fanout": 4,
+        "events": 20000,
+    },
+    "local-4p-16c-fanout": {
+        "mode": "local", "producers": 4, "consumers": 16, "payload": 256, "fanout": 8,
+        "events": 20000,
+    },
+    "ipc-1p-4c": {
+        "mode": "ipc", "producers": 1, "consumers": 4, "payload": 64, "fanout": 4,
+        "events": 20000,
+    },
+    "ipc-4p-4c-16k": {
+        "mode": "ipc", "producers": 4, "consumers": 4, "payload": 16384, "fanout": 4,
+        "events": 5000,
+    },
+    "tcp-1p-4c": {
+        "mode": "tcp", "producers": 1, "consumers": 4, "payload": 64, "fanout": 4,
+        "events": 20000,
+    },
+    "tcp-4p-16c-fanout": {
+        "mode": "tcp", "producers": 4, "consumers": 16, "payload": 256, "fanout": 8,
+        "events": 20000,
+    },
+}
+
+MODES = ("local", "tcp", "ipc")
+
+PARAMETERS = ("mode", "producers", "consumers", "payload", "fanout", "events")
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return a percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+async def run(name: str, scenario: Dict[str, Any], port: int) -> Dict[str, Any]:
+    """Run one scenario and return its measurements."""
+    mode = scenario["mode"]
+    fanout = scenario["fanout"]
+    config: Dict[str, Any] = {"events": {"host": "127.0.0.1", "port": port, "protocol": "tcp"}}
+    if mode == "ipc":
+        config["events"].update({"protocol": "ipc", "port": f"bench-load-{port}"})
+    manager = EventManager(config)
+    manager._local_mode = mode == "local"
+    await manager.start()
+    
+    namespaces = [f"bench:load:n{i}" for i in range(fanout)]
+    subscribers = [0] * fanout
+    for consumer in range(scenario["consumers"]):
+        subscribers[consumer % fanout] += 1
+    
+    # Every event reaches the consumers of its namespace
+    count = scenario["events"]
+    expected = sum(subscribers[i % fanout] for i in range(count))
+    latencies: List[float] = []
+    done = asyncio.Event()
+    
+    def on_event(event: Event) -> None:
+        latencies.append(time.perf_counter() - event.payload["t"])
+        if len(latencies) == expected:
+            done.set()
+    
+    for consumer in range(scenario["consumers"]):
+        manager.subscribe(namespaces[consumer % fanout], on_event)
+    if mode != "local":
+        await asyncio.sleep(0.3)  # Let the subscriptions reach the publisher
+    
+    filler = "x" * scenario["payload"]
+    
+    async def produce(producer: int) -> None:
+        for i in range(producer, count, scenario["producers"]):
+            payload = {"t": time.perf_counter(), "data": filler}
+            await manager.emit(Event.create(namespaces[i % fanout], payload=payload))
+            if i % 64 == producer:
+                # Give the receive loop and queue workers a chance to run
+                await asyncio.sleep(0)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(produce(p) for p in range(scenario["producers"])))
+    await manager.flush()
+    try:
+        await asyncio.wait_for(done.wait(), timeout=30)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - start
+    await manager.stop()
+    
+    latencies.sort()
+    return {
+        "scenario": name,
+        **scenario,
+        "delivered": len(latencies),
+        "lost": expected - len(latencies),
+        "events_per_sec": round(len(latencies) / elapsed),
+        "p50_us": round(percentile(latencies, 0.50) * 1e6),
+        "p99_us": round(percentile(latencies, 0.99) * 1e6),
+        "p999_us": round(percentile(latencies, 0.999) * 1e6),
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / (1 << 20 if sys.platform == "darwin" else 1 << 10),
+            1
+        ),
+    }
+
+def run_isolated(name: str, scenario: Dict[str, Any], port: int) -> Dict[str, Any]:
+    """Run a scenario in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_sync, name, scenario, port).result()
+
+def _run_sync(name: str, scenario: Dict[str, Any], port: int) -> Dict[str, Any]:
+    return asyncio.run(run(name, scenario, port))
+
+def check(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+    """
+    Return a description of every regression against the baseline.
+    
+    Scenarios missing from the baseline or run with other parameters are
+    not compared.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline["results"].get(result["scenario"])
+        if expected is None or any(expected[key] != result[key] for key in PARAMETERS):
+            continue
+        floor = expected["events_per_sec"] * (1 - tolerance)
+        if result["events_per_sec"] < floor:
+            regressions.append(
+                f"{result['scenario']}: {result['events_per_sec']:,.0f} events/s "
+                f"< {floor:,.0f} (baseline {expected['events_per_sec']:,.0f})"
+            )
+        ceiling = expected["p99_us"] * (1 + tolerance)
+        if result["p99_us"] > ceiling:
+            regressions.append(
+                f"{result['scenario']}: p99 {result['p99_us']:,.0f} us "
+                f"> {ceiling:,.0f} (baseline {expected['p99_us']:,.0f})"
+            )
+        if result["lost"] > expected["lost"]:
+            regressions.append(
+                f"{result['scenario']}: lost {result['lost']} events "
+                f"(baseline {expected['lost']})"
+            )
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--mode", choices=MODES, help="override the transport")
+    for option in PARAMETERS[1:]:
+        parser.add_argument(f"--{option}", type=int, help=f"override {option}")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--save", action="store_true", help="store results as the baseline")
+    action.add_argument("--check", action="store_true", help="compare results with the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="allowed throughput drop and p99 increase (default 0.3)")
+    args = parser.parse_args()
+    
+    overrides = {
+        option: getattr(args, option)
+        for option in PARAMETERS
+        if getattr(args, option) is not None
+    }
+    if overrides.get("fanout", 1) < 1:
+        parser.error("--fanout must be at least 1")
+    if args.save and overrides:
+        parser.error("baselines are only saved for unmodified scenarios")
+    
+    print(
+        f"{'scenario':<22} {'events/s':>10} {'p50 us':>9} {'p99 us':>9} "
+        f"{'p999 us':>9} {'lost':>6} {'rss MB':>7}"
+    )
+    results = []
+    for port, name in enumerate(args.scenario or SCENARIOS, start=5780):
+        result = run_isolated(name, {**SCENARIOS[name], **overrides}, port)
+        results.append(result)
+        print(
+            f"{name:<22} {result['events_per_sec']:>10,.0f} {result['p50_us']:>9.0f} "
+            f"{result['p99_us']:>9.0f} {result['p999_us']:>9.0f} {result['lost']:>6} "
+            f"{result['peak_rss_mb']:>7.1f}"
+        )
+    
+    if args.save:
+        baseline: Dict[str, Any] = {"results": {}}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        baseline["machine"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "cpus": multiprocessing.cpu_count(),
+        }
+        baseline["results"].update({result["scenario"]: result for result in results})
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+    elif args.check:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}; run with --save first")
+        regressions = check(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Round-trip latency and throughput of RPC calls over each transport.
+
+Latency is measured with one call in flight at a time; throughput with
+``--concurrency`` calls in flight.
+
+Usage: python -m benchmarks.bench_rpc [--calls N] [--concurrency N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict
+
+from core.events import RPCClient, RPCServer
+
+async def run(protocol: str, count: int, concurrency: int, port: int) -> Dict:
+    """Measure ``count`` calls of an echo method over one transport."""
+    config = {
+        "events": {
+            "host": "127.0.0.1",
+            "port": port,
+            "protocol": protocol,
+        }
+    }
+    server = RPCServer(config)
+    client = RPCClient(config)
+    
+    async def echo(params: Dict) -> Dict:
+        return params
+    
+    server.register("bench:rpc:echo", echo)
+    await server.start()
+    await client.start()
+    params = {"value": "x" * 64}
+    await client.call("bench:rpc:echo", params)  # Establish the connection
+    
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await client.call("bench:rpc:echo", params)
+        samples.append(time.perf_counter() - start)
+    
+    async def worker(calls: int) -> None:
+        for _ in range(calls):
+            await client.call("bench:rpc:echo", params)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(count // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    await client.stop()
+    await server.stop()
+    samples.sort()
+    return {
+        "protocol": protocol,
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+        "calls_per_sec": (count // concurrency) * concurrency / elapsed,
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    
+    print(f"{'protocol':<8} {'p50 us':>9} {'p99 us':>9} {'calls/s':>10}")
+    for port, protocol in enumerate(("tcp", "ipc", "inproc"), start=5720):
+        result = await run(protocol, args.calls, args.concurrency, port)
+        print(
+            f"{result['protocol']:<8} {result['p50_us']:>9.1f} "
+            f"{result['p99_us']:>9.1f} {result['calls_per_sec']:>10.0f}"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Emit-to-callback latency of each transport in distributed mode.
+
+Events are sent one at a time and the next is emitted only once the
+previous one reached its subscriber, so the numbers are per-message
+latency rather than throughput.
+
+Usage: python -m benchmarks.bench_transports [--events N] [--payload BYTES]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict
+
+from core.events import Event, EventManager
+
+async def run(protocol: str, count: int, payload_size: int, port: int) -> Dict:
+    """Measure round trips of ``count`` events over one transport."""
+    config = {
+        "events": {
+            "host": "127.0.0.1",
+            "port": port,
+            "protocol": protocol,
+        }
+    }
+    manager = EventManager(config)
+    manager._local_mode = False
+    await manager.start()
+    
+    arrived = asyncio.Event()
+    manager.subscribe("bench:latency:ping", lambda event: arrived.set(), queue_size=0)
+    await asyncio.sleep(0.3)  # Let the subscription reach the publisher
+    
+    payload = {"data": "x" * payload_size}
+    samples = []
+    for _ in range(count):
+        arrived.clear()
+        event = Event.create("bench:latency:ping", payload=payload)
+        start = time.perf_counter()
+        await manager.emit(event)
+        await arrived.wait()
+        samples.append(time.perf_counter() - start)
+    
+    await manager.stop()
+    samples.sort()
+    return {
+        "protocol": protocol,
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--payload", type=int, default=64)
+    args = parser.parse_args()
+    
+    print(f"{'protocol':<8} {'p50 us':>9} {'p99 us':>9}")
+    for port, protocol in enumerate(("tcp", "ipc", "inproc"), start=5710):
+        result = await run(protocol, args.events, args.payload, port)
+        print(f"{result['protocol']:<8} {result['p50_us']:>9.1f} {result['p99_us']:>9.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
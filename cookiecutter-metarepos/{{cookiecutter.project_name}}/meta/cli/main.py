@@ -245,6 +245,225 @@ def disable(plugin_name: str) -> None:
     except Exception as e:
         console.print(f"[red]Error disabling plugin '{plugin_name}': {e}[/red]")
 
+@cli.group()
+def events() -> None:
+    """Inspect and run the MetaRepos event bus."""
+    pass
+
+@events.command()
+@click.option("--stats-interval", default=5.0, show_default=True,
+              help="Seconds between printed broker statistics (0 disables).")
+def broker(stats_interval: float) -> None:
+    """Run a shared event broker for all MetaRepos processes."""
+    import asyncio
+    
+    from core.events import EventBroker
+    
+    config = load_config()
+    
+    async def run() -> None:
+        event_broker = EventBroker(config)
+        await event_broker.start()
+        console.print(
+            f"[green]Event broker running[/green] "
+            f"(publishers: {event_broker.frontend_address}, "
+            f"subscribers: {event_broker.backend_address})"
+        )
+        try:
+            while True:
+                await asyncio.sleep(stats_interval or 3600)
+                if stats_interval:
+                    stats = event_broker.stats()
+                    counts = [f"{stats['messages_per_sec']:.0f} msg/s"]
+                    # Peers are not counted on inproc addresses
+                    for peers in ("publishers", "subscribers"):
+                        if stats[peers] is not None:
+                            counts.append(f"{stats[peers]} {peers}")
+                    counts.append(f"{stats['messages']} messages total")
+                    console.print(", ".join(counts))
+        finally:
+            await event_broker.stop()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        console.print("[yellow]Event broker stopped[/yellow]")
+    except Exception as e:
+        console.print(f"[red]Error running event broker: {e}[/red]")
+
+@events.command(name="stats")
+@click.option("--address", default=None,
+              help="RPC address of the process to query (defaults to the [events] settings).")
+@click.option("--timeout", default=5.0, show_default=True,
+              help="Seconds to wait for an answer.")
+def event_stats(address: Optional[str], timeout: float) -> None:
+    """
+    Show event counters and latency histograms of a running bus.
+    
+    The process queried must serve them: set stats_rpc = true in the
+    [events] section of metarepo.toml.
+    """
+    import asyncio
+    
+    from core.events import RPCClient
+    
+    config = load_config()
+    
+    async def fetch() -> dict:
+        client = RPCClient(config, address)
+        await client.start()
+        try:
+            stats: dict = await client.call("core:events:stats", timeout=timeout)
+            return stats
+        finally:
+            await client.stop()
+    
+    try:
+        stats = asyncio.run(fetch())
+    except Exception as e:
+        console.print(f"[red]Could not read event statistics: {e}[/red]")
+        return
+    
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:.3f}"
+    
+    # Events in are emitted here or received from the bus, events out are
+    # delivered to callbacks; dropped includes suppressed and duplicate events
+    table = Table(title=f"Events ({stats['address']})")
+    table.add_column("Namespace", style="cyan", no_wrap=True)
+    for column in ("In", "Out", "Dropped", "Errors", "Latency p99 ms", "Callback p99 ms",
+                   "Encode p99 ms"):
+        table.add_column(column, justify="right")
+    
+    for namespace, data in stats["namespaces"].items():
+        table.add_row(
+            namespace,
+            str(data["emitted"] + data["received"]),
+            str(data["delivered"]),
+            str(data["dropped"] + data["suppressed"] + data["duplicates"]),
+            str(data["errors"]),
+            ms(data["latency"]["p99"]),
+            ms(data["callback"]["p99"]),
+            ms(data["serialize"]["p99"]),
+        )
+    console.print(table)
+    
+    table = Table(title="Subscribers")
+    table.add_column("Pattern", style="cyan", no_wrap=True)
+    table.add_column("Callback")
+    for column in ("Depth", "Out", "Dropped", "Errors", "Queue p99 ms", "Callback p99 ms"):
+        table.add_column(column, justify="right")
+    
+    for data in stats["subscriptions"]:
+        table.add_row(
+            data["pattern"],
+            data["callback"],
+            f"{data['depth']}/{data['capacity']}",
+            str(data["delivered"]),
+            str(data["dropped"]),
+            str(data["errors"]),
+            ms(data["queue_time"]["p99"]),
+            ms(data["callback_time"]["p99"]),
+        )
+    console.print(table)
+    
+    # Lag is how late this process receives each peer, consumer lag how late
+    # the peer receives this process
+    heartbeat = stats.get("heartbeat") or {}
+    if heartbeat.get("peers"):
+        table = Table(title=f"Peers (lag {ms(heartbeat['lag'])} ms, policy {heartbeat['policy']})")
+        table.add_column("Peer", style="cyan", no_wrap=True)
+        for column in ("Seen s ago", "Lag ms", "Consumer lag ms", "Backlog"):
+            table.add_column(column, justify="right")
+        table.add_column("Status")
+        
+        for peer, data in heartbeat["peers"].items():
+            consumer_lag = data["consumer_lag"]
+            table.add_row(
+                peer,
+                f"{data['last_seen']:.1f}",
+                ms(data["lag"]),
+                "-" if consumer_lag is None else ms(consumer_lag),
+                str(data["backlog"]),
+                "[red]stale[/red]" if data["stale"] else "[green]live[/green]",
+            )
+        console.print(table)
+
+@events.command()
+@click.argument("pattern", default="*:*:*")
+@click.option("--since", default="0", show_default=True,
+              help="Log offset or ISO timestamp (UTC) to replay from.")
+@click.option("--follow/--no-follow", default=None,
+              help="Keep printing live events from the bus after the backlog "
+                   "(needs the broker; the default when broker = true).")
+def tail(pattern: str, since: str, follow: Optional[bool]) -> None:
+    """Print logged events since an offset or timestamp, then live ones."""
+    import asyncio
+    from datetime import datetime
+    
+    from rich.markup import escape
+    
+    from core.events import Event, EventLogReader, EventManager
+    
+    config = load_config()
+    log_path = get_log_dir() / "events.log"
+    
+    offset, start = 0, None
+    try:
+        if since.isdigit():
+            offset = int(since)
+        else:
+            start = datetime.fromisoformat(since)
+    except ValueError:
+        console.print(f"[red]Invalid --since value: {since}[/red]")
+        return
+    
+    # Following joins the bus as one more process, which only works through
+    # the broker: without it the bus address belongs to the daemon's
+    # publisher
+    broker = bool(config.get("events", {}).get("broker", False))
+    if follow is None:
+        follow = broker
+    elif follow and not broker:
+        console.print(
+            "[red]--follow requires the event broker: set broker = true in [events] "
+            "and run 'metarepos events broker', or use --no-follow[/red]"
+        )
+        return
+    
+    def show(event: Event) -> None:
+        timestamp = event.timestamp
+        console.print(
+            f"{timestamp.isoformat() if timestamp else '-'} [cyan]{event.namespace}[/cyan] "
+            f"{escape(str(event.payload))}",
+            highlight=False
+        )
+    
+    async def run() -> None:
+        if not follow:
+            reader = EventLogReader(
+                log_path, int(config.get("events", {}).get("log_backup_count", 5))
+            )
+            for _, _, event in reader.read(pattern, start, offset):
+                show(event)
+            return
+        
+        manager = EventManager(config)
+        manager._local_mode = False  # Receive events from the bus
+        await manager.start()
+        try:
+            await manager.subscribe_since(pattern, show, start, offset, log_path=log_path)
+            await asyncio.Event().wait()
+        finally:
+            await manager.stop()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        console.print(f"[red]Error reading events: {e}[/red]")
+
 def main():
     """Main entry point."""
     try:
@@ -2,19 +2,63 @@
 Event management system for MetaRepos.
 
 This package provides the core event management functionality including:
-- Event schema definitions
-- ZeroMQ-based pub/sub event distribution
-- Event logging and rotation
+- Compact event schema, with payloads decoded on first access
+- A registry validating and numbering each event namespace once
+- ZeroMQ-based pub/sub event distribution, optionally through a shared broker
+- Pluggable wire codecs, with binary blobs sent as separate frames and
+  large messages compressed
+- Wildcard subscriptions backed by a namespace trie, with payload filters
+- Coalescing of event bursts by key, rate limiting and sampling
+- Dropping of duplicate events by idempotency key
+- Latency histograms and counters per namespace and subscriber
+- Peer heartbeats with lag tracking and slow consumer policies
+- Event logging and rotation, with a background group-commit writer
+- Replay from the event log, handing over to live delivery
+- Request/reply calls between plugins
 """
 
+from .broker import EventBroker
+from .coalesce import CoalesceRule
+from .codec import BinaryCodec, Codec, JSONCodec, get_codec, register_codec
+from .dispatch import Subscription
+from .filters import Predicate
+from .limits import EventLimit
 from .logger import EventLogger
 from .manager import EventManager
-from .schema import Event, CORE_EVENTS, validate_event_namespace
+from .registry import NamespaceRegistry, namespace_registry
+from .replay import EventLogReader
+from .rpc import RPCClient, RPCError, RPCServer, RPCTimeout
+from .schema import (Event, CORE_EVENTS, validate_event_namespace,
+                     validate_subscription_pattern)
+from .transport import shared_context
+from .trie import NamespaceTrie
+from .writer import EventLogWriter
 
 __all__ = [
+    'BinaryCodec',
+    'CoalesceRule',
+    'Codec',
     'Event',
+    'EventBroker',
+    'EventLimit',
     'EventLogger',
+    'EventLogReader',
+    'EventLogWriter',
     'EventManager',
+    'JSONCodec',
+    'NamespaceRegistry',
+    'NamespaceTrie',
+    'Predicate',
+    'RPCClient',
+    'RPCError',
+    'RPCServer',
+    'RPCTimeout',
+    'Subscription',
     'CORE_EVENTS',
     'validate_event_namespace',
+    'validate_subscription_pattern',
+    'get_codec',
+    'namespace_registry',
+    'register_codec',
+    'shared_context',
 ]
\ No newline at end of file
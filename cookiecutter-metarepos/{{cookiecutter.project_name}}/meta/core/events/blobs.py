@@ -0,0 +1,141 @@
+"""
+Binary blobs sent next to events as raw frames or shared memory handles.
+"""
+import asyncio
+import json
+import logging
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+import zmq
+
+from .schema import Event
+
+logger = logging.getLogger(__name__)
+
+# Codec header flag marking a message followed by blob frames
+FLAG_BLOBS = 0x01
+
+# A received frame: bytes, or a zmq.Frame when received without copying
+Received = Union[bytes, zmq.Frame]
+
+# Segments created by this process, tracked by its own resource tracker
+_exported: Set[str] = set()
+
+class BlobStore:
+    """
+    Exports large blobs to shared memory segments for same-host peers.
+    
+    Only a handle is published for blobs of ``threshold`` bytes or more
+    (0 disables shared memory). Receivers attach to a segment as soon as
+    the message arrives, so the publisher unlinks it after ``ttl`` seconds;
+    a receiver's mapping stays valid after the unlink.
+    """
+    
+    def __init__(self, threshold: int = 0, ttl: float = 10.0):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.exported = 0
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+    
+    def wants(self, data: Any) -> bool:
+        """Whether a blob should travel through shared memory."""
+        return bool(self.threshold) and memoryview(data).nbytes >= self.threshold
+    
+    def export(self, data: Any) -> Dict[str, Any]:
+        """Copy a blob into a new segment and return its handle."""
+        view = memoryview(data).cast("B")
+        segment = shared_memory.SharedMemory(create=True, size=max(1, view.nbytes))
+        _buffer(segment)[:view.nbytes] = view
+        self._segments[segment.name] = segment
+        _exported.add(segment.name)
+        asyncio.get_running_loop().call_later(self.ttl, self.release, segment.name)
+        self.exported += 1
+        return {"shm": segment.name, "size": view.nbytes}
+    
+    def release(self, name: str) -> None:
+        """Unlink a segment published earlier."""
+        segment = self._segments.pop(name, None)
+        if segment is None:
+            return
+        _exported.discard(name)
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def close(self) -> None:
+        """Unlink every segment still held."""
+        for name in list(self._segments):
+            self.release(name)
+
+def pack_blobs(event: Event, store: Optional[BlobStore] = None) -> List[Any]:
+    """
+    Return the frames carrying the blobs of an event.
+    
+    The first frame is a JSON index of the blobs; blobs sent inline follow
+    in index order, others are replaced by a shared memory handle.
+    """
+    index = []
+    frames: List[Any] = []
+    for name, data in event.blobs.items():
+        if store and store.wants(data):
+            index.append({"name": name, **store.export(data)})
+        else:
+            index.append({"name": name, "size": memoryview(data).nbytes})
+            frames.append(data)
+    return [json.dumps(index).encode(), *frames]
+
+def frame_bytes(frame: Received) -> bytes:
+    """Return the contents of a received frame as bytes."""
+    return frame.bytes if isinstance(frame, zmq.Frame) else frame
+
+def unpack_blobs(event: Event, frames: Sequence[Received]) -> None:
+    """
+    Attach the blobs carried by ``frames`` to an event as memoryviews.
+    
+    Frames received without copying are attached as views of the ZMQ
+    messages. Raises ``FileNotFoundError`` when a shared memory segment has
+    already been released by its publisher.
+    """
+    index = json.loads(frame_bytes(frames[0]))
+    inline = iter(frames[1:])
+    for entry in index:
+        if "shm" in entry:
+            event.blobs[entry["name"]] = _attach(entry["shm"], entry["size"])
+        else:
+            frame = next(inline)
+            event.blobs[entry["name"]] = (
+                frame.buffer if isinstance(frame, zmq.Frame) else memoryview(frame)
+            )
+
+class _AttachedSegment(shared_memory.SharedMemory):
+    """A segment owned by another process, mapped for as long as views of it exist."""
+    
+    def close(self) -> None:
+        try:
+            super().close()
+        except BufferError:
+            # Blob views still use the mapping; it is unmapped along with
+            # the last of them
+            self._mmap = None
+            super().close()
+
+def _attach(name: str, size: int) -> memoryview:
+    """Map a segment published by another process and return a view of it."""
+    segment = _AttachedSegment(name=name)
+    if name not in _exported:
+        # The publisher unlinks its segments; stop this process's resource
+        # tracker from unlinking (and warning about) them at exit. Segments
+        # are tracked under their POSIX name, with a leading slash
+        resource_tracker.unregister(f"/{segment.name}", "shared_memory")
+    view = _buffer(segment)[:size]
+    segment.close()
+    return view
+
+def _buffer(segment: shared_memory.SharedMemory) -> memoryview:
+    """Return the mapping of an open segment."""
+    if segment.buf is None:
+        raise ValueError(f"Shared memory segment {segment.name} is closed")
+    return segment.buf
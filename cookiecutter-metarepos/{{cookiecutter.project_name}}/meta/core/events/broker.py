@@ -0,0 +1,246 @@
+"""
+XPUB/XSUB broker letting several MetaRepos processes share one event bus.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import zmq
+from zmq.asyncio import Context
+
+from .transport import broker_addresses, shared_context
+
+logger = logging.getLogger(__name__)
+
+class EventBroker:
+    """
+    Forwards events between every connected EventManager.
+    
+    The XSUB/XPUB forwarding runs in libzmq's steerable proxy on a
+    dedicated thread. A copy of the traffic is published on a capture
+    socket, which the asyncio side reads to count messages and
+    subscriptions; capture is lossy under extreme load so it can never
+    stall forwarding. The XPUB side passes on every subscribe and
+    unsubscribe, so a topic's count is the number of subscriber sockets
+    holding it. Socket monitors track connected publishers and
+    subscribers; they do not see ``inproc`` connections, so peer counts
+    are None on an ``inproc`` side. The broker uses the process-wide
+    shared context, so same-process managers can reach it over ``inproc``.
+    """
+    
+    def __init__(self, config: Dict, stats_interval: float = 1.0):
+        self.frontend_address, self.backend_address = broker_addresses(config)
+        self.stats_interval = stats_interval
+        self.messages = 0
+        self.bytes = 0
+        self.messages_per_sec = 0.0
+        self.bytes_per_sec = 0.0
+        self.publishers: Optional[int] = _peer_count(self.frontend_address)
+        self.subscribers: Optional[int] = _peer_count(self.backend_address)
+        self.subscriptions: Dict[bytes, int] = {}
+        self._started_at: Optional[float] = None
+        self._context: Optional[zmq.Context] = None
+        self._async_context: Optional[Context] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: List[asyncio.Task] = []
+        self._control: Optional[zmq.asyncio.Socket] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._id = f"{id(self):x}"
+    
+    @property
+    def running(self) -> bool:
+        """Whether the proxy thread is forwarding messages."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return throughput, peer and subscription counters."""
+        return {
+            "frontend": self.frontend_address,
+            "backend": self.backend_address,
+            "uptime": time.monotonic() - self._started_at if self._started_at else 0.0,
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "messages_per_sec": self.messages_per_sec,
+            "bytes_per_sec": self.bytes_per_sec,
+            "publishers": self.publishers,
+            "subscribers": self.subscribers,
+            "subscriptions": {
+                topic.decode(errors="replace"): count
+                for topic, count in self.subscriptions.items()
+            },
+        }
+    
+    async def start(self) -> None:
+        """Bind the broker sockets and start forwarding."""
+        if self.running:
+            return
+        
+        self._async_context = shared_context()
+        self._context = zmq.Context.shadow(self._async_context.underlying)
+        
+        capture = self._async_context.socket(zmq.SUB)
+        capture.setsockopt(zmq.RCVHWM, 100000)
+        capture.setsockopt(zmq.SUBSCRIBE, b"")
+        capture.connect(self._inproc("capture"))
+        
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._proxy, args=(self._context,), name="metarepos-event-broker", daemon=True
+        )
+        self._thread.start()
+        await asyncio.to_thread(self._ready.wait)
+        if self._error:
+            capture.close(linger=0)
+            self._thread.join()
+            self._thread = None
+            self._context = None
+            self._async_context = None
+            raise self._error
+        
+        self._control = self._async_context.socket(zmq.PAIR)
+        self._control.connect(self._inproc("control"))
+        
+        self._started_at = time.monotonic()
+        self._tasks = [
+            asyncio.create_task(self._count_traffic(capture)),
+            asyncio.create_task(self._sample_rates()),
+        ]
+        for side, counter in (("frontend", "publishers"), ("backend", "subscribers")):
+            if getattr(self, counter) is None:
+                continue
+            monitor = self._async_context.socket(zmq.PAIR)
+            monitor.connect(self._inproc(side))
+            self._tasks.append(asyncio.create_task(self._watch_peers(monitor, counter)))
+        logger.info(
+            f"Event broker started: publishers -> {self.frontend_address}, "
+            f"subscribers -> {self.backend_address}"
+        )
+    
+    async def stop(self) -> None:
+        """Stop forwarding and release the broker sockets."""
+        if not self._thread or not self._control:
+            return
+        
+        await self._control.send(b"TERMINATE")
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        self._control.close(linger=0)
+        self._control = None
+        self._context = None
+        self._async_context = None
+        logger.info("Event broker stopped")
+    
+    async def run(self) -> None:
+        """Run the broker until cancelled."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+    
+    def _inproc(self, name: str) -> str:
+        """Address of an internal socket of this broker."""
+        return f"inproc://metarepos-broker-{self._id}-{name}"
+    
+    def _proxy(self, context: zmq.Context) -> None:
+        """Bind the proxy sockets and forward until terminated (own thread)."""
+        frontend = context.socket(zmq.XSUB)
+        backend = context.socket(zmq.XPUB)
+        capture = context.socket(zmq.PUB)
+        control = context.socket(zmq.PAIR)
+        sockets = (frontend, backend, capture, control)
+        try:
+            if self.publishers is not None:
+                frontend.monitor(
+                    self._inproc("frontend"),
+                    zmq.EVENT_ACCEPTED | zmq.EVENT_DISCONNECTED
+                )
+            if self.subscribers is not None:
+                backend.monitor(
+                    self._inproc("backend"),
+                    zmq.EVENT_ACCEPTED | zmq.EVENT_DISCONNECTED
+                )
+            # Forward duplicate subscriptions and every unsubscription, so
+            # the capture socket can count subscribers per topic
+            backend.setsockopt(zmq.XPUB_VERBOSE, 1)
+            backend.setsockopt(zmq.XPUB_VERBOSER, 1)
+            capture.setsockopt(zmq.SNDHWM, 100000)
+            capture.bind(self._inproc("capture"))
+            control.bind(self._inproc("control"))
+            frontend.bind(self.frontend_address)
+            backend.bind(self.backend_address)
+        except zmq.ZMQError as e:
+            self._error = e
+            for socket in sockets:
+                socket.close(linger=0)
+            self._ready.set()
+            return
+        
+        self._ready.set()
+        try:
+            zmq.proxy_steerable(frontend, backend, capture, control)
+        except zmq.ContextTerminated:
+            pass
+        finally:
+            for socket in sockets:
+                socket.close(linger=0)
+    
+    async def _count_traffic(self, capture: zmq.asyncio.Socket) -> None:
+        """Count forwarded events and subscription changes."""
+        try:
+            while True:
+                frames = await capture.recv_multipart()
+                if len(frames) == 1 and frames[0][:1] in (b"\x00", b"\x01"):
+                    # Subscription message flowing from a subscriber
+                    topic = frames[0][1:]
+                    if frames[0][0] == 1:
+                        self.subscriptions[topic] = self.subscriptions.get(topic, 0) + 1
+                    elif self.subscriptions.get(topic, 0) > 1:
+                        self.subscriptions[topic] -= 1
+                    else:
+                        self.subscriptions.pop(topic, None)
+                    continue
+                
+                self.messages += 1
+                self.bytes += sum(len(frame) for frame in frames)
+        finally:
+            capture.close(linger=0)
+    
+    async def _watch_peers(self, monitor: zmq.asyncio.Socket, counter: str) -> None:
+        """Track peers connecting to and disconnecting from one side."""
+        try:
+            while True:
+                frames = await monitor.recv_multipart()
+                event = int.from_bytes(frames[0][:2], "little")
+                if event == zmq.EVENT_ACCEPTED:
+                    setattr(self, counter, getattr(self, counter) + 1)
+                elif event == zmq.EVENT_DISCONNECTED:
+                    setattr(self, counter, max(0, getattr(self, counter) - 1))
+        finally:
+            monitor.close(linger=0)
+    
+    async def _sample_rates(self) -> None:
+        """Update the per-second rates every stats interval."""
+        last_messages, last_bytes = self.messages, self.bytes
+        last_time = time.monotonic()
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            now = time.monotonic()
+            elapsed = now - last_time
+            self.messages_per_sec = (self.messages - last_messages) / elapsed
+            self.bytes_per_sec = (self.bytes - last_bytes) / elapsed
+            last_messages, last_bytes, last_time = self.messages, self.bytes, now
+
+def _peer_count(address: str) -> Optional[int]:
+    """Initial peer count of a side, None when monitors cannot see its peers."""
+    return None if address.startswith("inproc://") else 0
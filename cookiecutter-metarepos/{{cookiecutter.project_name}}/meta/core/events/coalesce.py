@@ -0,0 +1,154 @@
+"""
+Coalescing of bursts of events before they reach the bus.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple, Union
+
+from .dispatch import KeyFunc, payload_key
+from .schema import Event, validate_subscription_pattern
+from .trie import NamespaceTrie, specificity
+
+logger = logging.getLogger(__name__)
+
+# A coalescing window: rule id, event namespace and key
+Slot = Tuple[int, str, Hashable]
+
+class CoalesceRule:
+    """
+    Keep only the last event per key within a time window.
+    
+    The first event for a key opens a window of ``window`` seconds; later
+    events with the same key replace it, and the last one is emitted when
+    the window closes. Events without a key are emitted immediately.
+    """
+    
+    def __init__(
+        self,
+        pattern: str,
+        key: Union[str, KeyFunc],
+        window: float = 0.05
+    ):
+        if not validate_subscription_pattern(pattern):
+            raise ValueError(f"Invalid event namespace: {pattern}")
+        if window <= 0:
+            raise ValueError(f"Coalescing window must be positive: {window}")
+        
+        self.pattern = pattern
+        self.key_name = key if isinstance(key, str) else getattr(key, "__qualname__", repr(key))
+        self.key: KeyFunc = payload_key(key) if isinstance(key, str) else key
+        self.window = window
+        self.coalesced = 0
+        self.emitted = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters of this rule."""
+        return {
+            "pattern": self.pattern,
+            "key": self.key_name,
+            "window": self.window,
+            "coalesced": self.coalesced,
+            "emitted": self.emitted,
+        }
+
+class Coalescer:
+    """
+    Holds events matching coalescing rules until their window closes.
+    
+    ``release`` is called with the events that survive, in the order their
+    windows close. Windows are kept per rule, namespace and key. When
+    several rules match an event, the most specific pattern applies.
+    """
+    
+    def __init__(self, release: Callable[[List[Event]], Awaitable[None]]):
+        self.release = release
+        self.rules: List[CoalesceRule] = []
+        self._trie: NamespaceTrie[CoalesceRule] = NamespaceTrie()
+        self._pending: Dict[Slot, Tuple[CoalesceRule, Event]] = {}
+        self._timers: Dict[Slot, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+    
+    @property
+    def pending(self) -> int:
+        """Number of events waiting for their window to close."""
+        return len(self._pending)
+    
+    @property
+    def coalesced(self) -> int:
+        """Number of events collapsed into a later one, over all rules."""
+        return sum(rule.coalesced for rule in self.rules)
+    
+    def add_rule(self, rule: CoalesceRule) -> None:
+        """Start coalescing events matching a rule."""
+        self.rules.append(rule)
+        self._trie.add(rule.pattern, rule)
+    
+    def offer(self, event: Event) -> bool:
+        """
+        Take an event if a rule applies to it.
+        
+        Returns False when the event should be emitted right away.
+        """
+        if not self.rules:
+            return False
+        rules = self._trie.match(event.namespace)
+        if not rules:
+            return False
+        
+        rule = max(rules, key=lambda rule: specificity(rule.pattern))
+        key = rule.key(event)
+        if key is None:
+            return False
+        
+        slot = (id(rule), event.namespace, key)
+        if slot in self._pending:
+            rule.coalesced += 1
+        else:
+            self._timers[slot] = asyncio.get_running_loop().call_later(
+                rule.window, self._expire, slot
+            )
+        self._pending[slot] = (rule, event)
+        return True
+    
+    async def flush(self) -> None:
+        """Emit every held event now."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        
+        events = []
+        for rule, event in self._pending.values():
+            rule.emitted += 1
+            events.append(event)
+        self._pending.clear()
+        if events:
+            await self.release(events)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def discard(self) -> int:
+        """Drop every held event, returning how many were dropped."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        count = len(self._pending)
+        self._pending.clear()
+        return count
+    
+    def _expire(self, slot: Slot) -> None:
+        """Emit the last event of a window."""
+        self._timers.pop(slot, None)
+        if slot not in self._pending:
+            return
+        rule, event = self._pending.pop(slot)
+        rule.emitted += 1
+        task = asyncio.ensure_future(self._release(event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _release(self, event: Event) -> None:
+        """Hand one surviving event back to the manager."""
+        try:
+            await self.release([event])
+        except Exception as e:
+            logger.error(f"Failed to emit coalesced event {event.namespace}: {e}")
@@ -0,0 +1,163 @@
+"""
+Wire codecs for events.
+
+Every published message carries a small header frame naming the codec
+used for its event frames, so peers configured with different codecs can
+still read each other's messages.
+"""
+import json
+import struct
+from typing import Dict, Optional, Tuple
+
+from .schema import Event
+
+HEADER_MAGIC = b"MR"
+HEADER_VERSION = 1
+_HEADER = struct.Struct("!2sBBB")
+
+_compact_json = json.JSONEncoder(separators=(",", ":"))
+
+class Codec:
+    """Base class for event codecs."""
+    
+    name = ""
+    codec_id = 0
+    
+    def serialize(self, event: Event) -> bytes:
+        """
+        Return the encoded form of an event, encoding it at most once.
+        
+        The result is cached on the event, so the publisher, log sinks and
+        replay all share a single encoding per codec.
+        """
+        cache = event._serialized
+        if cache is None:
+            cache = event._serialized = {}
+        data = cache.get(self.name)
+        if data is None:
+            data = cache[self.name] = self.encode(event)
+        return data
+    
+    def deserialize(self, data: bytes) -> Event:
+        """Decode an event, keeping the received bytes as its cached form."""
+        event = self.decode(data)
+        event._serialized = {self.name: data}
+        return event
+    
+    def encode(self, event: Event) -> bytes:
+        """Serialize an event to bytes."""
+        raise NotImplementedError
+    
+    def decode(self, data: bytes) -> Event:
+        """Deserialize an event from bytes."""
+        raise NotImplementedError
+
+class JSONCodec(Codec):
+    """Encodes events as the JSON form of ``Event.to_dict``."""
+    
+    name = "json"
+    codec_id = 1
+    
+    def encode(self, event: Event) -> bytes:
+        return json.dumps(event.to_dict()).encode()
+    
+    def decode(self, data: bytes) -> Event:
+        return Event.from_dict(json.loads(data))
+
+class BinaryCodec(Codec):
+    """
+    Compact encoding built on ``struct``.
+    
+    A fixed envelope holds the timestamp as a float of epoch seconds and the
+    lengths of the namespace, metadata and payload sections. Metadata and
+    payload are compact JSON and empty dicts take no bytes, so timestamps
+    never go through ``isoformat``/``fromisoformat`` and field names are not
+    repeated in every message. Decoded events keep their payload section
+    encoded until it is first read.
+    """
+    
+    name = "binary"
+    codec_id = 2
+    
+    _envelope = struct.Struct("!dHII")
+    
+    def encode(self, event: Event) -> bytes:
+        namespace = event.namespace.encode()
+        metadata = _dump_section(event._metadata)
+        # A payload still encoded as received is passed through as is
+        payload = event._raw_payload or _dump_section(event._payload)
+        return b"".join((
+            self._envelope.pack(event.time, len(namespace), len(metadata), len(payload)),
+            namespace,
+            metadata,
+            payload,
+        ))
+    
+    def decode(self, data: bytes) -> Event:
+        view = memoryview(data)
+        timestamp, ns_len, meta_len, payload_len = self._envelope.unpack_from(view)
+        offset = self._envelope.size
+        namespace = bytes(view[offset:offset + ns_len]).decode()
+        offset += ns_len
+        metadata = _load_section(view[offset:offset + meta_len])
+        offset += meta_len
+        payload = bytes(view[offset:offset + payload_len])
+        return Event.encoded(namespace, timestamp, metadata, payload)
+
+def _dump_section(value: Optional[Dict]) -> bytes:
+    """Encode a metadata or payload dict, using no bytes when empty."""
+    if not value:
+        return b""
+    return _compact_json.encode(value).encode()
+
+def _load_section(data: memoryview) -> Optional[Dict]:
+    """Decode a metadata section."""
+    if not data:
+        return None
+    metadata: Dict = json.loads(bytes(data))
+    return metadata
+
+_codecs: Dict[str, Codec] = {}
+_codecs_by_id: Dict[int, Codec] = {}
+
+def register_codec(codec: Codec) -> None:
+    """Register a codec so it can be selected by name and decoded by id."""
+    if not 0 < codec.codec_id < 256:
+        raise ValueError(f"Codec id must fit in one byte: {codec.codec_id}")
+    existing = _codecs_by_id.get(codec.codec_id)
+    if existing and existing.name != codec.name:
+        raise ValueError(f"Codec id {codec.codec_id} already used by {existing.name}")
+    
+    _codecs[codec.name] = codec
+    _codecs_by_id[codec.codec_id] = codec
+
+def get_codec(name: str) -> Codec:
+    """Return the codec registered under a name."""
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(f"Unsupported codec: {name}") from None
+
+def pack_header(codec: Codec, flags: int = 0) -> bytes:
+    """Build the header frame announcing the codec of a message."""
+    return _HEADER.pack(HEADER_MAGIC, HEADER_VERSION, codec.codec_id, flags)
+
+def unpack_header(frame: bytes) -> Optional[Tuple[Codec, int]]:
+    """
+    Parse a header frame into its codec and flags.
+    
+    Returns None when the frame is not a header, which is the case for
+    messages from peers predating codec headers; those carry JSON events.
+    """
+    if len(frame) != _HEADER.size or not frame.startswith(HEADER_MAGIC):
+        return None
+    
+    _, version, codec_id, flags = _HEADER.unpack(frame)
+    if version != HEADER_VERSION:
+        raise ValueError(f"Unsupported message header version: {version}")
+    if codec_id not in _codecs_by_id:
+        raise ValueError(f"Unknown codec id: {codec_id}")
+    return _codecs_by_id[codec_id], flags
+
+register_codec(JSONCodec())
+register_codec(BinaryCodec())
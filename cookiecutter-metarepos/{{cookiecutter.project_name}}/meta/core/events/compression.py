@@ -0,0 +1,53 @@
+"""
+Compression of large event messages.
+"""
+import zlib
+from typing import Dict, Optional
+
+# Codec header flag marking zlib-compressed message frames
+FLAG_COMPRESSED = 0x02
+
+class Compressor:
+    """
+    Compresses encoded events of ``threshold`` bytes or more with zlib.
+    
+    A threshold of 0 disables compression. Messages that do not shrink are
+    sent as they are. Counters track how many bytes went in and out.
+    """
+    
+    def __init__(self, threshold: int = 0, level: int = 1):
+        if not -1 <= level <= 9:
+            raise ValueError(f"Invalid compression level: {level}")
+        self.threshold = threshold
+        self.level = level
+        self.messages = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+    
+    def compress(self, data: bytes) -> Optional[bytes]:
+        """Return the compressed form of a message, or None to send it as is."""
+        if not self.threshold or len(data) < self.threshold:
+            return None
+        compressed = zlib.compress(data, self.level)
+        if len(compressed) >= len(data):
+            return None
+        
+        self.messages += 1
+        self.bytes_in += len(data)
+        self.bytes_out += len(compressed)
+        return compressed
+    
+    def stats(self) -> Dict[str, float]:
+        """Return the threshold and compression counters."""
+        return {
+            "threshold": self.threshold,
+            "level": self.level,
+            "messages": self.messages,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+        }
+
+def decompress(data: bytes) -> bytes:
+    """Restore a message compressed by a Compressor."""
+    return zlib.decompress(data)
@@ -0,0 +1,84 @@
+"""
+Duplicate suppression of events carrying an idempotency key.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+class DedupWindow:
+    """
+    Remembers recently seen keys to recognise repeats.
+    
+    At most ``max_keys`` keys are kept, the least recently seen evicted
+    first, and a key is forgotten ``ttl`` seconds after it was last seen
+    (0 keeps keys until they are evicted). A ``max_keys`` of 0 disables
+    the window: nothing is remembered and nothing is a duplicate.
+    """
+    
+    def __init__(
+        self,
+        max_keys: int = 10000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_keys < 0:
+            raise ValueError(f"Invalid dedup window size: {max_keys}")
+        if ttl < 0:
+            raise ValueError(f"Invalid dedup window: {ttl}")
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.expired = 0
+        self._seen: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._clock = clock
+    
+    def __len__(self) -> int:
+        return len(self._seen)
+    
+    def seen(self, key: Hashable) -> bool:
+        """Record a key, returning whether it was seen within the window."""
+        if not self.max_keys:
+            return False
+        
+        now = self._clock()
+        if self.ttl:
+            self._expire(now)
+        
+        duplicate = key in self._seen
+        if duplicate:
+            self.hits += 1
+            self._seen.move_to_end(key)
+        else:
+            self.misses += 1
+            if len(self._seen) >= self.max_keys:
+                self._seen.popitem(last=False)
+                self.evicted += 1
+        self._seen[key] = now
+        return duplicate
+    
+    def _expire(self, now: float) -> None:
+        """Forget keys not seen for ``ttl`` seconds (the oldest come first)."""
+        deadline = now - self.ttl
+        seen = self._seen
+        while seen:
+            key, last = next(iter(seen.items()))
+            if last > deadline:
+                break
+            del seen[key]
+            self.expired += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the window bounds and hit counters."""
+        lookups = self.hits + self.misses
+        return {
+            "max_keys": self.max_keys,
+            "ttl": self.ttl,
+            "keys": len(self._seen),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,496 @@
+"""
+Subscriber dispatch for the event manager.
+"""
+import asyncio
+import inspect
+import itertools
+import logging
+import pickle
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from .filters import compile_predicate
+from .schema import Event
+from .stats import EventStats, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies for subscriber queues
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_COALESCE = "coalesce"
+
+OVERFLOW_POLICIES = (
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_COALESCE,
+)
+
+KeyFunc = Callable[[Event], Optional[Hashable]]
+
+# Where callbacks run: on the event loop, or offloaded to a thread or
+# process pool
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+EXECUTORS = (EXECUTOR_INLINE, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+ResultCallback = Callable[[Event, Any], Any]
+
+class SubscriberQueue:
+    """
+    Bounded FIFO of events waiting for one subscriber.
+    
+    When full, ``put`` applies the overflow policy: ``block`` waits for
+    space, ``drop_oldest`` evicts the head, ``drop_newest`` discards the
+    incoming event. ``coalesce`` replaces a queued event with the same key
+    in place and otherwise blocks like ``block``.
+    
+    Priority events go to a separate lane that is never full and is served
+    first, but at most ``priority_weight`` in a row while other events are
+    waiting.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int,
+        overflow: str = OVERFLOW_BLOCK,
+        key: Optional[KeyFunc] = None,
+        priority_weight: int = 8
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        if overflow == OVERFLOW_COALESCE and key is None:
+            raise ValueError("The coalesce overflow policy requires a key")
+        
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.key = key
+        self.priority_weight = max(1, priority_weight)
+        self.dropped = 0
+        self.coalesced = 0
+        # Events are kept with the time they were queued
+        self._priority: Deque[Tuple[Event, float]] = deque()
+        self._streak = 0
+        self._keys: Deque[Hashable] = deque()
+        self._events: Dict[Hashable, Tuple[Event, float]] = {}
+        self._unique = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+    
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._priority)
+    
+    def full(self) -> bool:
+        """Whether the queue holds ``maxsize`` events besides priority ones."""
+        return len(self._keys) >= self.maxsize
+    
+    async def put(self, event: Event, priority: bool = False) -> bool:
+        """Add an event, returning False if it was dropped."""
+        if priority:
+            self._priority.append((event, time.perf_counter()))
+            self._not_empty.set()
+            return True
+        
+        key = self._key_for(event)
+        if key in self._events:
+            self._events[key] = (event, self._events[key][1])
+            self.coalesced += 1
+            return True
+        
+        while self.full():
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                self.dropped += 1
+                return False
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                self._events.pop(self._keys.popleft())
+                self.dropped += 1
+                break
+            self._not_full.clear()
+            await self._not_full.wait()
+        
+        self._keys.append(key)
+        self._events[key] = (event, time.perf_counter())
+        self._not_empty.set()
+        return True
+    
+    async def get(self) -> Event:
+        """Remove and return the oldest event, waiting if necessary."""
+        event, _ = await self.get_timed()
+        return event
+    
+    async def get_timed(self) -> Tuple[Event, float]:
+        """Remove the oldest event and return it with its seconds in the queue."""
+        while not self._keys and not self._priority:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        
+        if self._priority and (not self._keys or self._streak < self.priority_weight):
+            self._streak += 1
+            event, queued = self._priority.popleft()
+        else:
+            self._streak = 0
+            event, queued = self._events.pop(self._keys.popleft())
+            self._not_full.set()
+        return event, time.perf_counter() - queued
+    
+    def clear(self) -> int:
+        """Discard every queued event, returning how many were removed."""
+        count = len(self)
+        self._priority.clear()
+        self._keys.clear()
+        self._events.clear()
+        self._not_full.set()
+        return count
+    
+    def _key_for(self, event: Event) -> Hashable:
+        """Return the coalescing key of an event, or a unique placeholder."""
+        if self.overflow == OVERFLOW_COALESCE and self.key is not None:
+            key = self.key(event)
+            if key is not None:
+                return ("key", key)
+        return ("seq", next(self._unique))
+
+def payload_key(name: str) -> KeyFunc:
+    """Build a coalescing key function reading a payload field."""
+    def key(event: Event) -> Optional[Hashable]:
+        value = (event.payload or {}).get(name)
+        return value if isinstance(value, Hashable) else None
+    return key
+
+class Subscription:
+    """
+    A callback registered for a namespace pattern.
+    
+    With ``queue_size`` set, events are buffered in a bounded
+    ``SubscriberQueue`` and delivered by a worker task, so a slow consumer
+    only affects its own queue. Without a queue, plain callbacks are called
+    inline.
+    
+    Coroutine callbacks are run as tasks, with at most ``max_concurrency``
+    in flight for this subscription and each invocation cancelled after
+    ``timeout`` seconds, so a slow subscriber cannot stall the emitter or
+    other subscribers.
+    
+    A ``where`` filter, given as an expression (see ``filters``) or a
+    function of the event, is compiled once; events it rejects are
+    discarded before they are queued or reach the callback.
+    
+    With an ``executor`` the callback runs on a pool thread or process and
+    is awaited like a coroutine callback, so CPU-heavy work does not block
+    the event loop; for process pools the callback and event must be
+    picklable. Work is submitted to the pool only once a concurrency slot
+    is free. ``timeout`` stops waiting for it but cannot stop work already
+    running in the pool. Return values are passed to ``on_result`` on the
+    event loop and exceptions are logged and counted.
+    
+    Time spent queued and in the callback is recorded in histograms, and
+    in the per-namespace ``stats`` when given along with the latency from
+    each event's timestamp to its callback starting.
+    """
+    
+    def __init__(
+        self,
+        pattern: str,
+        callback: Callable[[Event], Any],
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None,
+        queue_size: int = 0,
+        overflow: str = OVERFLOW_BLOCK,
+        coalesce_key: Union[str, KeyFunc, None] = None,
+        priority_weight: int = 8,
+        stats: Optional[EventStats] = None,
+        executor: Optional[Executor] = None,
+        on_result: Optional[ResultCallback] = None,
+        where: Union[str, Callable[[Event], bool], None] = None
+    ):
+        self.pattern = pattern
+        self.callback = callback
+        self.where = compile_predicate(where)
+        self.executor = executor
+        self.on_result = on_result
+        self.is_async = inspect.iscoroutinefunction(callback) or executor is not None
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout or None
+        self.delivered = 0
+        self.filtered = 0
+        self.errors = 0
+        self.queue_time = Histogram()
+        self.callback_time = Histogram()
+        self._stats = stats
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._held: Optional[List[Tuple[Event, bool]]] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+        
+        if isinstance(coalesce_key, str):
+            coalesce_key = payload_key(coalesce_key)
+        self.queue: Optional[SubscriberQueue] = None
+        if queue_size > 0:
+            self.queue = SubscriberQueue(queue_size, overflow, coalesce_key, priority_weight)
+    
+    @property
+    def name(self) -> str:
+        """A readable name for the callback, used in logs."""
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of coroutine invocations not yet finished."""
+        return len(self._tasks)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and delivery counters for this subscription."""
+        return {
+            "pattern": self.pattern,
+            "callback": self.name,
+            "depth": len(self.queue) if self.queue else 0,
+            "capacity": self.queue.maxsize if self.queue else 0,
+            "overflow": self.queue.overflow if self.queue else None,
+            "in_flight": self.in_flight,
+            "delivered": self.delivered,
+            "filtered": self.filtered,
+            "dropped": self.queue.dropped if self.queue else 0,
+            "coalesced": self.queue.coalesced if self.queue else 0,
+            "errors": self.errors,
+            "queue_time": self.queue_time.summary(),
+            "callback_time": self.callback_time.summary(),
+        }
+    
+    async def put(self, event: Event, priority: bool = False) -> bool:
+        """
+        Hand an event to this subscription.
+        
+        Queued subscriptions buffer the event (applying the overflow policy,
+        except to priority events); otherwise it is delivered immediately.
+        Returns False if dropped. While held, events are set aside until
+        ``release``. Events rejected by the ``where`` filter are discarded.
+        """
+        if not self.accepts(event):
+            return True
+        if self._held is not None:
+            self._held.append((event, priority))
+            return True
+        return await self.push(event, priority)
+    
+    def accepts(self, event: Event) -> bool:
+        """Return whether an event passes the ``where`` filter, counting rejects."""
+        if self.where is None or self.where(event):
+            return True
+        self.filtered += 1
+        return False
+    
+    async def push(self, event: Event, priority: bool = False) -> bool:
+        """Hand an event to this subscription, even while it is held."""
+        if self.queue is None:
+            self.deliver(event)
+            return True
+        
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain(self.queue))
+        self._idle.clear()
+        return await self.queue.put(event, priority)
+    
+    def hold(self) -> None:
+        """Set incoming events aside instead of delivering them."""
+        if self._held is None:
+            self._held = []
+    
+    async def release(self, skip: Optional[Callable[[Event], bool]] = None) -> int:
+        """
+        Deliver the events set aside while held and resume live delivery.
+        
+        Events for which ``skip`` returns True are discarded. Events arriving
+        while the held ones are handed over are set aside too, so the
+        original order is kept. Returns the number of events skipped.
+        """
+        skipped = 0
+        while self._held:
+            held, self._held = self._held, []
+            for event, priority in held:
+                if skip and skip(event):
+                    skipped += 1
+                else:
+                    await self.push(event, priority)
+        self._held = None
+        return skipped
+    
+    def deliver(self, event: Event) -> None:
+        """Invoke the callback for an event without blocking the caller."""
+        self.delivered += 1
+        if self.is_async:
+            self._spawn(event, lambda: self._call(event))
+            return
+        
+        self._observe_latency(event)
+        start = time.perf_counter()
+        try:
+            result = self.callback(event)
+        except Exception as e:
+            logger.error(f"Error in event callback {self.name}: {e}")
+            self._observe_callback(event, time.perf_counter() - start, failed=True)
+            return
+        
+        # Callables that are not coroutine functions may still return one
+        if inspect.isawaitable(result):
+            self._spawn(event, lambda: result)
+        else:
+            self._observe_callback(event, time.perf_counter() - start)
+            self._report(event, result)
+    
+    async def wait(self) -> None:
+        """Wait until the queue is drained and invocations have finished."""
+        if self.queue is not None and self._worker is not None:
+            await self._idle.wait()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def cancel(self) -> int:
+        """
+        Stop the queue worker and cancel in-flight invocations.
+        
+        Returns the number of queued or held events discarded.
+        """
+        discarded = len(self._held or ())
+        if self.queue is not None:
+            discarded += self.queue.clear()
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+        self._held = None
+        self._idle.set()
+        for task in self._tasks:
+            task.cancel()
+        return discarded
+    
+    async def _drain(self, queue: SubscriberQueue) -> None:
+        """Deliver queued events one at a time."""
+        while True:
+            if self.is_async:
+                # Wait for a free slot first so the backlog stays in the queue
+                await self._acquire()
+                event, waited = await queue.get_timed()
+                self._observe_queue(event, waited)
+                self._spawn(event, lambda: self._call(event), acquired=True)
+                self.delivered += 1
+            else:
+                event, waited = await queue.get_timed()
+                self._observe_queue(event, waited)
+                self.deliver(event)
+            if not queue:
+                self._idle.set()
+    
+    def _call(self, event: Event) -> Any:
+        """Start an asynchronous or offloaded invocation, returning an awaitable."""
+        self._observe_latency(event)
+        if self.executor is None:
+            return self.callback(event)
+        return asyncio.get_running_loop().run_in_executor(
+            self.executor, self.callback, _portable(event)
+        )
+    
+    def _report(self, event: Event, result: Any) -> None:
+        """Pass a callback's return value to ``on_result``."""
+        if self.on_result is None:
+            return
+        try:
+            self.on_result(event, result)
+        except Exception as e:
+            logger.error(f"Error in result callback of {self.name}: {e}")
+    
+    def _slots(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrency, created on first use."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    async def _acquire(self) -> None:
+        """Acquire a concurrency slot."""
+        await self._slots().acquire()
+    
+    def _spawn(self, event: Event, invoke: Callable[[], Any], acquired: bool = False) -> None:
+        """Run an invocation, started by ``invoke``, as a tracked task."""
+        task = asyncio.ensure_future(self._run(event, invoke, acquired))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, event: Event, invoke: Callable[[], Any], acquired: bool = False) -> None:
+        """
+        Run one invocation within the concurrency and time limits.
+        
+        The invocation is only started, and offloaded work submitted to its
+        pool, once a concurrency slot has been acquired.
+        """
+        if not acquired:
+            await self._acquire()
+        
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await asyncio.wait_for(invoke(), self.timeout)
+            failed = False
+            self._report(event, result)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Event callback {self.name} timed out after {self.timeout}s"
+            )
+        except asyncio.CancelledError:
+            failed = False
+            raise
+        except Exception as e:
+            logger.error(f"Error in event callback {self.name}: {e}")
+        finally:
+            self._slots().release()
+            self._observe_callback(event, time.perf_counter() - start, failed)
+    
+    def _observe_queue(self, event: Event, waited: float) -> None:
+        """Record the time an event spent in the queue."""
+        self.queue_time.record(waited)
+    
+    def _observe_latency(self, event: Event) -> None:
+        """Record the time from an event's timestamp to its callback starting."""
+        if self._stats and event.time is not None:
+            latency = max(0.0, time.time() - event.time)
+            self._stats.namespace(event.namespace).latency.record(latency)
+    
+    def _observe_callback(self, event: Event, elapsed: float, failed: bool = False) -> None:
+        """Record a finished callback invocation."""
+        self.callback_time.record(elapsed)
+        self.errors += failed
+        if self._stats:
+            stats = self._stats.namespace(event.namespace)
+            stats.callback.record(elapsed)
+            stats.delivered += 1
+            stats.errors += failed
+
+def check_picklable(callback: Callable[[Event], Any]) -> None:
+    """Raise ValueError if a callback cannot be sent to a process pool."""
+    try:
+        pickle.dumps(callback)
+    except Exception as e:
+        raise ValueError(
+            f"Callbacks run in a process pool must be picklable module-level "
+            f"functions: {e}"
+        ) from None
+
+def _portable(event: Event) -> Event:
+    """Return an event whose blobs can be pickled, copying received views."""
+    if not event._blobs or not any(
+        isinstance(blob, memoryview) for blob in event._blobs.values()
+    ):
+        return event
+    return Event(
+        namespace=event.namespace,
+        timestamp=event.time,
+        metadata=event.metadata,
+        payload=event.payload,
+        blobs={name: bytes(blob) for name, blob in event.blobs.items()}
+    )
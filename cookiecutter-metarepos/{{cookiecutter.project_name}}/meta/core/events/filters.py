@@ -0,0 +1,265 @@
+"""
+Payload predicates for subscriptions.
+
+A ``where`` expression narrows a subscription to the events it cares
+about, e.g.::
+    
+    path startswith "src/" and not is_directory
+    metadata.source == "watcher" or size > 1048576
+    extension in [".py", ".pyi"]
+    path matches "*/tests/*.py"
+
+Names are payload fields, with dots reaching into nested dicts; names
+starting with ``payload.`` or ``metadata.``, and ``namespace`` itself,
+refer to those parts of the event. Missing fields are ``null``. A bare
+name tests the field's truthiness. Operators are ``==``, ``!=``, ``<``,
+``<=``, ``>``, ``>=``, ``in``, ``not in``, ``startswith``, ``endswith``,
+``contains`` and ``matches`` (a shell-style pattern), combined with
+``and``, ``or``, ``not`` and parentheses. Literals are quoted strings,
+numbers, ``true``, ``false``, ``null`` and lists of literals.
+
+Expressions are parsed once into a tree of closures, so matching an
+event costs a few function calls and no parsing.
+"""
+import ast
+import fnmatch
+import operator
+import re
+from typing import Any, Callable, List, NoReturn, Optional, Tuple, Union
+
+from .schema import Event
+
+Getter = Callable[[Event], Any]
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+      | (?P<op>==|!=|<=|>=|<|>|\(|\)|\[|\]|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*)
+    )
+""", re.VERBOSE)
+
+_CONSTANTS = {"true": True, "false": False, "null": None}
+
+_KEYWORDS = {"and", "or", "not", "in"}
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, container: value in container,
+    "contains": lambda container, item: item in container,
+    "startswith": lambda value, prefix: value.startswith(prefix),
+    "endswith": lambda value, suffix: value.endswith(suffix),
+    "matches": lambda value, pattern: pattern.match(value) is not None,
+}
+
+class Predicate:
+    """A compiled ``where`` expression, called with an event."""
+    
+    __slots__ = ("expression", "_test")
+    
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._test = _Parser(expression).parse()
+    
+    def __call__(self, event: Event) -> bool:
+        return bool(self._test(event))
+    
+    def __repr__(self) -> str:
+        return f"Predicate({self.expression!r})"
+
+def compile_predicate(
+    where: Union[str, Callable[[Event], bool], None]
+) -> Optional[Callable[[Event], bool]]:
+    """Compile a ``where`` expression; callables are used as they are."""
+    if where is None or callable(where):
+        return where
+    if isinstance(where, str):
+        return Predicate(where)
+    raise ValueError(f"Invalid event filter: {where!r}")
+
+class _Parser:
+    """Recursive-descent parser turning an expression into closures."""
+    
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = self._tokenize(expression)
+        self.pos = 0
+    
+    def parse(self) -> Getter:
+        test = self._or()
+        if self.pos < len(self.tokens):
+            self._error(f"unexpected {self.tokens[self.pos][1]!r}")
+        return test
+    
+    def _tokenize(self, expression: str) -> List[Tuple[str, Any]]:
+        tokens: List[Tuple[str, Any]] = []
+        pos = 0
+        end = len(expression.rstrip())
+        while pos < end:
+            match = _TOKEN.match(expression, pos)
+            kind = match.lastgroup if match else None
+            if not match or not kind:
+                raise ValueError(
+                    f"Invalid event filter {expression!r}: "
+                    f"unexpected character at {pos + 1}"
+                )
+            text = match.group(kind)
+            if kind == "string":
+                tokens.append(("value", ast.literal_eval(text)))
+            elif kind == "number":
+                tokens.append(("value", ast.literal_eval(text)))
+            elif kind == "name" and text in _CONSTANTS:
+                tokens.append(("value", _CONSTANTS[text]))
+            elif kind == "name" and (text in _KEYWORDS or text in _OPERATORS):
+                tokens.append(("op", text))
+            else:
+                tokens.append((kind, text))
+            pos = match.end()
+        return tokens
+    
+    def _error(self, message: str) -> NoReturn:
+        raise ValueError(f"Invalid event filter {self.expression!r}: {message}")
+    
+    def _peek(self) -> Optional[Tuple[str, Any]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+    
+    def _accept(self, text: str) -> bool:
+        token = self._peek()
+        if token and token[0] == "op" and token[1] == text:
+            self.pos += 1
+            return True
+        return False
+    
+    def _expect(self, text: str) -> None:
+        if not self._accept(text):
+            token = self._peek()
+            self._error(f"expected {text!r}" + (f" before {token[1]!r}" if token else ""))
+    
+    def _or(self) -> Getter:
+        tests = [self._and()]
+        while self._accept("or"):
+            tests.append(self._and())
+        if len(tests) == 1:
+            return tests[0]
+        return lambda event: any(test(event) for test in tests)
+    
+    def _and(self) -> Getter:
+        tests = [self._not()]
+        while self._accept("and"):
+            tests.append(self._not())
+        if len(tests) == 1:
+            return tests[0]
+        return lambda event: all(test(event) for test in tests)
+    
+    def _not(self) -> Getter:
+        if self._accept("not"):
+            test = self._not()
+            return lambda event: not test(event)
+        return self._comparison()
+    
+    def _comparison(self) -> Getter:
+        if self._accept("("):
+            test = self._or()
+            self._expect(")")
+            return test
+        
+        left = self._operand()
+        negate = False
+        token = self._peek()
+        if token and token[0] == "op" and token[1] == "not":
+            # "not in" is the only operator taking a "not"
+            self.pos += 1
+            self._expect("in")
+            name, negate = "in", True
+        elif token and token[0] == "op" and token[1] in _OPERATORS:
+            self.pos += 1
+            name = token[1]
+        else:
+            return left
+        
+        if name == "matches":
+            token = self._peek()
+            if not token or token[0] != "value" or not isinstance(token[1], str):
+                self._error("matches takes a quoted pattern")
+            self.pos += 1
+            pattern = re.compile(fnmatch.translate(token[1]))
+            right = lambda event: pattern
+        else:
+            right = self._operand()
+        
+        compare = _OPERATORS[name]
+        
+        def check(event: Event) -> bool:
+            try:
+                result = compare(left(event), right(event))
+            except (TypeError, AttributeError):
+                # Missing fields and fields of the wrong type never match
+                return False
+            return not result if negate else result
+        
+        return check
+    
+    def _operand(self) -> Getter:
+        token = self._peek()
+        if token is None:
+            self._error("unexpected end of expression")
+        kind, value = token
+        self.pos += 1
+        
+        if kind == "value":
+            return lambda event: value
+        if kind == "name":
+            return _field(value)
+        if kind == "op" and value == "[":
+            items = []
+            if not self._accept("]"):
+                while True:
+                    item = self._peek()
+                    if not item or item[0] != "value":
+                        self._error("lists may only hold literals")
+                    self.pos += 1
+                    items.append(item[1])
+                    if self._accept("]"):
+                        break
+                    self._expect(",")
+            # Hashable members allow constant-time "in" checks
+            try:
+                members: Any = frozenset(items)
+            except TypeError:
+                members = tuple(items)
+            return lambda event: members
+        self._error(f"unexpected {value!r}")
+
+def _field(name: str) -> Getter:
+    """Return a getter for a dotted field reference."""
+    if name == "namespace":
+        return lambda event: event.namespace
+    
+    path = name.split(".")
+    root = path[0]
+    if root in ("payload", "metadata") and len(path) > 1:
+        path = path[1:]
+    else:
+        root = "payload"
+    
+    if len(path) == 1:
+        key = path[0]
+        if root == "payload":
+            return lambda event: event.payload.get(key)
+        return lambda event: event.metadata.get(key)
+    
+    def get(event: Event) -> Any:
+        value = getattr(event, root)
+        for key in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    
+    return get
@@ -0,0 +1,140 @@
+"""
+Liveness heartbeats and lag tracking between event bus peers.
+"""
+import itertools
+import os
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Heartbeats travel with data events, so they queue behind the same backlog
+HEARTBEAT_NAMESPACE = "core:events:heartbeat"
+
+# Emitted when this process falls behind the bus or catches up again
+SLOW_CONSUMER_NAMESPACE = "core:system:slow_consumer"
+
+# What a lagging consumer does about it
+POLICY_WARN = "warn"
+POLICY_SHED = "shed"
+POLICY_DISCONNECT = "disconnect"
+
+SLOW_CONSUMER_POLICIES = (POLICY_WARN, POLICY_SHED, POLICY_DISCONNECT)
+
+_instances = itertools.count(1)
+
+def peer_name() -> str:
+    """Return a name identifying a manager on the bus."""
+    return f"{socket.gethostname()}:{os.getpid()}:{next(_instances)}"
+
+class PeerState:
+    """What is known about one peer from its heartbeats."""
+    
+    __slots__ = ("name", "seq", "seen", "lag", "backlog", "peer_lag", "stale")
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.seq = 0
+        self.seen = 0.0
+        self.lag = 0.0
+        self.backlog = 0
+        self.peer_lag: Dict[str, float] = {}
+        self.stale = False
+
+class PeerTracker:
+    """
+    Builds this peer's heartbeats and tracks the heartbeats of others.
+    
+    A heartbeat carries its send time, the sender's subscriber backlog and
+    how far behind the sender receives every other peer. The receive lag
+    of a peer is the age of its heartbeats on arrival; as heartbeats queue
+    behind data events, it is the delay of the whole pipeline from that
+    peer. Ages use wall-clock time, so they include any clock skew between
+    hosts. Peers not heard from for ``timeout`` seconds are stale.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+        wall: Callable[[], float] = time.time
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.peers: Dict[str, PeerState] = {}
+        self._seq = 0
+        self._clock = clock
+        self._wall = wall
+    
+    @property
+    def lag(self) -> float:
+        """The largest receive lag of a live peer."""
+        return max((peer.lag for peer in self.peers.values() if not peer.stale), default=0.0)
+    
+    def heartbeat(self, backlog: int) -> Dict[str, Any]:
+        """Return the payload of the next heartbeat."""
+        self._seq += 1
+        return {
+            "peer": self.name,
+            "seq": self._seq,
+            "sent": self._wall(),
+            "backlog": backlog,
+            "lag": {
+                name: round(peer.lag, 6)
+                for name, peer in self.peers.items()
+                if not peer.stale
+            },
+        }
+    
+    def observe(self, payload: Dict[str, Any]) -> Optional[PeerState]:
+        """Record a heartbeat, returning the sender's state (None for our own)."""
+        name = payload.get("peer")
+        if not name or name == self.name:
+            return None
+        
+        peer = self.peers.get(name)
+        if peer is None:
+            peer = self.peers[name] = PeerState(name)
+        peer.seq = payload.get("seq", 0)
+        peer.seen = self._clock()
+        peer.lag = max(0.0, self._wall() - payload.get("sent", self._wall()))
+        peer.backlog = payload.get("backlog", 0)
+        peer.peer_lag = payload.get("lag", {})
+        peer.stale = False
+        return peer
+    
+    def expire(self) -> List[PeerState]:
+        """Mark peers silent for longer than the timeout stale, returning them."""
+        now = self._clock()
+        expired = []
+        for peer in self.peers.values():
+            if not peer.stale and now - peer.seen > self.timeout:
+                peer.stale = True
+                expired.append(peer)
+        return expired
+    
+    def reset(self) -> None:
+        """Forget receive lags, e.g. after the backlog has been discarded."""
+        for peer in self.peers.values():
+            peer.lag = 0.0
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the state of every peer.
+        
+        ``lag`` is how far behind this process receives the peer;
+        ``consumer_lag`` is how far behind the peer receives this process,
+        as reported in its heartbeats.
+        """
+        now = self._clock()
+        return {
+            name: {
+                "seq": peer.seq,
+                "last_seen": now - peer.seen,
+                "lag": peer.lag,
+                "consumer_lag": peer.peer_lag.get(self.name),
+                "backlog": peer.backlog,
+                "stale": peer.stale,
+            }
+            for name, peer in sorted(self.peers.items())
+        }
@@ -0,0 +1,129 @@
+"""
+Per-namespace rate limiting and sampling of emitted events.
+"""
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .schema import Event, validate_subscription_pattern
+from .trie import NamespaceTrie, specificity
+
+class TokenBucket:
+    """Allows ``rate`` events per second on average, in bursts of ``burst``."""
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive: {rate}")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+    
+    def take(self) -> bool:
+        """Take a token, returning False when none is left."""
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+class EventLimit:
+    """
+    Rate limit and sampling applied to the events matching a pattern.
+    
+    ``sample`` keeps each event with that probability and ``every`` keeps
+    one event in N; events surviving sampling then need a token from a
+    bucket of ``rate`` events per second and ``burst`` capacity. The
+    bucket is shared by every namespace the pattern matches.
+    """
+    
+    def __init__(
+        self,
+        pattern: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        sample: Optional[float] = None,
+        every: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not validate_subscription_pattern(pattern):
+            raise ValueError(f"Invalid event namespace: {pattern}")
+        if sample is not None and not 0 <= sample <= 1:
+            raise ValueError(f"Sample rate must be between 0 and 1: {sample}")
+        if every is not None and every < 1:
+            raise ValueError(f"Sampling interval must be at least 1: {every}")
+        
+        self.pattern = pattern
+        self.sample = sample
+        self.every = every
+        self.bucket = TokenBucket(rate, burst, clock) if rate is not None else None
+        self.passed = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self._seen = 0
+    
+    @property
+    def suppressed(self) -> int:
+        """Number of events not emitted because of this limit."""
+        return self.sampled_out + self.rate_limited
+    
+    def allow(self) -> bool:
+        """Decide whether the next matching event is emitted."""
+        self._seen += 1
+        if self.every and (self._seen - 1) % self.every:
+            self.sampled_out += 1
+            return False
+        if self.sample is not None and random.random() >= self.sample:
+            self.sampled_out += 1
+            return False
+        if self.bucket and not self.bucket.take():
+            self.rate_limited += 1
+            return False
+        self.passed += 1
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters of this limit."""
+        return {
+            "pattern": self.pattern,
+            "rate": self.bucket.rate if self.bucket else None,
+            "sample": self.sample,
+            "every": self.every,
+            "passed": self.passed,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited,
+        }
+
+class EventLimiter:
+    """Applies the most specific matching limit to each emitted event."""
+    
+    def __init__(self) -> None:
+        self.limits: List[EventLimit] = []
+        self._trie: NamespaceTrie[EventLimit] = NamespaceTrie()
+    
+    @property
+    def suppressed(self) -> int:
+        """Number of events suppressed over all limits."""
+        return sum(limit.suppressed for limit in self.limits)
+    
+    def add(self, limit: EventLimit) -> None:
+        """Start applying a limit."""
+        self.limits.append(limit)
+        self._trie.add(limit.pattern, limit)
+    
+    def allow(self, event: Event) -> bool:
+        """Whether an event may be emitted."""
+        if not self.limits:
+            return True
+        limits = self._trie.match(event.namespace)
+        if not limits:
+            return True
+        return max(limits, key=lambda limit: specificity(limit.pattern)).allow()
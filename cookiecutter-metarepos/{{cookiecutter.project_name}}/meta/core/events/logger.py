@@ -3,14 +3,32 @@ Event logging system for MetaRepos.
 """
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional, Union
 
+from .codec import get_codec
 from .schema import Event
 
 logger = logging.getLogger(__name__)
 
+def rotate_log_file(path: Path, backup_count: int) -> None:
+    """Shift ``path`` to ``path.1``, renumbering and pruning older backups."""
+    # Rename existing backup files
+    for i in range(backup_count - 1, 0, -1):
+        old_backup = path.with_suffix(f".{i}")
+        new_backup = path.with_suffix(f".{i + 1}")
+        
+        if old_backup.exists():
+            if i == backup_count - 1:
+                old_backup.unlink()
+            else:
+                old_backup.rename(new_backup)
+    
+    # Rename current log file to .1
+    if path.exists():
+        path.rename(path.with_suffix(".1"))
+
 class EventLogger:
     """Handles logging of events to a file with rotation."""
     
@@ -31,56 +49,50 @@ class EventLogger:
         # Initialize the current log file
         self._init_log_file()
     
-    def _init_log_file(self) -> None:
-        """Initialize or rotate the log file if needed."""
-        current_date = datetime.utcnow().strftime("%Y-%m-%d")
-        self.current_log_file = self.log_dir / f"events-{current_date}.log"
+    def _init_log_file(self) -> Path:
+        """Initialize or rotate the log file if needed, returning its path."""
+        now = datetime.utcnow()
+        current_date = now.strftime("%Y-%m-%d")
+        log_file = self.current_log_file = self.log_dir / f"events-{current_date}.log"
+        
+        # Remember the day covered by this file so log_event can detect a
+        # date change without formatting the date on every write
+        self._day_start = datetime(now.year, now.month, now.day)
+        self._day_end = self._day_start + timedelta(days=1)
+        
+        # The file size is tracked in memory from here on
+        self._size = log_file.stat().st_size if log_file.exists() else 0
         
         # Check if we need to rotate
-        if self.current_log_file and self.current_log_file.exists() and self.current_log_file.stat().st_size > self.max_size:
+        if self._size > self.max_size:
             self._rotate_logs()
+        return log_file
     
     def _rotate_logs(self) -> None:
         """Rotate log files, keeping only the specified number of backups."""
         if not self.current_log_file:
             return
         
-        # Rename existing backup files
-        for i in range(self.backup_count - 1, 0, -1):
-            old_backup = self.current_log_file.with_suffix(f".{i}")
-            new_backup = self.current_log_file.with_suffix(f".{i + 1}")
-            
-            if old_backup.exists():
-                if i == self.backup_count - 1:
-                    old_backup.unlink()
-                else:
-                    old_backup.rename(new_backup)
-        
-        # Rename current log file to .1
-        if self.current_log_file.exists():
-            self.current_log_file.rename(self.current_log_file.with_suffix(".1"))
+        rotate_log_file(self.current_log_file, self.backup_count)
+        self._size = 0
     
     def log_event(self, event: Event) -> None:
         """Log an event to the current log file."""
-        if not self.current_log_file:
-            self._init_log_file()
-        
         # Check if we need to rotate based on date
-        current_date = datetime.utcnow().strftime("%Y-%m-%d")
-        expected_log_file = self.log_dir / f"events-{current_date}.log"
-        
-        if expected_log_file != self.current_log_file:
-            self.current_log_file = expected_log_file
+        log_file = self.current_log_file
+        if not log_file or not self._day_start <= datetime.utcnow() < self._day_end:
+            log_file = self._init_log_file()
         
         # Check if we need to rotate based on size
-        if self.current_log_file and self.current_log_file.exists() and self.current_log_file.stat().st_size > self.max_size:
+        if self._size > self.max_size:
             self._rotate_logs()
         
-        # Log the event
+        # Log the event, reusing its serialized form if already encoded
         try:
-            with open(self.current_log_file, 'a') as f:
-                event_data = event.to_dict()
-                f.write(json.dumps(event_data) + '\n')
+            line = get_codec("json").serialize(event) + b'\n'
+            with open(log_file, 'ab') as f:
+                f.write(line)
+            self._size += len(line)
         except Exception as e:
             logger.error(f"Failed to log event: {e}")
     
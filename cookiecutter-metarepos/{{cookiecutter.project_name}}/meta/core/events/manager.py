@@ -2,20 +2,48 @@
 Event management system using ZeroMQ for pub/sub communication.
 """
 import asyncio
-import json
 import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 from urllib.parse import urlparse
 
 import zmq
 from zmq.asyncio import Context, Socket
 
-from .schema import Event, validate_event_namespace
+from .blobs import FLAG_BLOBS, BlobStore, frame_bytes, pack_blobs, unpack_blobs
+from .coalesce import CoalesceRule, Coalescer
+from .codec import JSONCodec, get_codec, pack_header, unpack_header
+from .compression import FLAG_COMPRESSED, Compressor, decompress
+from .dedup import DedupWindow
+from .dispatch import (
+    EXECUTOR_INLINE, EXECUTOR_PROCESS, EXECUTOR_THREAD, EXECUTORS, OVERFLOW_BLOCK,
+    KeyFunc, ResultCallback, Subscription, check_picklable
+)
+from .heartbeat import (
+    HEARTBEAT_NAMESPACE, POLICY_DISCONNECT, POLICY_SHED, SLOW_CONSUMER_NAMESPACE,
+    SLOW_CONSUMER_POLICIES, PeerTracker, peer_name
+)
+from .limits import EventLimit, EventLimiter
+from .replay import EventLogReader, Since
+from .rpc import RPCServer
+from .schema import Event, validate_event_namespace, validate_subscription_pattern
+from .stats import EventStats
+from .transport import broker_addresses, event_address, shared_context
+from .trie import NamespaceTrie, zmq_prefix
+from .writer import EventLogWriter
 
 logger = logging.getLogger(__name__)
 
+# Codec of messages published without a header frame
+_LEGACY_CODEC = JSONCodec()
+
+# Control-plane namespaces delivered ahead of data-plane traffic
+CONTROL_NAMESPACES = ("core:system:*", "core:plugin:*")
+
 class EventManager:
     """Manages event distribution using ZeroMQ pub/sub system."""
     
@@ -30,22 +58,179 @@ class EventManager:
         self.protocol = self.config.get("protocol", "tcp")
         
         # Construct the ZMQ address
-        if self.protocol == "tcp":
-            self.address = f"tcp://{self.host}:{self.port}"
-        elif self.protocol == "ipc":
-            self.address = f"ipc:///tmp/metarepos-events-{self.port}"
-        else:
-            raise ValueError(f"Unsupported protocol: {self.protocol}")
+        self.address = event_address(config)
+        
+        # Managers share one context per process unless configured otherwise;
+        # inproc only works within a single context. Messages are handed over
+        # without copying on inproc.
+        self.shared_context = (
+            bool(self.config.get("shared_context", True)) or self.protocol == "inproc"
+        )
+        self._copy = self.protocol != "inproc"
+        # Received frames are copied out of ZMQ, which is cheapest for small
+        # events; blob_zero_copy receives them as views instead, so large
+        # blobs are never copied
+        self._recv_copy = not bool(self.config.get("blob_zero_copy", False))
+        
+        # In broker mode an EventBroker owns the well-known addresses and
+        # every manager connects to it instead of binding its own socket
+        self.broker = bool(self.config.get("broker", False))
+        self.broker_frontend, self.broker_backend = broker_addresses(config)
+        
+        # Wire codec for published events
+        self.codec = get_codec(self.config.get("codec", "json"))
+        self._header = pack_header(self.codec)
+        
+        # Event blobs travel as separate frames without copying; between
+        # processes on one host, blobs above blob_shm_threshold bytes can go
+        # through shared memory instead (0, the default, disables it)
+        same_host = self.protocol == "ipc" or (
+            self.protocol == "tcp" and self.host in ("127.0.0.1", "localhost", "::1")
+        )
+        self._blob_store: Optional[BlobStore] = None
+        if same_host:
+            self._blob_store = BlobStore(
+                threshold=int(self.config.get("blob_shm_threshold", 0)),
+                ttl=float(self.config.get("blob_shm_ttl", 10.0))
+            )
+        
+        # Encoded events of compress_threshold bytes or more are compressed
+        # with zlib, by default only when sending over tcp to another host
+        remote = self.protocol == "tcp" and not same_host
+        self._compressor = Compressor(
+            threshold=int(self.config.get("compress_threshold", 65536 if remote else 0)),
+            level=int(self.config.get("compress_level", 1))
+        )
         
         self.log_path = log_path
+        self._log_writer: Optional[EventLogWriter] = None
+        if log_path:
+            self._log_writer = EventLogWriter(
+                log_path,
+                flush_interval=float(self.config.get("log_flush_interval", 0.05)),
+                batch_size=int(self.config.get("log_batch_size", 1000)),
+                fsync=bool(self.config.get("log_fsync", False)),
+                max_size=int(self.config.get("log_max_size", 0)),
+                backup_count=int(self.config.get("log_backup_count", 5))
+            )
         self.context: Optional[Context] = None
         self.publisher: Optional[Socket] = None
         self.subscriber: Optional[Socket] = None
-        self.subscribers: Dict[str, List[Callable]] = {}
+        self.control_subscriber: Optional[Socket] = None
+        self.subscribers: Dict[str, List[Subscription]] = {}
+        self.event_stats = EventStats()
+        self._trie: NamespaceTrie[Subscription] = NamespaceTrie()
+        
+        # Limits applied to coroutine callbacks unless given per subscription
+        self.callback_concurrency = int(self.config.get("callback_concurrency", 1))
+        self.callback_timeout = float(self.config.get("callback_timeout", 30.0))
+        
+        # Every subscription buffers events in its own bounded queue
+        self.queue_size = int(self.config.get("subscriber_queue_size", 1000))
+        self.overflow = self.config.get("subscriber_overflow", OVERFLOW_BLOCK)
+        
+        # Pools for subscriptions offloading CPU-heavy callbacks, created on
+        # first use (a size of 0 uses the concurrent.futures default).
+        # Process workers are spawned rather than forked so they never
+        # inherit the ZMQ context's threads.
+        self.thread_pool_size = int(self.config.get("thread_pool_size", 0))
+        self.process_pool_size = int(self.config.get("process_pool_size", 0))
+        self.process_start_method = self.config.get("process_start_method", "spawn")
+        self._executors: Dict[str, Executor] = {}
+        
+        # Control-plane events skip the auto-batch, arrive on a subscriber
+        # socket of their own (so they never queue behind data in a ZMQ
+        # pipe) and jump ahead in subscriber queues, served at most
+        # control_weight in a row while data events are waiting
+        self.control_namespaces = list(
+            self.config.get("control_namespaces", CONTROL_NAMESPACES)
+        )
+        self.control_weight = int(self.config.get("control_weight", 8))
+        self._control: NamespaceTrie[str] = NamespaceTrie()
+        for pattern in self.control_namespaces:
+            if not validate_subscription_pattern(pattern):
+                raise ValueError(f"Invalid control namespace: {pattern}")
+            self._control.add(pattern, pattern)
+        
+        # ZMQ high-water marks (None keeps the libzmq default)
+        self.sndhwm: Optional[int] = self.config.get("sndhwm")
+        self.rcvhwm: Optional[int] = self.config.get("rcvhwm")
         self._running = False
         self._subscriber_task: Optional[asyncio.Task] = None
+        self._control_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
         self._local_mode = True  # Use local callbacks for tests
         
+        # Auto-batching: events are gathered for up to batch_interval seconds
+        # or batch_size events and published as one multipart burst
+        self.batch_size = int(self.config.get("batch_size", 0))
+        self.batch_interval = float(self.config.get("batch_interval", 0.005))
+        self._batch: List[Event] = []
+        self._batch_task: Optional[asyncio.Task] = None
+        
+        # Rate limits and sampling drop events before anything else sees them
+        self._limiter = EventLimiter()
+        for limit in self.config.get("limits", []):
+            self.limit(
+                limit["pattern"],
+                rate=limit.get("rate"),
+                burst=limit.get("burst"),
+                sample=limit.get("sample"),
+                every=limit.get("every")
+            )
+        
+        # Events repeating an idempotency key seen within the last
+        # dedup_window seconds (0: until evicted) are dropped before limits,
+        # dispatch and logging. Emitted and received events are checked
+        # against separate windows of at most dedup_max_keys keys each
+        # (0 disables deduplication), so an event published by this process
+        # is still delivered when it comes back from the bus.
+        dedup_max_keys = int(self.config.get("dedup_max_keys", 10000))
+        dedup_window = float(self.config.get("dedup_window", 60.0))
+        self._emit_dedup = DedupWindow(dedup_max_keys, dedup_window)
+        self._receive_dedup = DedupWindow(dedup_max_keys, dedup_window)
+        
+        # Bursts of events sharing a key are collapsed before dispatch and
+        # logging according to the coalescing rules
+        self._coalescer = Coalescer(self._emit_events)
+        for rule in self.config.get("coalesce", []):
+            self.coalesce(rule["pattern"], rule["key"], float(rule.get("window", 0.05)))
+        
+        # Seconds a replaying subscriber waits before reading the log in
+        # distributed mode, so events published before its subscription
+        # reached the bus have been logged by the emitting process
+        self.replay_settle = float(self.config.get("replay_settle", 0.1))
+        
+        # In distributed mode every manager sends a heartbeat each
+        # heartbeat_interval seconds (0 disables them) and tracks the other
+        # peers' heartbeats. A process receiving its peers more than
+        # slow_consumer_lag seconds late applies slow_consumer_policy:
+        # warn, shed (discard data events until it has caught up) or
+        # disconnect (drop its subscriber connection and the backlog in it).
+        self.peer = peer_name()
+        self.heartbeat_interval = float(self.config.get("heartbeat_interval", 1.0))
+        self.slow_consumer_lag = float(self.config.get("slow_consumer_lag", 5.0))
+        self.slow_consumer_policy = self.config.get("slow_consumer_policy", "warn")
+        if self.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unsupported slow consumer policy: {self.slow_consumer_policy}")
+        self._peers = PeerTracker(
+            self.peer,
+            timeout=float(self.config.get("heartbeat_timeout", 3 * self.heartbeat_interval))
+        )
+        self._slow = False
+        self._reconnect = False
+        
+        # Seconds stop() spends delivering pending events before discarding
+        # them (0 waits for everything)
+        self.drain_timeout = float(self.config.get("drain_timeout", 5.0))
+        
+        # With stats_rpc, statistics are served on the RPC address for
+        # metarepos events stats while the manager runs
+        self._stats_server: Optional[RPCServer] = None
+        if self.config.get("stats_rpc", False):
+            self._stats_server = RPCServer(config)
+            self.serve_stats(self._stats_server)
+        
         # Set up logging
         if log_path:
             log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -57,50 +242,211 @@ class EventManager:
     
     async def start(self) -> None:
         """Start the event manager."""
-        self.context = Context()
+        if self._log_writer:
+            await self._log_writer.start()
+        
+        self.context = shared_context() if self.shared_context else Context()
         
         # Set up publisher
         self.publisher = self.context.socket(zmq.PUB)
-        self.publisher.bind(self.address)
+        if self.sndhwm is not None:
+            self.publisher.setsockopt(zmq.SNDHWM, self.sndhwm)
+        if self.broker:
+            self.publisher.connect(self.broker_frontend)
+        else:
+            self.publisher.bind(self.address)
         
         if not self._local_mode:
             # Set up subscriber for distributed mode
-            self.subscriber = self.context.socket(zmq.SUB)
-            self.subscriber.connect(self.address)
+            self.subscriber = self._connect_subscriber()
             
-            # Start subscriber task
+            # A second subscriber gets its own pipe from the publisher or
+            # broker, carrying only control-plane events
+            self.control_subscriber = self.context.socket(zmq.SUB)
+            self.control_subscriber.connect(
+                self.broker_backend if self.broker else self.address
+            )
+            for pattern in self.control_namespaces:
+                self.control_subscriber.setsockopt_string(zmq.SUBSCRIBE, zmq_prefix(pattern))
+            
+            # Start subscriber tasks
             self._running = True
-            self._subscriber_task = asyncio.create_task(self._handle_subscriptions())
+            self._subscriber_task = asyncio.create_task(
+                self._handle_subscriptions(self.subscriber)
+            )
+            self._control_task = asyncio.create_task(
+                self._handle_subscriptions(self.control_subscriber, control=True)
+            )
+            if self.heartbeat_interval:
+                self._heartbeat_task = asyncio.create_task(self._send_heartbeats())
+        
+        if self.broker:
+            logger.info(f"Event manager connected to broker at {self.broker_frontend}")
+        else:
+            logger.info(f"Event manager started on {self.address}")
         
-        logger.info(f"Event manager started on {self.address}")
+        if self._stats_server:
+            await self._stats_server.start()
         
         # Emit system startup event
-        await self.emit(Event.create("core:system:startup"))
+        await self._emit_lifecycle("core:system:startup")
     
-    async def stop(self) -> None:
-        """Stop the event manager."""
+    async def stop(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Stop the event manager, draining it within a deadline.
+        
+        The shutdown event is emitted, pending publishes and held events are
+        flushed and subscriber queues are drained for at most ``timeout``
+        seconds (``drain_timeout`` by default, 0 for no limit). Whatever is
+        left then is discarded: the receive loops are cancelled, queued
+        events dropped, running callbacks cancelled, and outgoing messages
+        get the rest of the deadline as socket linger.
+        
+        Returns a report of the drain: events delivered during it, events
+        dropped, callbacks cancelled, whether the deadline was hit and how
+        long it took.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if timeout is None:
+            timeout = self.drain_timeout
+        deadline = started + timeout if timeout else None
+        
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - loop.time())
+        
+        subscriptions = self._all_subscriptions()
+        delivered = -sum(subscription.delivered for subscription in subscriptions)
+        dropped = cancelled = 0
+        timed_out = False
+        
+        if self.publisher:
+            try:
+                await asyncio.wait_for(self._drain(), remaining())
+            except asyncio.TimeoutError:
+                timed_out = True
+                # Events that never made it out of the manager
+                dropped += self._coalescer.discard() + len(self._batch)
+                self._batch.clear()
+                if self._batch_task:
+                    self._batch_task.cancel()
+                    self._batch_task = None
+        
+        # The receive loops may be blocked in recv_multipart, so they are
+        # cancelled rather than waited for
         self._running = False
+        tasks = [
+            task
+            for task in (self._subscriber_task, self._control_task, self._heartbeat_task)
+            if task
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._subscriber_task = self._control_task = self._heartbeat_task = None
+        
+        for socket in (self.subscriber, self.control_subscriber):
+            if socket:
+                socket.close(linger=0)
+        self.subscriber = self.control_subscriber = None
+        
+        if self._stats_server:
+            await self._stats_server.stop()
+        
+        for subscription in subscriptions:
+            delivered += subscription.delivered
+            cancelled += subscription.in_flight
+            dropped += subscription.cancel()
         
         if self.publisher:
-            # Emit system shutdown event
-            await self.emit(Event.create("core:system:shutdown"))
-            
-            self.publisher.close()
+            # Messages still queued in ZMQ get what is left of the deadline
+            linger = remaining()
+            self.publisher.close(linger=-1 if linger is None else int(linger * 1000))
             self.publisher = None
         
-        if self.subscriber:
-            self.subscriber.close()
-            self.subscriber = None
+        if self._blob_store:
+            self._blob_store.close()
         
-        if self._subscriber_task:
-            await self._subscriber_task
-            self._subscriber_task = None
+        # After a timeout, callbacks still running in a pool are abandoned
+        executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            await asyncio.to_thread(
+                executor.shutdown, wait=not timed_out, cancel_futures=timed_out
+            )
         
         if self.context:
-            self.context.term()
+            if not self.shared_context:
+                await asyncio.to_thread(self.context.term)
             self.context = None
         
-        logger.info("Event manager stopped")
+        if self._log_writer:
+            await self._log_writer.stop()
+        
+        report = {
+            "delivered": delivered,
+            "dropped": dropped,
+            "cancelled": cancelled,
+            "timed_out": timed_out,
+            "duration": loop.time() - started,
+        }
+        if timed_out:
+            logger.warning(
+                f"Event manager stopped after the {timeout}s drain deadline: "
+                f"{delivered} events delivered, {dropped} dropped, "
+                f"{cancelled} callbacks cancelled"
+            )
+        else:
+            logger.info(f"Event manager stopped: {delivered} events delivered while draining")
+        return report
+    
+    def _connect_subscriber(self) -> Socket:
+        """Create the data-plane subscriber socket with every subscription."""
+        if self.context is None:
+            raise RuntimeError("Event manager not started")
+        socket = self.context.socket(zmq.SUB)
+        if self.rcvhwm is not None:
+            socket.setsockopt(zmq.RCVHWM, self.rcvhwm)
+        socket.connect(self.broker_backend if self.broker else self.address)
+        for pattern in self.subscribers:
+            socket.setsockopt_string(zmq.SUBSCRIBE, zmq_prefix(pattern))
+        if self.heartbeat_interval:
+            socket.setsockopt_string(zmq.SUBSCRIBE, HEARTBEAT_NAMESPACE)
+        return socket
+    
+    async def _drain(self) -> None:
+        """Deliver everything pending, then the shutdown event."""
+        # Events emitted before stop(), including those held for coalescing
+        # or batching, reach subscribers ahead of the shutdown event
+        await self.flush()
+        await self.join()
+        await self._emit_lifecycle("core:system:shutdown")
+        await self.flush()
+        # Let queued events and coroutine callbacks (e.g. shutdown
+        # handlers) finish
+        await self.join()
+    
+    async def _emit_lifecycle(self, namespace: str) -> None:
+        """
+        Emit a startup or shutdown event of this manager.
+        
+        On a broker's shared bus the event stays in this process: other
+        processes' plugins must not react to this process starting or
+        stopping.
+        """
+        event = Event.create(namespace)
+        if not self.broker or self._local_mode:
+            await self.emit(event)
+            return
+        
+        self.event_stats.namespace(namespace).emitted += 1
+        await self._dispatch(event, self.is_control(namespace))
+        if self._log_writer:
+            self._log_writer.write([event])
+    
+    @property
+    def batching(self) -> bool:
+        """Whether published events are gathered into bursts."""
+        return self.batch_size > 1
     
     async def emit(self, event: Event) -> None:
         """Emit an event to all subscribers."""
@@ -110,93 +456,612 @@ class EventManager:
         if not validate_event_namespace(event.namespace):
             raise ValueError(f"Invalid event namespace: {event.namespace}")
         
-        # Serialize the event
-        event_data = event.to_dict()
-        message = json.dumps(event_data)
+        if not self._admit(event):
+            return
+        self._encode_for_log(event)
+        self.event_stats.namespace(event.namespace).emitted += 1
         
+        control = self.is_control(event.namespace)
         if self._local_mode:
-            # Handle local subscribers directly
-            if event.namespace in self.subscribers:
-                for callback in self.subscribers[event.namespace]:
-                    try:
-                        callback(event)
-                    except Exception as e:
-                        logger.error(f"Error in event callback: {e}")
+            await self._dispatch(event, control)
+        elif control:
+            await self._publish([event])
+        elif self.batching:
+            self._batch.append(event)
+            if len(self._batch) >= self.batch_size:
+                await self._flush_batch()
+            elif not self._batch_task:
+                self._batch_task = asyncio.create_task(self._flush_later())
         else:
-            # Publish the event for distributed mode
-            await self.publisher.send_multipart([
-                event.namespace.encode(),
-                message.encode()
-            ])
+            await self._publish([event])
         
-        # Log the event
-        if self.log_path:
-            self._log_event(event)
+        # Queue the event for the background log writer
+        if self._log_writer:
+            self._log_writer.write([event])
         
         logger.debug(f"Emitted event: {event.namespace}")
     
-    def subscribe(self, namespace: str, callback: Callable[[Event], None]) -> None:
-        """Subscribe to events with the given namespace."""
-        if not validate_event_namespace(namespace):
+    async def emit_many(self, events: Iterable[Event]) -> None:
+        """
+        Emit several events at once.
+        
+        All namespaces are validated before anything is sent. In distributed
+        mode the events are published as multipart bursts.
+        """
+        if not self.publisher:
+            raise RuntimeError("Event manager not started")
+        
+        events = list(events)
+        for event in events:
+            if not validate_event_namespace(event.namespace):
+                raise ValueError(f"Invalid event namespace: {event.namespace}")
+        
+        events = [event for event in events if self._admit(event)]
+        for event in events:
+            self._encode_for_log(event)
+        await self._emit_events(events)
+    
+    def _encode_for_log(self, event: Event) -> None:
+        """
+        Encode an admitted event for the log sink before it is sent.
+        
+        An unserializable payload then raises to the emitter instead of
+        being dropped by the writer, which reuses the cached encoding.
+        """
+        if self._log_writer:
+            self._log_writer.encode(event)
+    
+    def _admit(self, event: Event) -> bool:
+        """
+        Apply deduplication, limits and coalescing, returning whether to
+        send the event now.
+        """
+        if self._duplicate(event, self._emit_dedup):
+            return False
+        if not self._limiter.allow(event):
+            self.event_stats.namespace(event.namespace).suppressed += 1
+            return False
+        return not self._coalescer.offer(event)
+    
+    def _duplicate(self, event: Event, window: DedupWindow) -> bool:
+        """Return whether an event repeats an idempotency key seen recently."""
+        key = event.idempotency_key
+        if key is None or not window.seen((event.namespace, key)):
+            return False
+        self.event_stats.namespace(event.namespace).duplicates += 1
+        logger.debug(f"Dropped duplicate event: {event.namespace} ({key})")
+        return True
+    
+    async def _emit_events(self, events: List[Event]) -> None:
+        """Send validated events, publishing them as one burst."""
+        if not events:
+            return
+        
+        for event in events:
+            self.event_stats.namespace(event.namespace).emitted += 1
+        
+        if self._local_mode:
+            for event in events:
+                await self._dispatch(event, self.is_control(event.namespace))
+        else:
+            # Keep ordering with anything still waiting in the auto-batch
+            self._batch.extend(events)
+            await self._flush_batch()
+        
+        if self._log_writer:
+            self._log_writer.write(events)
+        
+        logger.debug(f"Emitted {len(events)} events")
+    
+    async def flush(self) -> None:
+        """
+        Emit events held for coalescing, publish any events waiting in the
+        auto-batch and write the log.
+        """
+        await self._coalescer.flush()
+        await self._flush_batch()
+        if self._log_writer:
+            await self._log_writer.flush()
+    
+    async def _flush_batch(self) -> None:
+        """Publish any events waiting in the auto-batch."""
+        if self._batch_task and self._batch_task is not asyncio.current_task():
+            self._batch_task.cancel()
+        self._batch_task = None
+        
+        if not self._batch or not self.publisher:
+            return
+        
+        events, self._batch = self._batch, []
+        await self._publish(events)
+    
+    async def _flush_later(self) -> None:
+        """Flush the auto-batch once the batch interval has elapsed."""
+        await asyncio.sleep(self.batch_interval)
+        await self._flush_batch()
+    
+    async def _publish(self, events: List[Event]) -> None:
+        """
+        Publish events as multipart bursts.
+        
+        Each burst is ``[namespace, header, message, message, ...]`` for a
+        run of consecutive events sharing a namespace, so ZMQ topic filtering
+        still works on the first frame and the overall emission order is
+        kept. The header frame names the codec used for the messages.
+        
+        Events with blobs and events large enough to be compressed are sent
+        on their own as ``[namespace, header, message, index, blob, ...]``,
+        flagged in the header; these frames are handed to ZMQ without
+        copying.
+        """
+        publisher = self.publisher
+        if publisher is None:
+            raise RuntimeError("Event manager not started")
+        
+        frames: List[bytes] = []
+        current: Optional[str] = None
+        for event in events:
+            message = self._serialize(event)
+            compressed = self._compressor.compress(message)
+            if event._blobs or compressed is not None:
+                if frames:
+                    await publisher.send_multipart(frames, copy=self._copy)
+                frames, current = [], None
+                
+                flags = 0
+                if compressed is not None:
+                    message, flags = compressed, FLAG_COMPRESSED
+                blobs = []
+                if event._blobs:
+                    blobs, flags = pack_blobs(event, self._blob_store), flags | FLAG_BLOBS
+                await publisher.send_multipart(
+                    [event.namespace.encode(), pack_header(self.codec, flags), message, *blobs],
+                    copy=False
+                )
+                continue
+            
+            if event.namespace != current:
+                if frames:
+                    await publisher.send_multipart(frames, copy=self._copy)
+                current = event.namespace
+                frames = [current.encode(), self._header]
+            frames.append(message)
+        
+        if frames:
+            await publisher.send_multipart(frames, copy=self._copy)
+    
+    def _serialize(self, event: Event) -> bytes:
+        """Encode an event with the wire codec, timing the encoding."""
+        start = time.perf_counter()
+        data = self.codec.serialize(event)
+        self.event_stats.namespace(event.namespace).serialize.record(
+            time.perf_counter() - start
+        )
+        return data
+    
+    async def join(self) -> None:
+        """Wait until every subscriber has processed its queued events."""
+        await asyncio.gather(
+            *(subscription.wait() for subscription in self._all_subscriptions())
+        )
+    
+    def coalesce(
+        self,
+        pattern: str,
+        key: Union[str, KeyFunc],
+        window: float = 0.05
+    ) -> CoalesceRule:
+        """
+        Collapse bursts of events matching a pattern.
+        
+        Within ``window`` seconds only the last event per ``key`` is
+        dispatched and logged, e.g. ``coalesce("plugin:fs_monitor:*",
+        "path")`` keeps the last change per file. ``key`` is a payload field
+        name or a function of the event; events without a key pass through.
+        """
+        rule = CoalesceRule(pattern, key, window)
+        self._coalescer.add_rule(rule)
+        return rule
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return every statistic of this manager.
+        
+        Per namespace: events emitted, received from the bus, delivered,
+        dropped, suppressed, duplicated and failed, with histograms of
+        latency from emit to callback, callback duration and serialization
+        time. Per subscription: queue depth, counters and histograms. Rules,
+        limits, dedup windows, compression and the log writer report their
+        own counters, and ``heartbeat`` the lag of every peer on the bus.
+        """
+        return {
+            "address": self.broker_frontend if self.broker else self.address,
+            "namespaces": self.event_stats.to_dict(),
+            "subscriptions": self.queue_stats(),
+            "coalesce": self.coalesce_stats(),
+            "limits": self.limit_stats(),
+            "dedup": self.dedup_stats(),
+            "compression": self._compressor.stats(),
+            "heartbeat": self.peer_stats(),
+            "log": self._log_writer.stats() if self._log_writer else None,
+        }
+    
+    def dedup_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the size and hit rate of the emit and receive dedup windows."""
+        return {
+            "emit": self._emit_dedup.stats(),
+            "receive": self._receive_dedup.stats(),
+        }
+    
+    def peer_stats(self) -> Dict[str, Any]:
+        """Return this peer's name and lag, and the state of the other peers."""
+        return {
+            "peer": self.peer,
+            "lag": self._peers.lag,
+            "slow": self._slow,
+            "policy": self.slow_consumer_policy,
+            "peers": self._peers.stats(),
+        }
+    
+    def serve_stats(self, server: RPCServer) -> None:
+        """Answer ``core:events:stats`` calls, used by ``metarepos events stats``."""
+        server.register("core:events:stats", lambda params: self.stats())
+    
+    def limit(
+        self,
+        pattern: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        sample: Optional[float] = None,
+        every: Optional[int] = None
+    ) -> EventLimit:
+        """
+        Rate limit or sample the events matching a pattern.
+        
+        ``rate`` and ``burst`` set a token bucket in events per second,
+        ``sample`` keeps events with a probability and ``every`` keeps one
+        event in N. Suppressed events are counted and never dispatched,
+        serialized or logged. The most specific matching pattern applies.
+        """
+        limit = EventLimit(pattern, rate, burst, sample, every)
+        self._limiter.add(limit)
+        return limit
+    
+    def limit_stats(self) -> List[Dict[str, Any]]:
+        """Return how many events each limit let through or suppressed."""
+        return [limit.stats() for limit in self._limiter.limits]
+    
+    def coalesce_stats(self) -> List[Dict[str, Any]]:
+        """Return how many events each coalescing rule collapsed."""
+        return [rule.stats() for rule in self._coalescer.rules]
+    
+    def queue_stats(self) -> List[Dict[str, Any]]:
+        """Return queue depth and drop counters for every subscription."""
+        return [subscription.stats() for subscription in self._all_subscriptions()]
+    
+    def is_control(self, namespace: str) -> bool:
+        """Whether a namespace belongs to the control plane."""
+        return bool(self._control.match(namespace))
+    
+    async def _dispatch(
+        self,
+        event: Event,
+        priority: bool = False,
+        subscriptions: Optional[List[Subscription]] = None
+    ) -> None:
+        """Deliver an event to the subscribers matching its namespace."""
+        if subscriptions is None:
+            subscriptions = self._trie.match(event.namespace)
+        for subscription in subscriptions:
+            if not await subscription.put(event, priority):
+                self.event_stats.namespace(event.namespace).dropped += 1
+    
+    def _all_subscriptions(self) -> List[Subscription]:
+        """Return every registered subscription."""
+        return [
+            subscription
+            for subscriptions in self.subscribers.values()
+            for subscription in subscriptions
+        ]
+    
+    def subscribe(
+        self,
+        namespace: str,
+        callback: Callable[[Event], Any],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+        coalesce_key: Union[str, KeyFunc, None] = None,
+        executor: str = EXECUTOR_INLINE,
+        on_result: Optional[ResultCallback] = None,
+        where: Union[str, Callable[[Event], bool], None] = None
+    ) -> Subscription:
+        """
+        Subscribe to events with the given namespace.
+        
+        Any part of the namespace may be the ``*`` wildcard, e.g.
+        ``plugin:fs_monitor:*`` or ``core:*:*``. Coroutine callbacks are run
+        as tasks; ``max_concurrency`` and ``timeout`` override the
+        ``callback_concurrency`` and ``callback_timeout`` settings for them.
+        
+        Events are buffered in a queue of ``queue_size`` events (0 delivers
+        inline) handled according to ``overflow``: ``block``,
+        ``drop_oldest``, ``drop_newest`` or ``coalesce``. Coalescing replaces
+        a queued event sharing the same ``coalesce_key``, given as a payload
+        field name or a function of the event.
+        
+        ``executor`` selects where the callback runs: ``inline`` on the event
+        loop, or offloaded to the manager's ``thread`` or ``process`` pool
+        for CPU-heavy work. Process-pool callbacks must be picklable
+        module-level functions. Callback return values are passed to
+        ``on_result``; exceptions are logged and counted as errors.
+        
+        ``where`` narrows the subscription with a predicate on the event,
+        e.g. ``'path startswith "src/" and not is_directory'`` (see
+        ``core.events.filters``), compiled once here; events it rejects never
+        reach the queue or the callback.
+        """
+        if not validate_subscription_pattern(namespace):
             raise ValueError(f"Invalid event namespace: {namespace}")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Invalid callback executor: {executor}")
+        if executor == EXECUTOR_PROCESS:
+            check_picklable(callback)
+        
+        subscription = Subscription(
+            namespace,
+            callback,
+            max_concurrency=max_concurrency or self.callback_concurrency,
+            timeout=self.callback_timeout if timeout is None else timeout,
+            queue_size=self.queue_size if queue_size is None else queue_size,
+            overflow=overflow or self.overflow,
+            coalesce_key=coalesce_key,
+            priority_weight=self.control_weight,
+            stats=self.event_stats,
+            executor=self._executor(executor),
+            on_result=on_result,
+            where=where
+        )
         
         if namespace not in self.subscribers:
             self.subscribers[namespace] = []
             if self.subscriber and not self._local_mode:
-                self.subscriber.setsockopt_string(zmq.SUBSCRIBE, namespace)
+                self.subscriber.setsockopt_string(zmq.SUBSCRIBE, zmq_prefix(namespace))
         
-        self.subscribers[namespace].append(callback)
+        self.subscribers[namespace].append(subscription)
+        self._trie.add(namespace, subscription)
         logger.debug(f"Added subscriber for {namespace}")
+        return subscription
     
-    def unsubscribe(self, namespace: str, callback: Callable[[Event], None]) -> None:
+    def _executor(self, kind: str) -> Optional[Executor]:
+        """Return the pool for an executor kind, creating it on first use."""
+        if kind == EXECUTOR_INLINE:
+            return None
+        if kind not in self._executors:
+            if kind == EXECUTOR_THREAD:
+                self._executors[kind] = ThreadPoolExecutor(
+                    max_workers=self.thread_pool_size or None,
+                    thread_name_prefix="metarepos-events"
+                )
+            else:
+                self._executors[kind] = ProcessPoolExecutor(
+                    max_workers=self.process_pool_size or None,
+                    mp_context=multiprocessing.get_context(self.process_start_method)
+                )
+        return self._executors[kind]
+    
+    async def subscribe_since(
+        self,
+        namespace: str,
+        callback: Callable[[Event], Any],
+        since: Optional[Since] = None,
+        offset: int = 0,
+        log_path: Optional[Path] = None,
+        **options: Any
+    ) -> Subscription:
+        """
+        Subscribe to events, first replaying the logged ones since a point.
+        
+        ``since`` is a timestamp (a naive UTC datetime or epoch seconds) and
+        ``offset`` an offset in the event log; without either the whole log
+        is replayed. Matching events are read from the event
+        log, including rotated backups, and delivered before live events.
+        The live subscription is registered before the log is read and its
+        events are held meanwhile; held events already in the backlog are
+        skipped, so none is delivered twice. Avoiding a gap is best effort:
+        in distributed mode the subscription needs time to reach other
+        publishers, and their events to reach their logs, so the log is
+        read after ``replay_settle`` seconds. Events published before the
+        subscription propagated and logged only after that are missed.
+        
+        ``log_path`` reads another process's log, e.g. the bus daemon's from
+        a CLI process; it defaults to this manager's log. Other options are
+        passed to ``subscribe``.
+        """
+        if log_path is None:
+            if not self._log_writer:
+                raise ValueError("Replay requires an event log")
+            log_path = self._log_writer.path
+        
+        subscription = self.subscribe(namespace, callback, **options)
+        subscription.hold()
+        try:
+            if not self._local_mode:
+                await asyncio.sleep(self.replay_settle)
+            # Make sure everything emitted so far is in the log
+            await self.flush()
+            
+            reader = EventLogReader(
+                log_path, int(self.config.get("log_backup_count", 5))
+            )
+            backlog = await asyncio.to_thread(lambda: list(reader.read(namespace, since, offset)))
+            
+            for _, _, event in backlog:
+                if subscription.accepts(event):
+                    await subscription.push(event)
+            
+            codec = get_codec("json")
+            logged = {record for _, record, _ in backlog}
+            skipped = await subscription.release(
+                lambda event: codec.serialize(event) in logged
+            )
+        except BaseException:
+            self.unsubscribe(namespace, callback)
+            raise
+        
+        logger.debug(
+            f"Replayed {len(backlog)} events for {namespace}, "
+            f"{skipped} duplicates skipped"
+        )
+        return subscription
+    
+    def unsubscribe(self, namespace: str, callback: Callable[[Event], Any]) -> None:
         """Unsubscribe from events with the given namespace."""
-        if namespace in self.subscribers:
+        subscriptions = self.subscribers.get(namespace, [])
+        for subscription in subscriptions:
+            if subscription.callback == callback:
+                break
+        else:
+            return
+        
+        subscriptions.remove(subscription)
+        self._trie.remove(namespace, subscription)
+        subscription.cancel()
+        if not subscriptions:
+            del self.subscribers[namespace]
+            if self.subscriber and not self._local_mode:
+                self.subscriber.setsockopt_string(zmq.UNSUBSCRIBE, zmq_prefix(namespace))
+        logger.debug(f"Removed subscriber for {namespace}")
+    
+    async def _send_heartbeats(self) -> None:
+        """Publish heartbeats and watch for peers going silent."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            backlog = sum(
+                len(subscription.queue)
+                for subscription in self._all_subscriptions()
+                if subscription.queue
+            )
             try:
-                self.subscribers[namespace].remove(callback)
-                if not self.subscribers[namespace]:
-                    del self.subscribers[namespace]
-                    if self.subscriber and not self._local_mode:
-                        self.subscriber.setsockopt_string(zmq.UNSUBSCRIBE, namespace)
-                logger.debug(f"Removed subscriber for {namespace}")
-            except ValueError:
-                pass
-    
-    async def _handle_subscriptions(self) -> None:
-        """Handle incoming events from subscriptions."""
-        if not self.subscriber or self._local_mode:
+                await self._publish([
+                    Event.create(HEARTBEAT_NAMESPACE, payload=self._peers.heartbeat(backlog))
+                ])
+            except zmq.ZMQError as e:
+                logger.error(f"Failed to send heartbeat: {e}")
+            
+            for peer in self._peers.expire():
+                logger.warning(
+                    f"Event bus peer {peer.name} sent no heartbeat for "
+                    f"{self._peers.timeout}s"
+                )
+    
+    async def _on_heartbeat(self, event: Event) -> None:
+        """Track a peer's heartbeat and apply the slow consumer policy."""
+        if self._peers.observe(event.payload) is None:
+            return
+        
+        lag = self._peers.lag
+        if not self._slow and lag > self.slow_consumer_lag:
+            self._slow = True
+            logger.warning(
+                f"Event bus consumer {self.peer} is {lag:.1f}s behind; "
+                f"applying the {self.slow_consumer_policy} policy"
+            )
+            self._reconnect = self.slow_consumer_policy == POLICY_DISCONNECT
+        elif self._slow and lag < self.slow_consumer_lag / 2:
+            self._slow = False
+            logger.info(f"Event bus consumer {self.peer} caught up ({lag:.1f}s behind)")
+        else:
+            return
+        
+        await self.emit(Event.create(SLOW_CONSUMER_NAMESPACE, payload={
+            "peer": self.peer,
+            "lag": lag,
+            "slow": self._slow,
+            "policy": self.slow_consumer_policy,
+        }))
+    
+    def _reconnect_subscriber(self) -> Socket:
+        """Replace the data subscriber socket, discarding the backlog queued for it."""
+        if self.subscriber:
+            self.subscriber.close(linger=0)
+        socket = self.subscriber = self._connect_subscriber()
+        self._peers.reset()
+        self._slow = self._reconnect = False
+        logger.warning(f"Event bus consumer {self.peer} reconnected, discarding its backlog")
+        return socket
+    
+    async def _handle_subscriptions(self, socket: Socket, control: bool = False) -> None:
+        """
+        Handle incoming events from one subscriber socket.
+        
+        Control-plane events are handled by the control socket's task, so
+        copies matched by wildcard patterns on the data socket are skipped.
+        """
+        if not socket or self._local_mode:
             return
         
         while self._running:
             try:
-                [namespace_bytes, message_bytes] = await self.subscriber.recv_multipart()
-                namespace = namespace_bytes.decode()
-                message = message_bytes.decode()
+                frames = await socket.recv_multipart(copy=self._recv_copy)
+                namespace = frame_bytes(frames[0]).decode()
+                if not control and self.is_control(namespace):
+                    continue
+                
+                # SUB filtering works on prefixes, so messages can arrive that
+                # no subscription matches; those are never decoded
+                heartbeat = namespace == HEARTBEAT_NAMESPACE
+                subscriptions = self._trie.match(namespace)
+                if not subscriptions and not heartbeat:
+                    continue
+                
+                if self._slow and self.slow_consumer_policy == POLICY_SHED and not (
+                    control or heartbeat
+                ):
+                    # Catch up by discarding data events undecoded
+                    self.event_stats.namespace(namespace).dropped += 1
+                    continue
                 
-                # Parse event data
-                event_data = json.loads(message)
-                event = Event.from_dict(event_data)
+                # The first frame is the topic used for SUB filtering; a burst
+                # carries one or more messages for that namespace, preceded by
+                # a codec header unless it comes from a legacy JSON peer
+                header = unpack_header(frame_bytes(frames[1]))
+                compressed = bool(header and header[1] & FLAG_COMPRESSED)
+                if header and header[1] & FLAG_BLOBS:
+                    # One event followed by its blobs, kept as views of the
+                    # received frames or of shared memory
+                    data = frame_bytes(frames[2])
+                    event = header[0].deserialize(decompress(data) if compressed else data)
+                    unpack_blobs(event, frames[3:])
+                    self.event_stats.namespace(namespace).received += 1
+                    if not self._duplicate(event, self._receive_dedup):
+                        await self._dispatch(event, control, subscriptions)
+                else:
+                    if header:
+                        codec, _ = header
+                        messages = frames[2:]
+                    else:
+                        codec, messages = _LEGACY_CODEC, frames[1:]
+                    
+                    stats = self.event_stats.namespace(namespace)
+                    for frame in messages:
+                        stats.received += 1
+                        data = frame_bytes(frame)
+                        event = codec.deserialize(decompress(data) if compressed else data)
+                        if heartbeat:
+                            # Heartbeats are bus bookkeeping, never delivered
+                            # to subscribers
+                            await self._on_heartbeat(event)
+                            continue
+                        if not self._duplicate(event, self._receive_dedup):
+                            await self._dispatch(event, control, subscriptions)
                 
-                # Call subscribers
-                if namespace in self.subscribers:
-                    for callback in self.subscribers[namespace]:
-                        try:
-                            callback(event)
-                        except Exception as e:
-                            logger.error(f"Error in event callback: {e}")
+                # Only the data socket is replaced under the disconnect policy
+                if self._reconnect and not control:
+                    socket = self._reconnect_subscriber()
             
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error handling subscription: {e}")
-    
-    def _log_event(self, event: Event) -> None:
-        """Log an event to the log file."""
-        if not self.log_path:
-            return
-        
-        try:
-            with open(self.log_path, 'a') as f:
-                event_data = event.to_dict()
-                f.write(json.dumps(event_data) + '\n')
-        except Exception as e:
-            logger.error(f"Failed to log event: {e}")
\ No newline at end of file
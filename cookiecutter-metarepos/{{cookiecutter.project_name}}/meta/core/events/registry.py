@@ -0,0 +1,86 @@
+"""
+Registry of validated, interned event namespaces.
+"""
+import sys
+from typing import Dict, List, Optional
+
+# Ids fit in two bytes; namespaces beyond the limit are still validated,
+# just not remembered
+MAX_NAMESPACES = 1 << 16
+
+def check_namespace(namespace: str) -> bool:
+    """
+    Check the format of an event namespace.
+    
+    Format: category:component:action
+    Example: core:file:created
+    """
+    parts = namespace.split(":")
+    if len(parts) != 3:
+        return False
+    
+    if not all(part.isidentifier() for part in parts):
+        return False
+    
+    return True
+
+class NamespaceRegistry:
+    """
+    Remembers every valid namespace seen, so each is only checked once.
+    
+    Registered namespaces are interned (events share one string per
+    namespace) and numbered from 0 in registration order. Ids are local to
+    the process and stable for its lifetime, suitable as compact keys for
+    per-namespace tables.
+    """
+    
+    def __init__(self, max_size: int = MAX_NAMESPACES):
+        self.max_size = max_size
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._ids
+    
+    def validate(self, namespace: str) -> bool:
+        """Whether a namespace is valid, registering it if it is."""
+        if namespace in self._ids:
+            return True
+        if not check_namespace(namespace):
+            return False
+        if len(self._names) < self.max_size:
+            self._add(namespace)
+        return True
+    
+    def register(self, namespace: str) -> int:
+        """Register a namespace, returning its id."""
+        namespace_id = self._ids.get(namespace)
+        if namespace_id is not None:
+            return namespace_id
+        if not check_namespace(namespace):
+            raise ValueError(f"Invalid event namespace: {namespace}")
+        if len(self._names) >= self.max_size:
+            raise ValueError(f"Namespace registry is full ({self.max_size} namespaces)")
+        return self._add(namespace)
+    
+    def id(self, namespace: str) -> Optional[int]:
+        """Return the id of a registered namespace, or None."""
+        return self._ids.get(namespace)
+    
+    def name(self, namespace_id: int) -> str:
+        """Return the namespace registered under an id."""
+        if not 0 <= namespace_id < len(self._names):
+            raise ValueError(f"Unknown namespace id: {namespace_id}")
+        return self._names[namespace_id]
+    
+    def _add(self, namespace: str) -> int:
+        namespace = sys.intern(namespace)
+        namespace_id = self._ids[namespace] = len(self._names)
+        self._names.append(namespace)
+        return namespace_id
+
+# Namespaces validated anywhere in the process
+namespace_registry = NamespaceRegistry()
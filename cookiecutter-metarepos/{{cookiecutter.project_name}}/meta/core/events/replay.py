@@ -0,0 +1,96 @@
+"""
+Reading events back from the event log for replay.
+"""
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .codec import get_codec
+from .schema import Event
+from .trie import NamespaceTrie
+
+logger = logging.getLogger(__name__)
+
+# When a replay starts: a naive UTC datetime or epoch seconds
+Since = Union[datetime, float]
+
+_EPOCH = datetime(1970, 1, 1)
+
+class EventLogReader:
+    """
+    Reads events from a log written by EventLogWriter, oldest first.
+    
+    Rotated backups (``events.1`` ... ``events.N``) are read before the
+    current file. Offsets number the event records across the retained
+    files, starting at 0 with the oldest; they shift when rotation prunes
+    the oldest backup, so timestamps are the safer starting point for long
+    outages. Lines that are not event records, such as messages from the
+    manager's log handler sharing the file, are skipped.
+    """
+    
+    def __init__(self, path: Union[str, Path], backup_count: int = 5):
+        self.path = Path(path)
+        self.backup_count = backup_count
+    
+    def files(self) -> List[Path]:
+        """Return the existing log files, oldest first."""
+        paths = [self.path.with_suffix(f".{i}") for i in range(self.backup_count, 0, -1)]
+        paths.append(self.path)
+        return [path for path in paths if path.exists()]
+    
+    def read(
+        self,
+        pattern: str = "*:*:*",
+        since: Optional[Since] = None,
+        offset: int = 0
+    ) -> Iterator[Tuple[int, bytes, Event]]:
+        """
+        Yield ``(offset, record, event)`` for logged events matching a pattern.
+        
+        Records before the log offset ``offset`` or older than the
+        timestamp ``since`` are skipped. ``record`` is the logged JSON
+        without its newline; the decoded event keeps it as its cached JSON
+        encoding.
+        """
+        trie: NamespaceTrie[bool] = NamespaceTrie()
+        trie.add(pattern, True)
+        codec = get_codec("json")
+        if isinstance(offset, bool) or not isinstance(offset, int) or offset < 0:
+            raise ValueError(f"Invalid replay offset: {offset!r}")
+        start_offset = offset
+        start_time = _start_time(since)
+        
+        offset = -1
+        for path in self.files():
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.startswith(b"{"):
+                        continue
+                    offset += 1
+                    if offset < start_offset:
+                        continue
+                    
+                    record = line.rstrip(b"\n")
+                    try:
+                        event = codec.deserialize(record)
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.warning(f"Skipping unreadable event record in {path}: {e}")
+                        continue
+                    
+                    if start_time is not None and (event.time is None or event.time < start_time):
+                        continue
+                    if trie.match(event.namespace):
+                        yield offset, record, event
+
+def _start_time(since: Optional[Since]) -> Optional[float]:
+    """Convert a replay start time to epoch seconds."""
+    if since is None:
+        return None
+    if isinstance(since, datetime):
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return (since - _EPOCH).total_seconds()
+    if isinstance(since, (int, float)) and not isinstance(since, bool):
+        return float(since)
+    raise ValueError(f"Invalid replay start time: {since!r}")
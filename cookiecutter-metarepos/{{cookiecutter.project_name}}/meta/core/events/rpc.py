@@ -0,0 +1,294 @@
+"""
+Request/reply calls between plugins over ZeroMQ.
+"""
+import asyncio
+import functools
+import inspect
+import itertools
+import json
+import logging
+import struct
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import zmq
+from zmq.asyncio import Context, Socket
+
+from .transport import rpc_address, shared_context
+
+logger = logging.getLogger(__name__)
+
+# Request kinds and reply statuses
+CALL = b"call"
+CANCEL = b"cancel"
+REPLY_OK = b"ok"
+REPLY_ERROR = b"error"
+
+_CALL_ID = struct.Struct("!Q")
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+class RPCError(Exception):
+    """Raised when a remote call fails."""
+
+class RPCTimeout(RPCError, asyncio.TimeoutError):
+    """Raised when a remote call gets no reply in time."""
+
+def _uses_shared_context(config: Dict) -> bool:
+    """Whether RPC sockets use the process-wide context (always for inproc)."""
+    events = config.get("events", {})
+    return bool(events.get("shared_context", True)) or events.get("protocol") == "inproc"
+
+class RPCServer:
+    """
+    Serves named methods to RPCClients over a ROUTER socket.
+    
+    Handlers take the call's params dict and return a JSON-serializable
+    result. Coroutine handlers run as tasks, so calls are served
+    concurrently and a call cancelled or timed out by its client cancels
+    the handler. Failures are returned to the caller as ``RPCError``.
+    """
+    
+    def __init__(self, config: Dict, address: Optional[str] = None):
+        self.address = address or rpc_address(config)
+        self.shared_context = _uses_shared_context(config)
+        self.handlers: Dict[str, Handler] = {}
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self._context: Optional[Context] = None
+        self._socket: Optional[Socket] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Dict[Tuple[bytes, bytes], asyncio.Task] = {}
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of calls being handled."""
+        return len(self._in_flight)
+    
+    def register(self, method: str, handler: Handler) -> None:
+        """Serve a method, e.g. ``project_gen:templates:list``."""
+        if method in self.handlers:
+            raise ValueError(f"RPC method already registered: {method}")
+        self.handlers[method] = handler
+    
+    def unregister(self, method: str) -> None:
+        """Stop serving a method."""
+        self.handlers.pop(method, None)
+    
+    async def start(self) -> None:
+        """Bind the server socket and start serving calls."""
+        if self._task:
+            return
+        
+        self._context = shared_context() if self.shared_context else Context()
+        self._socket = self._context.socket(zmq.ROUTER)
+        self._socket.bind(self.address)
+        self._task = asyncio.create_task(self._serve(self._socket))
+        logger.info(f"RPC server started on {self.address}")
+    
+    async def stop(self) -> None:
+        """Cancel calls in progress and close the server socket."""
+        if not self._task:
+            return
+        
+        self._task.cancel()
+        handlers = list(self._in_flight.values())
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(self._task, *handlers, return_exceptions=True)
+        self._task = None
+        
+        if self._socket:
+            self._socket.close(linger=0)
+            self._socket = None
+        if self._context and not self.shared_context:
+            self._context.term()
+        self._context = None
+        logger.info("RPC server stopped")
+    
+    async def _serve(self, socket: Socket) -> None:
+        """Receive calls and cancellations."""
+        while True:
+            frames = await socket.recv_multipart()
+            try:
+                identity, _, kind, call_id, method, body = frames
+            except ValueError:
+                logger.warning(f"Dropping malformed RPC request of {len(frames)} frames")
+                continue
+            
+            key = (identity, call_id)
+            if kind == CANCEL:
+                task = self._in_flight.get(key)
+                if task:
+                    task.cancel()
+                continue
+            
+            task = asyncio.create_task(self._handle(socket, identity, call_id, method, body))
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+    
+    def _finished(self, key: Tuple[bytes, bytes], task: asyncio.Task) -> None:
+        """Forget a call once its handler is done."""
+        self._in_flight.pop(key, None)
+    
+    async def _handle(
+        self,
+        socket: Socket,
+        identity: bytes,
+        call_id: bytes,
+        method: bytes,
+        body: bytes
+    ) -> None:
+        """Run the handler of one call and send back its reply."""
+        self.calls += 1
+        # Undecodable names match no handler and get an error reply
+        name = method.decode(errors="replace")
+        try:
+            handler = self.handlers.get(name)
+            if handler is None:
+                raise LookupError(f"Unknown RPC method: {name}")
+            
+            result = handler(json.loads(body) if body else {})
+            if inspect.isawaitable(result):
+                result = await result
+            status, reply = REPLY_OK, json.dumps(result).encode()
+        except asyncio.CancelledError:
+            # The caller gave up on this call, so nobody awaits a reply
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error in RPC handler {name}: {e}")
+            status = REPLY_ERROR
+            reply = json.dumps({"type": type(e).__name__, "message": str(e)}).encode()
+        
+        await socket.send_multipart([identity, b"", call_id, status, reply])
+
+class RPCClient:
+    """
+    Calls methods served by an RPCServer over a DEALER socket.
+    
+    Every call gets a correlation id, so any number of calls can be in
+    flight at once and replies may arrive in any order. A call that times
+    out or whose task is cancelled tells the server to cancel its handler.
+    """
+    
+    def __init__(self, config: Dict, address: Optional[str] = None):
+        events = config.get("events", {})
+        self.address = address or rpc_address(config)
+        self.shared_context = _uses_shared_context(config)
+        self.timeout = float(events.get("rpc_timeout", 10.0))
+        self._context: Optional[Context] = None
+        self._socket: Optional[Socket] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of calls awaiting a reply."""
+        return len(self._pending)
+    
+    async def start(self) -> None:
+        """Connect to the server."""
+        if self._task:
+            return
+        
+        self._context = shared_context() if self.shared_context else Context()
+        self._socket = self._context.socket(zmq.DEALER)
+        self._socket.connect(self.address)
+        self._task = asyncio.create_task(self._receive(self._socket))
+    
+    async def stop(self) -> None:
+        """Fail calls still awaiting a reply and close the connection."""
+        if not self._task:
+            return
+        
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RPCError("RPC client stopped"))
+        
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        
+        if self._socket:
+            self._socket.close(linger=0)
+            self._socket = None
+        if self._context and not self.shared_context:
+            self._context.term()
+        self._context = None
+    
+    async def call(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Call a remote method and return its result.
+        
+        ``timeout`` overrides the ``rpc_timeout`` setting (0 waits forever).
+        Raises ``RPCTimeout`` when no reply arrives in time and ``RPCError``
+        when the handler fails or the method is unknown.
+        """
+        if not self._socket:
+            raise RuntimeError("RPC client not started")
+        
+        timeout = self.timeout if timeout is None else timeout
+        call_id = _CALL_ID.pack(next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+        try:
+            await self._socket.send_multipart(
+                [b"", CALL, call_id, method.encode(), json.dumps(params or {}).encode()]
+            )
+            return await asyncio.wait_for(future, timeout or None)
+        except asyncio.TimeoutError:
+            self._cancel(call_id)
+            raise RPCTimeout(f"RPC call {method} timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            self._cancel(call_id)
+            raise
+        finally:
+            self._pending.pop(call_id, None)
+    
+    def _cancel(self, call_id: bytes) -> None:
+        """Ask the server to cancel a call, without waiting."""
+        if self._socket:
+            sent = asyncio.ensure_future(
+                self._socket.send_multipart([b"", CANCEL, call_id, b"", b""])
+            )
+            sent.add_done_callback(_log_cancel_failure)
+    
+    async def _receive(self, socket: Socket) -> None:
+        """Resolve pending calls as replies arrive."""
+        while True:
+            frames = await socket.recv_multipart()
+            try:
+                _, call_id, status, body = frames
+            except ValueError:
+                logger.warning(f"Dropping malformed RPC reply of {len(frames)} frames")
+                continue
+            
+            future = self._pending.get(call_id)
+            if future is None or future.done():
+                # Reply to a call that timed out or was cancelled
+                continue
+            
+            try:
+                reply = json.loads(body)
+                if status != REPLY_OK:
+                    future.set_exception(RPCError(f"{reply['type']}: {reply['message']}"))
+                    continue
+            except (ValueError, KeyError, TypeError) as e:
+                # Fail only this call; the loop must keep serving the others
+                logger.warning(f"Dropping malformed RPC reply: {e}")
+                future.set_exception(RPCError(f"Malformed RPC reply: {e}"))
+                continue
+            future.set_result(reply)
+
+def _log_cancel_failure(sent: asyncio.Future) -> None:
+    """Report a cancellation request that could not be sent."""
+    if not sent.cancelled() and sent.exception() is not None:
+        logger.warning(f"Failed to send RPC cancellation: {sent.exception()}")
@@ -1,60 +1,215 @@
 """
 Event schema definitions for MetaRepos.
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple, Union
 
-@dataclass
-class Event:
-    """Base event class for MetaRepos events."""
-    namespace: str
-    timestamp: datetime
-    metadata: Optional[Dict] = None
-    payload: Optional[Dict] = None
+from .registry import namespace_registry
+
+# Metadata field holding the idempotency key of an event
+IDEMPOTENCY_KEY = "idempotency_key"
 
-    def __post_init__(self):
-        """Initialize default values for optional fields."""
-        self.metadata = self.metadata or {}
-        self.payload = self.payload or {}
+# Event timestamps are naive UTC datetimes, stored as epoch seconds
+_EPOCH = datetime(1970, 1, 1)
 
+class Event:
+    """
+    Base event class for MetaRepos events.
+    
+    ``blobs`` carries large binary data (file lists, diffs, archives) by
+    name, outside the encoded event: blobs travel as raw frames, or as
+    shared memory handles between processes on one host, and arrive as
+    bytes-like objects (``memoryview`` from other processes). Blobs are not
+    written to the event log.
+    
+    An event may carry an idempotency key (or event id) in its metadata;
+    the event manager drops repeats of a key within its dedup window.
+    
+    Events are compact, as many can sit in subscriber queues: attributes
+    live in slots, the namespace is interned and the timestamp is kept as
+    epoch seconds (``time``), turned into a datetime only when read. Empty
+    metadata, payload and blobs are only allocated when accessed, and a
+    payload received from the bus stays encoded until first read.
+    """
+    
+    __slots__ = (
+        "namespace", "time", "_metadata", "_payload", "_raw_payload", "_blobs",
+        "_serialized",
+    )
+    
+    def __init__(
+        self,
+        namespace: str,
+        timestamp: Union[datetime, float, None],
+        metadata: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        blobs: Optional[Dict[str, Any]] = None
+    ):
+        self.namespace = sys.intern(namespace)
+        self.time = _seconds(timestamp)
+        self._metadata = metadata or None
+        self._payload = payload or None
+        self._raw_payload: Optional[bytes] = None
+        self._blobs = blobs or None
+        # Serialized forms keyed by codec name, filled in by Codec.serialize.
+        # An event must not be modified once it has been serialized.
+        self._serialized: Optional[Dict[str, bytes]] = None
+    
     @classmethod
-    def create(cls, namespace: str, payload: Optional[Dict] = None, metadata: Optional[Dict] = None) -> 'Event':
+    def create(
+        cls,
+        namespace: str,
+        payload: Optional[Dict] = None,
+        metadata: Optional[Dict] = None,
+        blobs: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> 'Event':
         """Create a new event with the current timestamp."""
         if not validate_event_namespace(namespace):
             raise ValueError(f"Invalid event namespace: {namespace}")
         
-        return cls(
-            namespace=namespace,
-            timestamp=datetime.utcnow(),
-            metadata=metadata or {},
-            payload=payload or {}
+        if idempotency_key is not None:
+            metadata = {**(metadata or {}), IDEMPOTENCY_KEY: idempotency_key}
+        
+        # Whole microseconds, as a datetime would hold, so the time survives
+        # the ISO timestamps of the JSON codec unchanged
+        return cls(namespace, round(time.time(), 6), metadata, payload, blobs)
+    
+    @classmethod
+    def encoded(
+        cls,
+        namespace: str,
+        timestamp: float,
+        metadata: Optional[Dict],
+        payload: bytes
+    ) -> 'Event':
+        """Create an event whose payload is decoded from JSON when first read."""
+        event = cls(namespace, timestamp, metadata)
+        event._raw_payload = payload or None
+        return event
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        """When the event was created, as a naive UTC datetime."""
+        if self.time is None:
+            return None
+        return _EPOCH + timedelta(seconds=self.time)
+    
+    @timestamp.setter
+    def timestamp(self, value: Union[datetime, float, None]) -> None:
+        self.time = _seconds(value)
+    
+    @property
+    def metadata(self) -> Dict:
+        """Metadata about the event, such as its source or idempotency key."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict]) -> None:
+        self._metadata = value or None
+    
+    @property
+    def payload(self) -> Dict:
+        """The event data, decoded on first access if received encoded."""
+        if self._payload is None:
+            raw = self._raw_payload
+            self._payload = json.loads(raw) if raw is not None else {}
+            self._raw_payload = None
+        return self._payload
+    
+    @payload.setter
+    def payload(self, value: Optional[Dict]) -> None:
+        self._payload = value or None
+        self._raw_payload = None
+    
+    @property
+    def blobs(self) -> Dict[str, Any]:
+        """Binary data sent alongside the event, by name."""
+        if self._blobs is None:
+            self._blobs = {}
+        return self._blobs
+    
+    @blobs.setter
+    def blobs(self, value: Optional[Dict[str, Any]]) -> None:
+        self._blobs = value or None
+    
+    @property
+    def namespace_id(self) -> Optional[int]:
+        """The registry id of the namespace, None if it was never validated."""
+        return namespace_registry.id(self.namespace)
+    
+    @property
+    def idempotency_key(self) -> Optional[str]:
+        """The idempotency key of the event, if it has one."""
+        return self._metadata.get(IDEMPOTENCY_KEY) if self._metadata else None
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Event):
+            return NotImplemented
+        return (
+            self.namespace == other.namespace
+            and self.timestamp == other.timestamp
+            and self.metadata == other.metadata
+            and self.payload == other.payload
         )
-
+    
+    __hash__ = None  # type: ignore[assignment]
+    
+    def __repr__(self) -> str:
+        return (
+            f"Event(namespace={self.namespace!r}, timestamp={self.timestamp!r}, "
+            f"metadata={self.metadata!r}, payload={self.payload!r})"
+        )
+    
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickled events (for process pools) carry a decoded payload and no
+        # cached encodings
+        return Event, (self.namespace, self.time, self._metadata, self.payload, self._blobs)
+    
     def to_dict(self) -> Dict:
         """Convert the event to a dictionary for serialization."""
+        timestamp = self.timestamp
         return {
             "namespace": self.namespace,
-            "timestamp": self.timestamp.isoformat(),
-            "metadata": self.metadata or {},
-            "payload": self.payload or {}
+            "timestamp": timestamp.isoformat() if timestamp else None,
+            "metadata": self.metadata,
+            "payload": self.payload
         }
-
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'Event':
         """Create an event from a dictionary."""
         return cls(
             namespace=data["namespace"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            metadata=data.get("metadata", {}),
-            payload=data.get("payload", {})
+            timestamp=datetime.fromisoformat(data["timestamp"]) if data["timestamp"] else None,
+            metadata=data.get("metadata"),
+            payload=data.get("payload")
         )
 
+def _seconds(timestamp: Union[datetime, float, None]) -> Optional[float]:
+    """Convert a timestamp to epoch seconds, treating naive datetimes as UTC."""
+    if timestamp is None or isinstance(timestamp, float):
+        return timestamp
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return (timestamp - _EPOCH).total_seconds()
+    return float(timestamp)
+
 # Core event namespaces
 CORE_EVENTS = {
     # System events
     "core:system:startup": "System startup event",
     "core:system:shutdown": "System shutdown event",
+    "core:system:slow_consumer": "Event bus consumer fell behind or caught up",
+    
+    # Event bus events
+    "core:events:heartbeat": "Event bus peer liveness heartbeat",
     
     # Plugin events
     "core:plugin:loaded": "Plugin loaded event",
@@ -68,18 +223,31 @@ CORE_EVENTS = {
     "core:file:deleted": "File deleted event"
 }
 
+for _namespace in CORE_EVENTS:
+    namespace_registry.register(_namespace)
+
 def validate_event_namespace(namespace: str) -> bool:
     """
     Validate an event namespace.
     
     Format: category:component:action
     Example: core:file:created
+    
+    Valid namespaces are added to the namespace registry, so validating
+    one again is a dictionary lookup.
     """
-    parts = namespace.split(":")
-    if len(parts) != 3:
-        return False
+    return namespace_registry.validate(namespace)
+
+def validate_subscription_pattern(pattern: str) -> bool:
+    """
+    Validate a subscription pattern.
     
-    if not all(part.isidentifier() for part in parts):
+    Same format as an event namespace, but any part may be the ``*``
+    wildcard.
+    Example: plugin:fs_monitor:*
+    """
+    parts = pattern.split(":")
+    if len(parts) != 3:
         return False
     
-    return True
\ No newline at end of file
+    return all(part == "*" or part.isidentifier() for part in parts)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Latency histograms and counters for the event system.
+"""
+from typing import Any, Dict, List
+
+class Histogram:
+    """
+    Latency histogram with power-of-two microsecond buckets.
+    
+    Recording is a few integer operations, so it can run on every event.
+    Percentiles are reported as the upper bound of their bucket, i.e.
+    within a factor of two.
+    """
+    
+    __slots__ = ("counts", "count", "total", "max")
+    
+    BUCKETS = 32
+    
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        """Add a duration in seconds."""
+        index = min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, q: float) -> float:
+        """Return the duration in seconds below which ``q`` of samples fall."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index == self.BUCKETS - 1:
+                    return self.max
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+    
+    def summary(self) -> Dict[str, float]:
+        """Return the count, mean, p50, p90, p99 and max in seconds."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+class NamespaceStats:
+    """Counters and histograms for the events of one namespace."""
+    
+    __slots__ = (
+        "emitted", "received", "delivered", "dropped", "errors", "suppressed",
+        "duplicates", "latency", "callback", "serialize",
+    )
+    
+    def __init__(self) -> None:
+        self.emitted = 0
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.suppressed = 0
+        self.duplicates = 0
+        self.latency = Histogram()
+        self.callback = Histogram()
+        self.serialize = Histogram()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counters and histogram summaries."""
+        return {
+            "emitted": self.emitted,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "suppressed": self.suppressed,
+            "duplicates": self.duplicates,
+            "latency": self.latency.summary(),
+            "callback": self.callback.summary(),
+            "serialize": self.serialize.summary(),
+        }
+
+class EventStats:
+    """Per-namespace statistics of an event manager."""
+    
+    def __init__(self) -> None:
+        self.namespaces: Dict[str, NamespaceStats] = {}
+    
+    def namespace(self, namespace: str) -> NamespaceStats:
+        """Return the statistics of a namespace, creating them if needed."""
+        stats = self.namespaces.get(namespace)
+        if stats is None:
+            stats = self.namespaces[namespace] = NamespaceStats()
+        return stats
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of every namespace."""
+        return {
+            namespace: stats.to_dict()
+            for namespace, stats in sorted(self.namespaces.items())
+        }
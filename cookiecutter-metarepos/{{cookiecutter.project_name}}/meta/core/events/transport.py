@@ -0,0 +1,81 @@
+"""
+ZMQ addresses and contexts used by the event system.
+"""
+from typing import Any, Dict, Tuple
+
+from zmq.asyncio import Context
+
+PROTOCOLS = ("tcp", "ipc", "inproc")
+
+def shared_context() -> Context:
+    """
+    Return the ZMQ context shared by every event component in this process.
+    
+    Sharing one context lets same-process managers, brokers and plugins
+    talk over ``inproc`` and avoids an I/O thread per manager. Components
+    close their own sockets but never terminate the shared context.
+    """
+    return Context.instance()
+
+def _endpoint(config: Dict) -> Tuple[Dict, str, Any, str]:
+    """Return the ``[events]`` section, host, port and validated protocol."""
+    events = config.get("events", {})
+    protocol = events.get("protocol", "tcp")
+    if protocol not in PROTOCOLS:
+        raise ValueError(
+            f"Unsupported protocol: {protocol} (expected one of {', '.join(PROTOCOLS)})"
+        )
+    return events, events.get("host", "127.0.0.1"), events.get("port", 5555), protocol
+
+def event_address(config: Dict) -> str:
+    """Return the address a standalone EventManager binds its publisher to."""
+    _, host, port, protocol = _endpoint(config)
+    
+    if protocol == "tcp":
+        return f"tcp://{host}:{port}"
+    elif protocol == "ipc":
+        return f"ipc:///tmp/metarepos-events-{port}"
+    return f"inproc://metarepos-events-{port}"
+
+def broker_addresses(config: Dict) -> Tuple[str, str]:
+    """
+    Return the (frontend, backend) addresses of the broker.
+    
+    Publishers connect to the XSUB frontend and subscribers to the XPUB
+    backend. Both default to well-known addresses derived from the
+    ``[events]`` host, port and protocol.
+    """
+    events, host, port, protocol = _endpoint(config)
+    
+    if protocol == "tcp":
+        frontend = f"tcp://{host}:{port}"
+        backend = f"tcp://{host}:{int(port) + 1}"
+    elif protocol == "ipc":
+        frontend = f"ipc:///tmp/metarepos-events-{port}-in"
+        backend = f"ipc:///tmp/metarepos-events-{port}-out"
+    else:
+        frontend = f"inproc://metarepos-events-{port}-in"
+        backend = f"inproc://metarepos-events-{port}-out"
+    
+    return (
+        events.get("broker_frontend", frontend),
+        events.get("broker_backend", backend),
+    )
+
+def rpc_address(config: Dict) -> str:
+    """
+    Return the address of the RPC server.
+    
+    Defaults to a well-known address next to the event bus (the port after
+    the broker's on tcp) and can be set with ``rpc_address``.
+    """
+    events, host, port, protocol = _endpoint(config)
+    
+    if protocol == "tcp":
+        address = f"tcp://{host}:{int(port) + 2}"
+    elif protocol == "ipc":
+        address = f"ipc:///tmp/metarepos-rpc-{port}"
+    else:
+        address = f"inproc://metarepos-rpc-{port}"
+    
+    return str(events.get("rpc_address", address))
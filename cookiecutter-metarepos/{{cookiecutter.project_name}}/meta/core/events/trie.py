@@ -0,0 +1,128 @@
+"""
+Namespace trie used to match events against wildcard subscriptions.
+"""
+from typing import Dict, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+WILDCARD = "*"
+
+# Namespaces whose matches are remembered before the table starts over
+MAX_CACHED = 4096
+
+class _Node(Generic[T]):
+    """A single level of the namespace trie."""
+    
+    __slots__ = ("children", "values")
+    
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.values: List[T] = []
+
+class NamespaceTrie(Generic[T]):
+    """
+    Maps subscription patterns such as ``plugin:fs_monitor:*`` to values.
+    
+    Matching walks one level per namespace part, following both the exact
+    child and the wildcard child, so lookup cost depends on the namespace
+    depth rather than on the number of registered patterns. The result for
+    each namespace is kept in a dispatch table until patterns change, so
+    repeated lookups are a single dictionary hit; the returned lists are
+    shared and must not be modified.
+    """
+    
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+        self._size = 0
+        self._table: Dict[str, List[T]] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, pattern: str, value: T) -> None:
+        """Register a value under a pattern."""
+        node = self._root
+        for part in pattern.split(":"):
+            node = node.children.setdefault(part, _Node())
+        node.values.append(value)
+        self._size += 1
+        self._table = {}
+    
+    def remove(self, pattern: str, value: T) -> bool:
+        """Remove a value from a pattern, pruning empty branches."""
+        path = [self._root]
+        for part in pattern.split(":"):
+            child = path[-1].children.get(part)
+            if child is None:
+                return False
+            path.append(child)
+        
+        try:
+            path[-1].values.remove(value)
+        except ValueError:
+            return False
+        self._size -= 1
+        self._table = {}
+        
+        parts = pattern.split(":")
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.values or node.children:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+        return True
+    
+    def match(self, namespace: str) -> List[T]:
+        """Return the values of every pattern matching a namespace."""
+        matches = self._table.get(namespace)
+        if matches is None:
+            matches = self._match(namespace)
+            if len(self._table) >= MAX_CACHED:
+                self._table = {}
+            self._table[namespace] = matches
+        return matches
+    
+    def _match(self, namespace: str) -> List[T]:
+        nodes = [self._root]
+        for part in namespace.split(":"):
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(part)
+                if child is not None:
+                    next_nodes.append(child)
+                wildcard = node.children.get(WILDCARD)
+                if wildcard is not None:
+                    next_nodes.append(wildcard)
+            if not next_nodes:
+                return []
+            nodes = next_nodes
+        
+        matches = []
+        for node in nodes:
+            matches.extend(node.values)
+        return matches
+
+def zmq_prefix(pattern: str) -> str:
+    """
+    Convert a subscription pattern into a ZMQ ``SUBSCRIBE`` prefix.
+    
+    Everything up to the first wildcard is kept, so ``core:*:*`` becomes
+    ``core:`` and remote peers filter in the socket. An exact namespace is
+    used as-is; the trie then discards any longer namespace sharing it as a
+    prefix.
+    """
+    parts = pattern.split(":")
+    if WILDCARD not in parts:
+        return pattern
+    
+    fixed = parts[:parts.index(WILDCARD)]
+    return "".join(f"{part}:" for part in fixed)
+
+def specificity(pattern: str) -> Tuple[bool, ...]:
+    """
+    Rank a pattern for choosing between overlapping ones.
+    
+    Exact parts rank above wildcards, left to right, so ``core:plugin:*``
+    outranks ``core:*:*``.
+    """
+    return tuple(part != WILDCARD for part in pattern.split(":"))
@@ -0,0 +1,151 @@
+"""
+Group-commit writer for the event log.
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Union
+
+from .codec import get_codec
+from .logger import rotate_log_file
+from .schema import Event
+
+logger = logging.getLogger(__name__)
+
+class EventLogWriter:
+    """
+    Appends events to a log file from a background task.
+    
+    ``write`` encodes events on the event loop and only queues the lines,
+    so emitters never touch the disk. Queued lines are written in one batch
+    every ``flush_interval`` seconds, or as soon as ``batch_size`` events
+    are waiting, on a worker thread so the event loop is not blocked by
+    file I/O. An event that cannot be encoded is logged and skipped. With
+    ``fsync``
+    each batch is synced to disk as a group. The file size is tracked in
+    memory and the file is rotated once it exceeds ``max_size`` bytes
+    (0 disables rotation).
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = 0.05,
+        batch_size: int = 1000,
+        fsync: bool = False,
+        max_size: int = 0,
+        backup_count: int = 5
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.fsync = fsync
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self.written = 0
+        self.batches = 0
+        self.codec = get_codec("json")
+        self._pending: List[bytes] = []
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+    
+    @property
+    def pending(self) -> int:
+        """Number of events queued but not yet written."""
+        return len(self._pending)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return counters for the writer."""
+        return {
+            "pending": self.pending,
+            "written": self.written,
+            "batches": self.batches,
+            "size": self._size,
+        }
+    
+    async def start(self) -> None:
+        """Open the log file and start the background writer."""
+        if self._task:
+            return
+        self._closing = False
+        await asyncio.to_thread(self._open)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Write any queued events and close the log file."""
+        if self._task:
+            # Let an in-progress batch complete rather than cancelling it
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._file:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+    
+    def encode(self, event: Event) -> bytes:
+        """Return the log line of an event, reusing its cached JSON form."""
+        return self.codec.serialize(event) + b"\n"
+    
+    def write(self, events: Iterable[Event]) -> None:
+        """Queue events to be written with the next batch."""
+        for event in events:
+            try:
+                self._pending.append(self.encode(event))
+            except Exception as e:
+                logger.error(f"Failed to log event {event.namespace}: {e}")
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+    
+    async def flush(self) -> None:
+        """Write every queued event now."""
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._commit, lines)
+            except Exception as e:
+                logger.error(f"Failed to log events: {e}")
+    
+    async def _run(self) -> None:
+        """Flush queued events periodically or when a batch fills up."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
+    def _open(self) -> BinaryIO:
+        """Open the log file for appending and read its current size."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = self._file = open(self.path, "ab")
+        self._size = file.tell()
+        return file
+    
+    def _commit(self, lines: List[bytes]) -> None:
+        """Append a batch of encoded events (runs on a worker thread)."""
+        data = b"".join(lines)
+        
+        file = self._file or self._open()
+        if self.max_size and self._size and self._size + len(data) > self.max_size:
+            file.close()
+            rotate_log_file(self.path, self.backup_count)
+            file = self._open()
+        
+        file.write(data)
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+        
+        self._size += len(data)
+        self.written += len(lines)
+        self.batches += 1
@@ -282,6 +282,188 @@ class TestPluginCommands:
         assert result.exit_code == 0
         assert "not enabled" in strip_ansi(result.output)
 
+class TestEventCommands:
+    """Tests for event bus commands."""
+    
+    def test_events_help(self, isolated_cli_runner: CliRunner):
+        """Test the events help command."""
+        result = isolated_cli_runner.invoke(cli, ["events", "--help"])
+        assert result.exit_code == 0
+        assert "broker" in result.output
+    
+    def test_broker_invalid_config(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test running the broker with an unsupported protocol."""
+        with open(cli_env["METAREPOS_CONFIG"], "w") as f:
+            toml.dump({"events": {"protocol": "udp"}}, f)
+        
+        result = isolated_cli_runner.invoke(cli, ["events", "broker"])
+        assert result.exit_code == 0
+        assert "Error running event broker" in strip_ansi(result.output)
+    
+    def test_stats_from_running_bus(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test reading statistics from a process serving them."""
+        import asyncio
+        import threading
+        import time
+        
+        from core.events import Event, EventManager
+        
+        config = {"events": {"protocol": "ipc", "port": "test-cli-stats", "stats_rpc": True}}
+        with open(cli_env["METAREPOS_CONFIG"], "w") as f:
+            toml.dump(config, f)
+        
+        ready = threading.Event()
+        done = threading.Event()
+        
+        async def serve() -> None:
+            manager = EventManager(config)
+            await manager.start()
+            manager.subscribe("test:cli:*", lambda event: None)
+            await manager.emit(Event.create("test:cli:stats"))
+            await manager.join()
+            manager._peers.observe({"peer": "build-host:42:1", "sent": time.time(), "backlog": 2})
+            ready.set()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+            await manager.stop()
+        
+        thread = threading.Thread(target=asyncio.run, args=(serve(),))
+        thread.start()
+        try:
+            assert ready.wait(5)
+            result = isolated_cli_runner.invoke(cli, ["events", "stats"])
+        finally:
+            done.set()
+            thread.join()
+        
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert "test:cli:stats" in output
+        assert "test:cli:*" in output
+        assert "build-host:42:1" in output
+    
+    def test_stats_without_bus(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test reporting a bus that does not answer."""
+        with open(cli_env["METAREPOS_CONFIG"], "w") as f:
+            toml.dump({"events": {"protocol": "ipc", "port": "test-cli-none"}}, f)
+        
+        result = isolated_cli_runner.invoke(cli, ["events", "stats", "--timeout", "0.1"])
+        assert result.exit_code == 0
+        assert "Could not read event statistics" in strip_ansi(result.output)
+    
+    def test_tail_backlog(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test printing logged events since an offset."""
+        from core.events import Event, JSONCodec
+        
+        log_dir = Path(cli_env["METAREPOS_LOG_DIR"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+        codec = JSONCodec()
+        with open(log_dir / "events.log", "wb") as f:
+            for name in ("first", "second", "third"):
+                f.write(codec.serialize(Event.create(f"test:tail:{name}")) + b"\n")
+        
+        result = isolated_cli_runner.invoke(
+            cli, ["events", "tail", "test:tail:*", "--since", "1", "--no-follow"]
+        )
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert "test:tail:first" not in output
+        assert "test:tail:second" in output
+        assert "test:tail:third" in output
+    
+    def test_tail_follow(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test following the bus through the broker after the backlog."""
+        import asyncio
+        import signal
+        import threading
+        
+        from core.events import Event, EventBroker, EventManager
+        
+        config = {"events": {
+            "protocol": "ipc", "port": "test-cli-tail", "broker": True, "replay_settle": 0.05,
+        }}
+        with open(cli_env["METAREPOS_CONFIG"], "w") as f:
+            toml.dump(config, f)
+        log_dir = Path(cli_env["METAREPOS_LOG_DIR"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+        
+        main_thread = threading.get_ident()
+        failures = []
+        
+        async def daemon() -> None:
+            broker = EventBroker(config)
+            await broker.start()
+            manager = EventManager(config, log_dir / "events.log")
+            manager._local_mode = False
+            await manager.start()
+            try:
+                await manager.emit(Event.create("test:tail:logged"))
+                await manager.flush()
+                ready.set()
+                
+                # Wait for the tail process's subscribers, then go live
+                for _ in range(250):
+                    if broker.subscribers >= 4:
+                        break
+                    await asyncio.sleep(0.02)
+                else:
+                    failures.append("tail never connected")
+                await asyncio.sleep(0.3)
+                await manager.emit(Event.create("test:tail:live"))
+                await asyncio.sleep(0.3)
+            finally:
+                # Stop the tail as Ctrl-C would
+                signal.pthread_kill(main_thread, signal.SIGINT)
+                await manager.stop()
+                await broker.stop()
+        
+        ready = threading.Event()
+        thread = threading.Thread(target=asyncio.run, args=(daemon(),))
+        thread.start()
+        try:
+            assert ready.wait(5)
+            result = isolated_cli_runner.invoke(cli, ["events", "tail", "test:tail:*"])
+        finally:
+            thread.join()
+        
+        assert failures == []
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert output.count("test:tail:logged") == 1
+        assert output.count("test:tail:live") == 1
+    
+    def test_tail_follow_requires_broker(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test that following without the broker is refused."""
+        with open(cli_env["METAREPOS_CONFIG"], "w") as f:
+            toml.dump({"events": {"protocol": "ipc", "port": "test-cli-nobroker"}}, f)
+        
+        result = isolated_cli_runner.invoke(cli, ["events", "tail", "--follow"])
+        assert result.exit_code == 0
+        assert "--follow requires the event broker" in strip_ansi(result.output)
+    
+    def test_tail_without_broker(self, isolated_cli_runner: CliRunner, cli_env: Dict[str, str]):
+        """Test that tail prints the log and exits when there is no broker to follow."""
+        from core.events import Event, JSONCodec
+        
+        log_dir = Path(cli_env["METAREPOS_LOG_DIR"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+        with open(log_dir / "events.log", "wb") as f:
+            f.write(JSONCodec().serialize(Event.create("test:tail:logged")) + b"\n")
+        
+        result = isolated_cli_runner.invoke(cli, ["events", "tail", "test:tail:*"])
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert "test:tail:logged" in output
+        assert "--follow requires" not in output
+    
+    def test_tail_invalid_since(self, isolated_cli_runner: CliRunner):
+        """Test rejecting an invalid starting point."""
+        result = isolated_cli_runner.invoke(
+            cli, ["events", "tail", "--since", "yesterday", "--no-follow"]
+        )
+        assert result.exit_code == 0
+        assert "Invalid --since value" in strip_ansi(result.output)
+
 def test_invalid_command(isolated_cli_runner: CliRunner):
     """Test invoking an invalid command."""
     result = isolated_cli_runner.invoke(cli, ["invalid-command"])
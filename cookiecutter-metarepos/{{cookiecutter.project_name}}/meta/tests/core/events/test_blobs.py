@@ -0,0 +1,63 @@
+"""
+Tests for blobs sent next to events.
+"""
+import asyncio
+import json
+
+import pytest
+import zmq
+
+from core.events import Event
+from core.events.blobs import BlobStore, pack_blobs, unpack_blobs
+
+def test_pack_inline_blobs():
+    """Test that blobs below the threshold travel as frames."""
+    event = Event.create("test:blob:event", blobs={"a": b"xyz", "b": bytearray(b"12")})
+    frames = pack_blobs(event, BlobStore(threshold=1024))
+    
+    assert json.loads(frames[0]) == [{"name": "a", "size": 3}, {"name": "b", "size": 2}]
+    assert frames[1:] == [b"xyz", b"12"]
+    
+    received = Event.create("test:blob:event")
+    unpack_blobs(received, [zmq.Frame(frame) for frame in frames])
+    assert isinstance(received.blobs["a"], memoryview)
+    assert bytes(received.blobs["a"]) == b"xyz"
+    assert bytes(received.blobs["b"]) == b"12"
+
+@pytest.mark.asyncio
+async def test_shared_memory_blobs():
+    """Test that large blobs are published as shared memory handles."""
+    store = BlobStore(threshold=16, ttl=60)
+    data = bytes(range(256)) * 4
+    event = Event.create("test:blob:event", blobs={"big": data, "small": b"x"})
+    frames = pack_blobs(event, store)
+    
+    index = json.loads(frames[0])
+    assert "shm" in index[0] and index[0]["size"] == len(data)
+    assert frames[1:] == [b"x"]
+    assert store.exported == 1
+    
+    received = Event.create("test:blob:event")
+    unpack_blobs(received, [zmq.Frame(frame) for frame in frames])
+    assert bytes(received.blobs["big"]) == data
+    assert bytes(received.blobs["small"]) == b"x"
+    
+    # Released segments can no longer be attached
+    store.close()
+    with pytest.raises(FileNotFoundError):
+        unpack_blobs(Event.create("test:blob:event"), [zmq.Frame(frame) for frame in frames])
+
+@pytest.mark.asyncio
+async def test_shared_memory_ttl():
+    """Test that segments are released after their time to live."""
+    store = BlobStore(threshold=1, ttl=0.01)
+    frames = pack_blobs(Event.create("test:blob:event", blobs={"a": b"data"}), store)
+    await asyncio.sleep(0.05)
+    
+    with pytest.raises(FileNotFoundError):
+        unpack_blobs(Event.create("test:blob:event"), [zmq.Frame(frame) for frame in frames])
+
+def test_shared_memory_disabled():
+    """Test that a zero threshold keeps every blob inline."""
+    store = BlobStore(threshold=0)
+    assert not store.wants(b"x" * 10000000)
@@ -0,0 +1,156 @@
+"""
+Tests for the shared event broker.
+"""
+import asyncio
+from typing import Dict
+
+import pytest
+import pytest_asyncio
+import zmq
+
+from core.events import Event, EventBroker, EventManager
+from core.events.transport import broker_addresses
+
+@pytest.fixture
+def broker_config(test_config: Dict) -> Dict:
+    """Provide a configuration using a broker over ipc."""
+    test_config["events"].update({
+        "protocol": "ipc",
+        "port": "test-broker",
+        "broker": True,
+    })
+    return test_config
+
+@pytest_asyncio.fixture
+async def broker(broker_config: Dict) -> EventBroker:
+    """Provide a running broker."""
+    broker = EventBroker(broker_config, stats_interval=0.05)
+    await broker.start()
+    yield broker
+    await broker.stop()
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    """Wait until a condition holds."""
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+
+def test_broker_addresses():
+    """Test the default broker addresses."""
+    tcp = {"events": {"host": "127.0.0.1", "port": 5555, "protocol": "tcp"}}
+    assert broker_addresses(tcp) == ("tcp://127.0.0.1:5555", "tcp://127.0.0.1:5556")
+    
+    ipc = {"events": {"port": 5555, "protocol": "ipc"}}
+    assert broker_addresses(ipc) == (
+        "ipc:///tmp/metarepos-events-5555-in",
+        "ipc:///tmp/metarepos-events-5555-out",
+    )
+    
+    custom = {"events": {"broker_frontend": "tcp://10.0.0.1:1", "broker_backend": "tcp://10.0.0.1:2"}}
+    assert broker_addresses(custom) == ("tcp://10.0.0.1:1", "tcp://10.0.0.1:2")
+    
+    with pytest.raises(ValueError):
+        broker_addresses({"events": {"protocol": "udp"}})
+
+@pytest.mark.asyncio
+async def test_managers_share_bus(broker: EventBroker, broker_config: Dict):
+    """Test that several managers publish and subscribe through one broker."""
+    managers = [EventManager(broker_config) for _ in range(2)]
+    for manager in managers:
+        manager._local_mode = False
+    
+    received = []
+    managers[1].subscribe("test:broker:*", received.append)
+    for manager in managers:
+        await manager.start()
+    
+    try:
+        # Each manager connects a data and a control-plane subscriber
+        await wait_for(lambda: broker.subscribers == 4 and broker.publishers == 2)
+        await wait_for(lambda: "test:broker:" in broker.stats()["subscriptions"])
+        
+        await managers[0].emit(Event.create("test:broker:shared", payload={"from": 0}))
+        await wait_for(lambda: received)
+    finally:
+        for manager in managers:
+            await manager.stop()
+    
+    assert [event.payload for event in received] == [{"from": 0}]
+    stats = broker.stats()
+    assert stats["messages"] >= 1
+    assert stats["bytes"] > 0
+    assert stats["uptime"] > 0
+
+@pytest.mark.asyncio
+async def test_subscriptions_counted_per_subscriber(broker: EventBroker, broker_config: Dict):
+    """Test that each subscriber of a topic is counted and unsubscribes are seen."""
+    managers = [EventManager(broker_config) for _ in range(2)]
+    for manager in managers:
+        manager._local_mode = False
+        manager.subscribe("test:broker:*", print)
+        await manager.start()
+    
+    try:
+        await wait_for(lambda: broker.stats()["subscriptions"].get("test:broker:") == 2)
+        assert broker.stats()["subscriptions"]["test:broker:"] == 2
+        
+        managers[0].unsubscribe("test:broker:*", print)
+        await wait_for(lambda: broker.stats()["subscriptions"].get("test:broker:") == 1)
+        assert broker.stats()["subscriptions"]["test:broker:"] == 1
+    finally:
+        for manager in managers:
+            await manager.stop()
+
+@pytest.mark.asyncio
+async def test_inproc_peers_not_counted(test_config: Dict):
+    """Test that peer counts are unknown where socket monitors cannot see peers."""
+    test_config["events"].update({"protocol": "inproc", "port": "test-broker-peers"})
+    broker = EventBroker(test_config)
+    await broker.start()
+    try:
+        stats = broker.stats()
+        assert stats["publishers"] is None
+        assert stats["subscribers"] is None
+    finally:
+        await broker.stop()
+
+@pytest.mark.asyncio
+async def test_broker_address_in_use(test_config: Dict):
+    """Test that a second broker on the same addresses fails to start."""
+    test_config["events"].update({"protocol": "tcp", "port": 5581})
+    first = EventBroker(test_config)
+    await first.start()
+    
+    try:
+        second = EventBroker(test_config)
+        with pytest.raises(zmq.ZMQError):
+            await second.start()
+        assert not second.running
+        assert first.running
+    finally:
+        await first.stop()
+
+@pytest.mark.asyncio
+async def test_lifecycle_events_stay_local(broker: EventBroker, broker_config: Dict):
+    """Test that a manager stopping does not shut down other processes."""
+    managers = [EventManager(broker_config) for _ in range(2)]
+    lifecycle: Dict[int, list] = {0: [], 1: []}
+    for index, manager in enumerate(managers):
+        manager._local_mode = False
+        manager.subscribe("core:system:*", lambda event, i=index: lifecycle[i].append(event.namespace))
+    
+    await managers[0].start()
+    await wait_for(lambda: broker.subscribers == 2)
+    await managers[1].start()
+    try:
+        await wait_for(lambda: broker.subscribers == 4)
+        await asyncio.sleep(0.1)
+        await managers[1].stop()
+        await asyncio.sleep(0.1)
+        
+        assert lifecycle[0] == ["core:system:startup"]
+        assert lifecycle[1] == ["core:system:startup", "core:system:shutdown"]
+    finally:
+        for manager in managers:
+            await manager.stop()
@@ -0,0 +1,99 @@
+"""
+Tests for coalescing bursts of events.
+"""
+import asyncio
+
+import pytest
+
+from core.events import CoalesceRule, Event
+from core.events.coalesce import Coalescer
+
+def make_coalescer():
+    """Create a coalescer recording the events it releases."""
+    released = []
+    
+    async def release(events):
+        released.extend(events)
+    
+    return Coalescer(release), released
+
+@pytest.mark.asyncio
+async def test_keeps_last_event_per_key():
+    """Test that a burst collapses into its last event per key."""
+    coalescer, released = make_coalescer()
+    rule = CoalesceRule("plugin:fs_monitor:*", "path", window=0.02)
+    coalescer.add_rule(rule)
+    
+    for i in range(5):
+        assert coalescer.offer(
+            Event.create("plugin:fs_monitor:modified", payload={"path": "a.py", "seq": i})
+        )
+    assert coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": "b.py"}))
+    assert coalescer.pending == 2
+    assert released == []
+    
+    await asyncio.sleep(0.05)
+    assert [event.payload.get("seq") for event in released] == [4, None]
+    assert rule.coalesced == 4
+    assert rule.emitted == 2
+    assert coalescer.coalesced == 4
+
+@pytest.mark.asyncio
+async def test_unmatched_and_keyless_events_pass_through():
+    """Test that only matching events with a key are held."""
+    coalescer, _ = make_coalescer()
+    assert not coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": "a"}))
+    
+    coalescer.add_rule(CoalesceRule("plugin:fs_monitor:*", "path"))
+    assert not coalescer.offer(Event.create("plugin:git:commit", payload={"path": "a"}))
+    assert not coalescer.offer(Event.create("plugin:fs_monitor:modified"))
+    await coalescer.flush()
+
+@pytest.mark.asyncio
+async def test_namespaces_coalesce_separately():
+    """Test that events with the same key but different namespaces are kept."""
+    coalescer, released = make_coalescer()
+    coalescer.add_rule(CoalesceRule("plugin:fs_monitor:*", "path"))
+    coalescer.offer(Event.create("plugin:fs_monitor:created", payload={"path": "a"}))
+    coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": "a"}))
+    
+    await coalescer.flush()
+    assert [event.namespace for event in released] == [
+        "plugin:fs_monitor:created",
+        "plugin:fs_monitor:modified",
+    ]
+
+@pytest.mark.asyncio
+async def test_most_specific_rule_applies():
+    """Test that an exact pattern wins over a wildcard one."""
+    coalescer, _ = make_coalescer()
+    broad = CoalesceRule("plugin:*:*", "path", window=10)
+    narrow = CoalesceRule("plugin:fs_monitor:modified", lambda event: "all", window=10)
+    coalescer.add_rule(broad)
+    coalescer.add_rule(narrow)
+    
+    for path in ("a", "b"):
+        coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": path}))
+    assert narrow.coalesced == 1
+    assert broad.coalesced == 0
+    await coalescer.flush()
+
+@pytest.mark.asyncio
+async def test_discard():
+    """Test dropping held events without releasing them."""
+    coalescer, released = make_coalescer()
+    coalescer.add_rule(CoalesceRule("plugin:fs_monitor:*", "path", window=0.01))
+    coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": "a"}))
+    coalescer.offer(Event.create("plugin:fs_monitor:modified", payload={"path": "b"}))
+    
+    assert coalescer.discard() == 2
+    await asyncio.sleep(0.03)
+    assert released == []
+    assert coalescer.pending == 0
+
+def test_invalid_rule():
+    """Test rejecting invalid patterns and windows."""
+    with pytest.raises(ValueError):
+        CoalesceRule("invalid", "path")
+    with pytest.raises(ValueError):
+        CoalesceRule("plugin:*:*", "path", window=0)
@@ -0,0 +1,117 @@
+"""
+Tests for event wire codecs.
+"""
+import json
+
+import pytest
+
+from core.events import BinaryCodec, Codec, Event, JSONCodec, get_codec, register_codec
+from core.events.codec import pack_header, unpack_header
+
+@pytest.fixture
+def event() -> Event:
+    """Provide an event with metadata and payload."""
+    return Event.create(
+        namespace="plugin:fs_monitor:modified",
+        metadata={"source": "test"},
+        payload={"path": "src/main.py", "is_directory": False}
+    )
+
+@pytest.mark.parametrize("codec", [JSONCodec(), BinaryCodec()])
+def test_codec_round_trip(codec: Codec, event: Event):
+    """Test that codecs restore every event field."""
+    restored = codec.decode(codec.encode(event))
+    
+    assert restored.namespace == event.namespace
+    assert restored.timestamp == event.timestamp
+    assert restored.metadata == event.metadata
+    assert restored.payload == event.payload
+
+def test_binary_codec_empty_sections():
+    """Test that empty metadata and payload take no bytes."""
+    codec = BinaryCodec()
+    event = Event.create("core:system:startup")
+    data = codec.encode(event)
+    
+    assert len(data) == BinaryCodec._envelope.size + len(event.namespace)
+    assert codec.decode(data).payload == {}
+
+def test_binary_codec_is_smaller(event: Event):
+    """Test that the binary encoding is more compact than JSON."""
+    assert len(BinaryCodec().encode(event)) < len(JSONCodec().encode(event))
+
+def test_get_codec():
+    """Test codec lookup by name."""
+    assert isinstance(get_codec("json"), JSONCodec)
+    assert isinstance(get_codec("binary"), BinaryCodec)
+    with pytest.raises(ValueError):
+        get_codec("missing")
+
+def test_register_codec_rejects_duplicate_id():
+    """Test that codec ids cannot be reused by another codec."""
+    class Clash(JSONCodec):
+        name = "clash"
+        codec_id = BinaryCodec.codec_id
+    
+    with pytest.raises(ValueError):
+        register_codec(Clash())
+
+def test_header_round_trip():
+    """Test packing and parsing header frames."""
+    codec, flags = unpack_header(pack_header(get_codec("binary"), flags=3))
+    
+    assert codec.name == "binary"
+    assert flags == 3
+
+def test_legacy_frame_is_not_a_header(event: Event):
+    """Test that JSON event frames are not mistaken for headers."""
+    assert unpack_header(JSONCodec().encode(event)) is None
+    assert unpack_header(b"{}") is None
+
+def test_serialize_caches_encoding(event: Event, monkeypatch):
+    """Test that an event is encoded at most once per codec."""
+    codec = get_codec("json")
+    calls = []
+    original = JSONCodec.encode
+    monkeypatch.setattr(
+        JSONCodec, "encode", lambda self, event: calls.append(event) or original(self, event)
+    )
+    
+    first = codec.serialize(event)
+    second = codec.serialize(event)
+    
+    assert first is second
+    assert len(calls) == 1
+    assert codec.decode(first).payload == event.payload
+
+def test_deserialize_keeps_received_bytes(event: Event):
+    """Test that decoded events reuse the bytes they were received as."""
+    codec = get_codec("binary")
+    data = codec.encode(event)
+    
+    restored = codec.deserialize(data)
+    
+    assert codec.serialize(restored) is data
+
+def test_binary_payload_decoded_on_access(event: Event, monkeypatch):
+    """Test that received payloads stay encoded until first read."""
+    codec = get_codec("binary")
+    restored = codec.deserialize(codec.encode(event))
+    
+    loads = []
+    original = json.loads
+    monkeypatch.setattr(json, "loads", lambda data: loads.append(data) or original(data))
+    assert restored.namespace == event.namespace
+    assert restored.metadata == event.metadata
+    assert loads == []
+    
+    assert restored.payload == event.payload
+    assert restored.payload is restored.payload
+    assert len(loads) == 1
+    
+    # Re-encoding passes the undecoded payload through
+    assert codec.encode(codec.decode(codec.encode(event))) == codec.encode(event)
+
+def test_json_round_trip_preserves_equality(event: Event):
+    """Test that event times survive the ISO timestamps of the JSON codec."""
+    assert JSONCodec().decode(JSONCodec().encode(event)) == event
@@ -0,0 +1,31 @@
+"""
+Tests for event message compression.
+"""
+import pytest
+
+from core.events.compression import Compressor, decompress
+
+def test_compress_above_threshold():
+    """Test that only large messages that shrink are compressed."""
+    compressor = Compressor(threshold=100)
+    data = b'{"path": "src/core/events/manager.py"}' * 10
+    
+    assert compressor.compress(data[:50]) is None
+    compressed = compressor.compress(data)
+    assert compressed is not None
+    assert decompress(compressed) == data
+    assert compressor.compress(bytes(range(256))) is None
+    
+    stats = compressor.stats()
+    assert stats["messages"] == 1
+    assert stats["bytes_in"] == len(data)
+    assert stats["ratio"] < 0.5
+
+def test_compression_disabled():
+    """Test that a threshold of 0 disables compression."""
+    assert Compressor().compress(b"x" * 100000) is None
+
+def test_invalid_level():
+    """Test rejecting out-of-range zlib levels."""
+    with pytest.raises(ValueError):
+        Compressor(threshold=1, level=10)
@@ -0,0 +1,73 @@
+"""
+Tests for the idempotency key dedup window.
+"""
+import pytest
+
+from core.events import Event
+from core.events.dedup import DedupWindow
+
+class FakeClock:
+    """A clock advanced by hand."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+def test_repeats_within_window():
+    """Test that a key is a duplicate until it expires."""
+    clock = FakeClock()
+    window = DedupWindow(max_keys=10, ttl=1.0, clock=clock)
+    
+    assert not window.seen("a")
+    assert window.seen("a")
+    clock.now = 0.5
+    assert not window.seen("b")
+    clock.now = 1.2
+    assert window.seen("b")
+    assert not window.seen("a")
+    
+    stats = window.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["expired"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.4)
+
+def test_least_recently_seen_evicted():
+    """Test that the window never holds more than max_keys keys."""
+    window = DedupWindow(max_keys=2, ttl=0)
+    
+    window.seen("a")
+    window.seen("b")
+    window.seen("a")
+    window.seen("c")
+    
+    assert len(window) == 2
+    assert window.stats()["evicted"] == 1
+    assert window.seen("a")
+    assert not window.seen("b")
+
+def test_disabled_window():
+    """Test that a window of 0 keys lets everything through."""
+    window = DedupWindow(max_keys=0)
+    assert not window.seen("a")
+    assert not window.seen("a")
+    assert len(window) == 0
+
+@pytest.mark.parametrize("max_keys, ttl", [(-1, 1.0), (10, -1.0)])
+def test_invalid_window(max_keys: int, ttl: float):
+    """Test rejecting negative bounds."""
+    with pytest.raises(ValueError):
+        DedupWindow(max_keys, ttl)
+
+def test_event_idempotency_key():
+    """Test that the key travels in the event metadata."""
+    metadata = {"source": "watcher"}
+    event = Event.create("core:file:created", metadata=metadata, idempotency_key="k1")
+    
+    assert event.idempotency_key == "k1"
+    assert event.metadata == {"source": "watcher", "idempotency_key": "k1"}
+    assert metadata == {"source": "watcher"}
+    assert Event.from_dict(event.to_dict()).idempotency_key == "k1"
+    assert Event.create("core:file:created").idempotency_key is None
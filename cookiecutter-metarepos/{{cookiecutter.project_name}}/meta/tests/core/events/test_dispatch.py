@@ -0,0 +1,234 @@
+"""
+Tests for subscriber dispatch.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.events import Event, Subscription
+from core.events.dispatch import SubscriberQueue, payload_key
+
+@pytest.fixture
+def event() -> Event:
+    """Provide a test event."""
+    return Event.create("test:dispatch:event", payload={"test": "dispatch"})
+
+def test_sync_callback_runs_inline(event: Event):
+    """Test that plain callbacks are called immediately."""
+    received = []
+    subscription = Subscription("test:dispatch:*", received.append)
+    
+    subscription.deliver(event)
+    
+    assert not subscription.is_async
+    assert received == [event]
+
+def test_sync_callback_error_is_contained(event: Event):
+    """Test that callback errors do not propagate to the emitter."""
+    def callback(event: Event):
+        raise RuntimeError("boom")
+    
+    Subscription("test:dispatch:*", callback).deliver(event)
+
+@pytest.mark.asyncio
+async def test_async_callback_is_awaited(event: Event):
+    """Test that coroutine callbacks are run as tasks."""
+    received = []
+    
+    async def callback(event: Event):
+        await asyncio.sleep(0)
+        received.append(event)
+    
+    subscription = Subscription("test:dispatch:*", callback)
+    subscription.deliver(event)
+    
+    assert subscription.is_async
+    assert subscription.in_flight == 1
+    await subscription.wait()
+    assert received == [event]
+    assert subscription.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_concurrency_limit(event: Event):
+    """Test that in-flight invocations are bounded per subscriber."""
+    running = 0
+    peak = 0
+    
+    async def callback(event: Event):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+    
+    subscription = Subscription("test:dispatch:*", callback, max_concurrency=2)
+    for _ in range(6):
+        subscription.deliver(event)
+    await subscription.wait()
+    
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_slow_callback(event: Event):
+    """Test that a slow coroutine callback is cancelled after its timeout."""
+    finished = []
+    
+    async def callback(event: Event):
+        await asyncio.sleep(1)
+        finished.append(event)
+    
+    subscription = Subscription("test:dispatch:*", callback, timeout=0.01)
+    subscription.deliver(event)
+    await asyncio.wait_for(subscription.wait(), timeout=0.5)
+    
+    assert finished == []
+
+@pytest.mark.asyncio
+async def test_cancel(event: Event):
+    """Test cancelling in-flight invocations."""
+    async def callback(event: Event):
+        await asyncio.sleep(1)
+    
+    subscription = Subscription("test:dispatch:*", callback)
+    subscription.deliver(event)
+    await asyncio.sleep(0)
+    subscription.cancel()
+    await subscription.wait()
+    
+    assert subscription.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_executor_offloads_callback(event: Event):
+    """Test that callbacks run on the executor and report results back."""
+    results = []
+    
+    def callback(event: Event):
+        if event.payload.get("fail"):
+            raise RuntimeError("boom")
+        return threading.get_ident()
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        subscription = Subscription(
+            "test:dispatch:*",
+            callback,
+            executor=executor,
+            on_result=lambda event, result: results.append(result)
+        )
+        subscription.deliver(event)
+        subscription.deliver(Event.create("test:dispatch:event", payload={"fail": True}))
+        await subscription.wait()
+    
+    assert subscription.is_async
+    assert len(results) == 1
+    assert results[0] != threading.get_ident()
+    assert subscription.errors == 1
+
+@pytest.mark.asyncio
+async def test_executor_respects_max_concurrency():
+    """Test that unqueued pool work is only submitted once a slot is free."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+    
+    def callback(event: Event):
+        with lock:
+            running.append(event)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(event)
+    
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        subscription = Subscription(
+            "test:dispatch:*", callback, executor=executor, max_concurrency=1
+        )
+        for i in range(5):
+            subscription.deliver(Event.create("test:dispatch:event", payload={"i": i}))
+        await subscription.wait()
+    
+    assert len(peak) == 5
+    assert max(peak) == 1
+
+@pytest.mark.asyncio
+async def test_queue_drop_newest():
+    """Test that drop_newest discards incoming events when full."""
+    queue = SubscriberQueue(2, "drop_newest")
+    results = [await queue.put(Event.create("test:queue:event", payload={"i": i})) for i in range(4)]
+    
+    assert results == [True, True, False, False]
+    assert queue.dropped == 2
+    assert [(await queue.get()).payload["i"] for _ in range(2)] == [0, 1]
+
+@pytest.mark.asyncio
+async def test_queue_block():
+    """Test that the block policy waits for space."""
+    queue = SubscriberQueue(1, "block")
+    await queue.put(Event.create("test:queue:event", payload={"i": 0}))
+    
+    pending = asyncio.ensure_future(
+        queue.put(Event.create("test:queue:event", payload={"i": 1}))
+    )
+    await asyncio.sleep(0)
+    assert not pending.done()
+    
+    assert (await queue.get()).payload["i"] == 0
+    await pending
+    assert (await queue.get()).payload["i"] == 1
+    assert queue.dropped == 0
+
+@pytest.mark.asyncio
+async def test_queue_coalesce():
+    """Test that coalescing keeps the latest event per key in place."""
+    queue = SubscriberQueue(10, "coalesce", key=payload_key("path"))
+    for path, i in [("a", 0), ("b", 1), ("a", 2), ("a", 3)]:
+        await queue.put(Event.create("test:queue:event", payload={"path": path, "i": i}))
+    
+    assert len(queue) == 2
+    assert queue.coalesced == 2
+    assert (await queue.get()).payload == {"path": "a", "i": 3}
+    assert (await queue.get()).payload == {"path": "b", "i": 1}
+
+@pytest.mark.asyncio
+async def test_queue_priority_lane():
+    """Test that priority events bypass a full queue and are served first."""
+    queue = SubscriberQueue(2, "drop_newest", priority_weight=2)
+    for i in range(2):
+        await queue.put(Event.create("test:queue:data", payload={"i": i}))
+    for i in range(3):
+        assert await queue.put(Event.create("core:system:control", payload={"i": i}), priority=True)
+    
+    assert queue.dropped == 0
+    assert len(queue) == 5
+    order = [(await queue.get()).namespace for _ in range(5)]
+    # At most priority_weight control events in a row while data is waiting
+    assert order == [
+        "core:system:control",
+        "core:system:control",
+        "test:queue:data",
+        "core:system:control",
+        "test:queue:data",
+    ]
+
+def test_queue_invalid_policy():
+    """Test that unknown overflow policies are rejected."""
+    with pytest.raises(ValueError):
+        SubscriberQueue(1, "explode")
+    with pytest.raises(ValueError):
+        SubscriberQueue(1, "coalesce")
+
+@pytest.mark.asyncio
+async def test_queued_subscription_delivers_in_order():
+    """Test that a queued subscription delivers events through its worker."""
+    received = []
+    subscription = Subscription("test:dispatch:*", received.append, queue_size=4)
+    
+    for i in range(3):
+        await subscription.put(Event.create("test:dispatch:event", payload={"i": i}))
+    assert received == []
+    
+    await subscription.wait()
+    assert [event.payload["i"] for event in received] == [0, 1, 2]
+    subscription.cancel()
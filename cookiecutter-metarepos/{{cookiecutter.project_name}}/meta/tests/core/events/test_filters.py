@@ -0,0 +1,88 @@
+"""
+Tests for subscription payload predicates.
+"""
+import pytest
+
+from core.events import Event, Predicate, Subscription
+from core.events.filters import compile_predicate
+
+@pytest.fixture
+def event() -> Event:
+    """Provide a file event."""
+    return Event.create(
+        "plugin:fs_monitor:modified",
+        payload={
+            "path": "src/core/events.py",
+            "is_directory": False,
+            "size": 2048,
+            "stat": {"mode": 33188},
+        },
+        metadata={"source": "watcher"}
+    )
+
+@pytest.mark.parametrize("expression, expected", [
+    ('path startswith "src/" and not is_directory', True),
+    ('path startswith "docs/" or is_directory', False),
+    ("size > 1024 and size <= 4096", True),
+    ('path endswith ".py"', True),
+    ('path contains "/core/"', True),
+    ('path matches "src/*/*.py"', True),
+    ('path matches "tests/*"', False),
+    ('path in ["src/core/events.py", "README.md"]', True),
+    ("size not in [1, 2, 3]", True),
+    ("stat.mode == 33188", True),
+    ('metadata.source == "watcher"', True),
+    ("payload.size != 2048", False),
+    ('namespace == "plugin:fs_monitor:modified"', True),
+    ("not (is_directory or size < 10)", True),
+    ("missing == null", True),
+    ("missing > 3", False),
+    ('missing startswith "x"', False),
+    ("size startswith 2", False),
+])
+def test_predicate_matches(event: Event, expression: str, expected: bool):
+    """Test evaluating expressions against an event."""
+    assert Predicate(expression)(event) is expected
+
+@pytest.mark.parametrize("expression", [
+    "",
+    "path ==",
+    "path == 'src' and",
+    "(size > 1",
+    "path matches size",
+    "size ~ 1",
+    "size not 1",
+    "path in [size]",
+])
+def test_invalid_predicate(expression: str):
+    """Test that malformed expressions are rejected when compiled."""
+    with pytest.raises(ValueError):
+        Predicate(expression)
+
+def test_compile_predicate():
+    """Test that callables pass through and other values are rejected."""
+    def check(event: Event) -> bool:
+        return True
+    
+    assert compile_predicate(None) is None
+    assert compile_predicate(check) is check
+    assert isinstance(compile_predicate("size > 1"), Predicate)
+    with pytest.raises(ValueError):
+        compile_predicate(42)
+
+@pytest.mark.asyncio
+async def test_subscription_filters_before_delivery(event: Event):
+    """Test that rejected events are counted and never delivered."""
+    received = []
+    subscription = Subscription(
+        "plugin:fs_monitor:*", received.append, where="not is_directory"
+    )
+    
+    await subscription.put(event)
+    await subscription.put(
+        Event.create("plugin:fs_monitor:modified", payload={"is_directory": True})
+    )
+    
+    assert received == [event]
+    assert subscription.filtered == 1
+    assert subscription.stats()["filtered"] == 1
@@ -0,0 +1,55 @@
+"""
+Tests for peer heartbeats and lag tracking.
+"""
+from core.events.heartbeat import PeerTracker, peer_name
+
+class FakeClock:
+    """A settable clock."""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+def test_peer_names_are_unique():
+    """Test that every manager gets its own peer name."""
+    assert peer_name() != peer_name()
+
+def test_receive_lag():
+    """Test measuring how late heartbeats of other peers arrive."""
+    wall = FakeClock()
+    sender = PeerTracker("a", timeout=3.0, wall=wall)
+    receiver = PeerTracker("b", timeout=3.0, wall=wall)
+    
+    beat = sender.heartbeat(backlog=7)
+    wall.now += 2.5
+    peer = receiver.observe(beat)
+    
+    assert peer.lag == 2.5
+    assert receiver.lag == 2.5
+    assert receiver.stats()["a"]["backlog"] == 7
+    assert receiver.observe(receiver.heartbeat(backlog=0)) is None
+    
+    # The sender learns its consumer lag from the receiver's heartbeat
+    sender.observe(receiver.heartbeat(backlog=0))
+    assert sender.stats()["b"]["consumer_lag"] == 2.5
+    
+    receiver.reset()
+    assert receiver.lag == 0.0
+
+def test_silent_peers_become_stale():
+    """Test that peers without heartbeats for the timeout are marked stale."""
+    clock = FakeClock()
+    tracker = PeerTracker("b", timeout=3.0, clock=clock)
+    tracker.observe({"peer": "a", "seq": 1, "sent": 0.0})
+    assert tracker.lag > 0
+    
+    clock.now += 2.0
+    assert tracker.expire() == []
+    clock.now += 2.0
+    assert [peer.name for peer in tracker.expire()] == ["a"]
+    assert tracker.expire() == []
+    assert tracker.stats()["a"]["stale"]
+    # Stale peers no longer count towards the lag
+    assert tracker.lag == 0.0
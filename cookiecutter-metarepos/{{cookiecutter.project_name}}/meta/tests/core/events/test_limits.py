@@ -0,0 +1,74 @@
+"""
+Tests for rate limiting and sampling of events.
+"""
+import pytest
+
+from core.events import Event, EventLimit
+from core.events.limits import EventLimiter, TokenBucket
+
+class FakeClock:
+    """A clock advanced by hand."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+def test_token_bucket():
+    """Test that a bucket allows a burst, then refills at its rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+    
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.1
+    assert bucket.take()
+    assert not bucket.take()
+    clock.now = 10
+    assert sum(bucket.take() for _ in range(10)) == 3
+
+def test_every_nth():
+    """Test keeping one event in N."""
+    limit = EventLimit("plugin:fs_monitor:*", every=3)
+    assert [limit.allow() for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert limit.passed == 3
+    assert limit.sampled_out == 4
+
+def test_probabilistic_sampling():
+    """Test keeping events with a probability."""
+    assert not any(EventLimit("plugin:*:*", sample=0.0).allow() for _ in range(100))
+    assert all(EventLimit("plugin:*:*", sample=1.0).allow() for _ in range(100))
+    
+    limit = EventLimit("plugin:*:*", sample=0.5)
+    kept = sum(limit.allow() for _ in range(2000))
+    assert 800 < kept < 1200
+    assert limit.suppressed == 2000 - kept
+
+def test_rate_limit_counts():
+    """Test counting rate limited events."""
+    limit = EventLimit("plugin:*:*", rate=1, burst=2, clock=FakeClock())
+    assert [limit.allow() for _ in range(5)] == [True, True, False, False, False]
+    assert limit.rate_limited == 3
+    assert limit.stats()["rate"] == 1
+
+def test_limiter_most_specific_limit():
+    """Test that the most specific pattern applies."""
+    limiter = EventLimiter()
+    limiter.add(EventLimit("plugin:*:*", sample=0.0))
+    limiter.add(EventLimit("plugin:fs_monitor:*", every=1))
+    
+    assert limiter.allow(Event.create("plugin:fs_monitor:modified"))
+    assert not limiter.allow(Event.create("plugin:git:commit"))
+    assert limiter.allow(Event.create("core:system:startup"))
+    assert limiter.suppressed == 1
+
+def test_invalid_limits():
+    """Test rejecting invalid limits."""
+    with pytest.raises(ValueError):
+        EventLimit("invalid", rate=1)
+    with pytest.raises(ValueError):
+        EventLimit("plugin:*:*", rate=0)
+    with pytest.raises(ValueError):
+        EventLimit("plugin:*:*", sample=2)
+    with pytest.raises(ValueError):
+        EventLimit("plugin:*:*", every=0)
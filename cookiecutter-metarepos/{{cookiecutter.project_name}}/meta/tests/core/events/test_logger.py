@@ -140,4 +140,19 @@ def test_concurrent_logging(event_logger: EventLogger):
     
     # Verify all events were logged
     log_content = event_logger.current_log_file.read_text()
-    assert len(log_content.splitlines()) == 100
\ No newline at end of file
+    assert len(log_content.splitlines()) == 100
+
+def test_size_tracked_in_memory(event_logger: EventLogger, monkeypatch):
+    """Test that logging does not stat the log file on every write."""
+    event_logger.log_event(Event.create("test:logger:size"))
+    
+    stat_calls = []
+    original_stat = Path.stat
+    monkeypatch.setattr(
+        Path, "stat", lambda self, **kwargs: stat_calls.append(self) or original_stat(self, **kwargs)
+    )
+    for i in range(10):
+        event_logger.log_event(Event.create("test:logger:size", payload={"iteration": i}))
+    
+    assert stat_calls == []
+    assert event_logger._size == original_stat(event_logger.current_log_file).st_size
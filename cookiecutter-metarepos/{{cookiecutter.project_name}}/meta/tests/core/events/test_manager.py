@@ -2,13 +2,20 @@
 Tests for event manager functionality.
 """
 import asyncio
+import json
 from pathlib import Path
 from typing import Dict
 
 import pytest
 import pytest_asyncio
+import zmq
 
-from core.events import Event, EventManager
+from core.events import (Event, EventBroker, EventLogger, EventManager, JSONCodec,
+                         shared_context)
+
+def payload_total(event: Event) -> int:
+    """Sum an event's values (module-level so process pools can pickle it)."""
+    return sum(event.payload["values"])
 
 @pytest_asyncio.fixture
 async def event_manager(test_config: Dict, tmp_path: Path) -> EventManager:
@@ -36,6 +43,9 @@ async def test_event_emission(event_manager: EventManager, tmp_path: Path):
     )
     await event_manager.emit(event)
     
+    # Log writes happen in the background; flush them before checking
+    await event_manager.flush()
+    
     # Check that the event was logged
     log_path = tmp_path / "events.log"
     assert log_path.exists()
@@ -156,4 +166,994 @@ async def test_event_manager_shutdown(test_config: Dict, tmp_path: Path):
     
     # Verify shutdown
     assert manager.publisher is None
-    assert manager.context is None
\ No newline at end of file
+    assert manager.context is None
+
+@pytest.mark.asyncio
+async def test_emit_many(event_manager: EventManager, tmp_path: Path):
+    """Test emitting a batch of events locally."""
+    received = []
+    event_manager.subscribe("test:event:batch", received.append)
+    
+    events = [
+        Event.create("test:event:batch", payload={"index": i})
+        for i in range(5)
+    ]
+    await event_manager.emit_many(events)
+    await event_manager.join()
+    await event_manager.flush()
+    
+    assert [event.payload["index"] for event in received] == list(range(5))
+    
+    # The whole batch is logged
+    log_lines = (tmp_path / "events.log").read_text().splitlines()
+    assert sum("test:event:batch" in line for line in log_lines) == 5
+
+@pytest.mark.asyncio
+async def test_emit_many_validates_all_events(event_manager: EventManager):
+    """Test that an invalid namespace rejects the whole batch."""
+    received = []
+    event_manager.subscribe("test:event:batch", received.append)
+    
+    events = [
+        Event.create("test:event:batch"),
+        Event(namespace="invalid:namespace", timestamp=None),
+    ]
+    with pytest.raises(ValueError):
+        await event_manager.emit_many(events)
+    
+    assert received == []
+
+@pytest.mark.asyncio
+async def test_unserializable_payload_raises(event_manager: EventManager, tmp_path: Path):
+    """Test that emit rejects a payload the log cannot encode."""
+    received = []
+    event_manager.subscribe("test:event:unserializable", received.append)
+    
+    with pytest.raises(TypeError):
+        await event_manager.emit(
+            Event.create("test:event:unserializable", payload={"path": tmp_path})
+        )
+    await event_manager.emit(Event.create("test:event:unserializable", payload={"ok": True}))
+    await event_manager.join()
+    await event_manager.flush()
+    
+    assert [event.payload for event in received] == [{"ok": True}]
+    log_lines = (tmp_path / "events.log").read_text().splitlines()
+    assert sum("test:event:unserializable" in line for line in log_lines) == 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [0, 8])
+async def test_distributed_batched_delivery(test_config: Dict, tmp_path: Path, batch_size: int):
+    """Test that bursts are unpacked for distributed subscribers in order."""
+    test_config["events"].update({
+        "protocol": "ipc",
+        "port": f"test-batch-{batch_size}",
+        "batch_size": batch_size,
+        "batch_interval": 0.01,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    await manager.start()
+    
+    received = []
+    manager.subscribe("test:event:*", received.append)
+    await asyncio.sleep(0.2)  # Allow the SUB filters to propagate
+    
+    try:
+        for i in range(10):
+            await manager.emit(Event.create("test:event:burst", payload={"index": i}))
+        await manager.emit_many([
+            Event.create("test:event:other", payload={"index": 10}),
+            Event.create("test:event:burst", payload={"index": 11}),
+        ])
+        
+        for _ in range(50):
+            if len(received) == 12:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await manager.stop()
+    
+    assert [event.payload["index"] for event in received] == list(range(12))
+
+@pytest.mark.asyncio
+async def test_wildcard_subscription(event_manager: EventManager):
+    """Test subscribing to a namespace pattern."""
+    received = []
+    event_manager.subscribe("test:wildcard:*", received.append)
+    
+    await event_manager.emit(Event.create("test:wildcard:first"))
+    await event_manager.emit(Event.create("test:wildcard:second"))
+    await event_manager.emit(Event.create("test:other:first"))
+    await event_manager.join()
+    
+    assert [event.namespace for event in received] == [
+        "test:wildcard:first",
+        "test:wildcard:second",
+    ]
+    
+    event_manager.unsubscribe("test:wildcard:*", received.append)
+    await event_manager.emit(Event.create("test:wildcard:third"))
+    await event_manager.join()
+    assert len(received) == 2
+
+def test_invalid_subscription_pattern(test_config: Dict):
+    """Test that malformed patterns are rejected."""
+    manager = EventManager(test_config)
+    with pytest.raises(ValueError):
+        manager.subscribe("test:*", lambda event: None)
+    with pytest.raises(ValueError):
+        manager.subscribe("test:wild*:event", lambda event: None)
+
+@pytest.mark.asyncio
+async def test_distributed_wildcard_subscription(test_config: Dict):
+    """Test that wildcard patterns registered before start filter remotely."""
+    test_config["events"].update({"protocol": "ipc", "port": "test-wildcard"})
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    
+    received = []
+    manager.subscribe("test:wildcard:*", received.append)
+    await manager.start()
+    await asyncio.sleep(0.2)  # Allow the SUB filters to propagate
+    
+    try:
+        await manager.emit(Event.create("test:other:ignored"))
+        await manager.emit(Event.create("test:wildcard:matched"))
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await manager.stop()
+    
+    assert [event.namespace for event in received] == ["test:wildcard:matched"]
+
+@pytest.mark.asyncio
+async def test_async_subscriber(event_manager: EventManager):
+    """Test that coroutine callbacks run without blocking the emitter."""
+    received = []
+    release = asyncio.Event()
+    
+    async def callback(event: Event):
+        await release.wait()
+        received.append(event)
+    
+    event_manager.subscribe("test:event:async", callback)
+    await event_manager.emit(Event.create("test:event:async"))
+    
+    # emit returned while the callback is still waiting
+    assert received == []
+    
+    release.set()
+    await asyncio.sleep(0.01)
+    assert len(received) == 1
+
+@pytest.mark.asyncio
+async def test_async_shutdown_handler_runs(test_config: Dict):
+    """Test that async shutdown handlers complete before stop returns."""
+    manager = EventManager(test_config)
+    await manager.start()
+    
+    handled = []
+    
+    async def handle_shutdown(event: Event):
+        await asyncio.sleep(0.01)
+        handled.append(event.namespace)
+    
+    manager.subscribe("core:system:shutdown", handle_shutdown)
+    await manager.stop()
+    
+    assert handled == ["core:system:shutdown"]
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_overflow(event_manager: EventManager):
+    """Test that a full subscriber queue applies its overflow policy."""
+    received = []
+    release = asyncio.Event()
+    
+    async def slow(event: Event):
+        await release.wait()
+        received.append(event.payload["index"])
+    
+    subscription = event_manager.subscribe(
+        "test:event:overflow", slow, queue_size=2, overflow="drop_oldest"
+    )
+    for i in range(6):
+        await event_manager.emit(Event.create("test:event:overflow", payload={"index": i}))
+    
+    stats = event_manager.queue_stats()[0]
+    assert stats["pattern"] == "test:event:overflow"
+    assert stats["depth"] == 2
+    assert stats["dropped"] == 4
+    
+    release.set()
+    await event_manager.join()
+    assert received == [4, 5]
+    assert subscription.stats()["delivered"] == 2
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_isolates_slow_consumer(event_manager: EventManager):
+    """Test that a slow subscriber does not delay other subscribers."""
+    fast = []
+    release = asyncio.Event()
+    
+    async def slow(event: Event):
+        await release.wait()
+    
+    event_manager.subscribe("test:event:storm", slow, queue_size=10, overflow="drop_newest")
+    event_manager.subscribe("test:event:storm", fast.append)
+    
+    for i in range(50):
+        await event_manager.emit(Event.create("test:event:storm", payload={"index": i}))
+    await asyncio.sleep(0.01)
+    
+    assert len(fast) == 50
+    release.set()
+
+def test_socket_high_water_marks(test_config: Dict):
+    """Test that high-water marks are read from the events config."""
+    test_config["events"].update({"sndhwm": 50000, "rcvhwm": 20000})
+    manager = EventManager(test_config)
+    
+    assert manager.sndhwm == 50000
+    assert manager.rcvhwm == 20000
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["json", "binary"])
+async def test_distributed_codec_interop(test_config: Dict, codec: str):
+    """Test that headers let peers decode each codec and legacy frames."""
+    test_config["events"].update({
+        "protocol": "ipc",
+        "port": f"test-codec-{codec}",
+        "codec": codec,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    
+    received = []
+    manager.subscribe("test:codec:*", received.append)
+    await manager.start()
+    await asyncio.sleep(0.2)  # Allow the SUB filters to propagate
+    
+    try:
+        await manager.emit(Event.create("test:codec:current", payload={"codec": codec}))
+        
+        # A peer predating codec headers sends bare JSON frames
+        legacy = Event.create("test:codec:legacy", payload={"codec": "legacy"})
+        await manager.publisher.send_multipart([
+            legacy.namespace.encode(),
+            json.dumps(legacy.to_dict()).encode(),
+        ])
+        
+        for _ in range(50):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await manager.stop()
+    
+    assert [event.payload["codec"] for event in received] == [codec, "legacy"]
+
+@pytest.mark.asyncio
+async def test_event_serialized_once_across_sinks(test_config: Dict, tmp_path: Path, monkeypatch):
+    """Test that publishing and every log sink share one encoding."""
+    calls = []
+    original = JSONCodec.encode
+    monkeypatch.setattr(
+        JSONCodec, "encode", lambda self, event: calls.append(event) or original(self, event)
+    )
+    
+    test_config["events"].update({"protocol": "ipc", "port": "test-serialize-once"})
+    manager = EventManager(test_config, tmp_path / "events.log")
+    manager._local_mode = False
+    event_logger = EventLogger(tmp_path / "logs")
+    await manager.start()
+    
+    try:
+        event = Event.create("test:serialize:once", payload={"test": "data"})
+        await manager.emit(event)
+        event_logger.log_event(event)
+    finally:
+        await manager.stop()
+    
+    assert calls.count(event) == 1
+    assert "test:serialize:once" in (tmp_path / "events.log").read_text()
+    assert "test:serialize:once" in event_logger.current_log_file.read_text()
+
+@pytest.mark.asyncio
+async def test_managers_share_context(test_config: Dict):
+    """Test that managers in one process share a ZMQ context."""
+    managers = []
+    for port in (5571, 5572):
+        config = {"events": dict(test_config["events"], port=port)}
+        manager = EventManager(config)
+        await manager.start()
+        managers.append(manager)
+    
+    try:
+        assert managers[0].context is managers[1].context
+        assert managers[0].context is shared_context()
+    finally:
+        for manager in managers:
+            await manager.stop()
+    
+    # Stopping a manager must not terminate the shared context
+    assert not shared_context().closed
+
+@pytest.mark.asyncio
+async def test_inproc_managers_through_broker(test_config: Dict):
+    """Test same-process managers exchanging events over inproc."""
+    test_config["events"].update({"protocol": "inproc", "port": "test", "broker": True})
+    broker = EventBroker(test_config)
+    await broker.start()
+    
+    publisher = EventManager(test_config)
+    subscriber = EventManager(test_config)
+    publisher._local_mode = subscriber._local_mode = False
+    
+    received = []
+    subscriber.subscribe("test:inproc:*", received.append)
+    await publisher.start()
+    await subscriber.start()
+    await asyncio.sleep(0.1)  # Allow the SUB filters to propagate
+    
+    try:
+        await publisher.emit(Event.create("test:inproc:event", payload={"data": "x" * 100000}))
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await publisher.stop()
+        await subscriber.stop()
+        await broker.stop()
+    
+    assert len(received) == 1
+    assert received[0].payload["data"] == "x" * 100000
+
+@pytest.mark.asyncio
+async def test_subscribe_since_replays_then_goes_live(event_manager: EventManager):
+    """Test replaying the log before switching to live events."""
+    for i in range(3):
+        await event_manager.emit(Event.create("test:replay:event", payload={"seq": i}))
+    
+    received = []
+    
+    async def emit_live():
+        # Emitted while the backlog is being read
+        await event_manager.emit(Event.create("test:replay:event", payload={"seq": 3}))
+    
+    task = asyncio.create_task(emit_live())
+    subscription = await event_manager.subscribe_since(
+        "test:replay:*", received.append, offset=0
+    )
+    await task
+    await event_manager.emit(Event.create("test:replay:event", payload={"seq": 4}))
+    await event_manager.join()
+    
+    assert [event.payload["seq"] for event in received] == [0, 1, 2, 3, 4]
+    assert subscription in event_manager.subscribers["test:replay:*"]
+
+@pytest.mark.asyncio
+async def test_subscription_release_skips_logged_events(event_manager: EventManager):
+    """Test that held live events already in the log are not repeated."""
+    received = []
+    subscription = event_manager.subscribe("test:replay:*", received.append)
+    subscription.hold()
+    
+    event = Event.create("test:replay:event")
+    await event_manager.emit(event)
+    await event_manager.flush()
+    
+    skipped = await subscription.release(lambda held: held is event)
+    assert skipped == 1
+    assert received == []
+
+@pytest.mark.asyncio
+async def test_subscribe_since_requires_log(test_config: Dict):
+    """Test that replay without an event log is rejected."""
+    manager = EventManager(test_config)
+    with pytest.raises(ValueError):
+        await manager.subscribe_since("test:replay:*", print, offset=0)
+    assert not manager.subscribers
+
+@pytest.mark.asyncio
+async def test_subscribe_since_from_other_process_log(test_config: Dict, tmp_path: Path):
+    """Test a bus client catching up from another manager's log, then live."""
+    test_config["events"].update({
+        "protocol": "inproc", "port": "test-replay", "broker": True,
+        "replay_settle": 0.05,
+    })
+    broker = EventBroker(test_config)
+    await broker.start()
+    
+    log_path = tmp_path / "events.log"
+    daemon = EventManager(test_config, log_path)
+    client = EventManager(test_config)
+    daemon._local_mode = client._local_mode = False
+    await daemon.start()
+    await client.start()
+    
+    received = []
+    try:
+        for i in range(3):
+            await daemon.emit(Event.create("test:replay:event", payload={"seq": i}))
+        await daemon.flush()
+        
+        await client.subscribe_since(
+            "test:replay:*", received.append, offset=0, log_path=log_path
+        )
+        await daemon.emit(Event.create("test:replay:event", payload={"seq": 3}))
+        for _ in range(50):
+            if len(received) == 4:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await client.stop()
+        await daemon.stop()
+        await broker.stop()
+    
+    assert [event.payload["seq"] for event in received] == [0, 1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_coalescing_before_dispatch_and_logging(test_config: Dict, tmp_path: Path):
+    """Test that coalesced events are dispatched and logged once."""
+    test_config["events"]["coalesce"] = [
+        {"pattern": "plugin:fs_monitor:*", "key": "path", "window": 0.02}
+    ]
+    log_path = tmp_path / "events.log"
+    manager = EventManager(test_config, log_path)
+    await manager.start()
+    
+    received = []
+    manager.subscribe("plugin:fs_monitor:*", received.append)
+    for i in range(10):
+        await manager.emit(
+            Event.create("plugin:fs_monitor:modified", payload={"path": "a.py", "seq": i})
+        )
+    await asyncio.sleep(0.05)
+    await manager.stop()
+    
+    assert [event.payload["seq"] for event in received] == [9]
+    assert log_path.read_text().count("plugin:fs_monitor:modified") == 1
+    stats = manager.coalesce_stats()
+    assert stats[0]["coalesced"] == 9
+    assert stats[0]["emitted"] == 1
+
+@pytest.mark.asyncio
+async def test_flush_releases_coalesced_events(event_manager: EventManager):
+    """Test that flushing emits events held for coalescing immediately."""
+    event_manager.coalesce("plugin:fs_monitor:*", "path", window=60)
+    received = []
+    event_manager.subscribe("plugin:fs_monitor:*", received.append)
+    
+    await event_manager.emit_many(
+        Event.create("plugin:fs_monitor:modified", payload={"path": path})
+        for path in ("a", "b", "a")
+    )
+    assert received == []
+    
+    await event_manager.flush()
+    await event_manager.join()
+    assert [event.payload["path"] for event in received] == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_control_events_overtake_data(event_manager: EventManager):
+    """Test that control-plane events skip a subscriber's data backlog."""
+    received = []
+    
+    async def record(event: Event):
+        received.append(event.namespace)
+    
+    event_manager.subscribe("*:*:*", record, queue_size=100)
+    await event_manager.emit_many(
+        Event.create("plugin:fs_monitor:modified", payload={"path": str(i)}) for i in range(50)
+    )
+    await event_manager.emit(Event.create("core:plugin:loaded"))
+    await event_manager.join()
+    
+    assert len(received) == 51
+    assert received.index("core:plugin:loaded") <= 1
+
+def test_control_namespaces_config(test_config: Dict):
+    """Test classifying namespaces into the control plane."""
+    manager = EventManager(test_config)
+    assert manager.is_control("core:system:shutdown")
+    assert manager.is_control("core:plugin:loaded")
+    assert not manager.is_control("plugin:fs_monitor:modified")
+    
+    test_config["events"]["control_namespaces"] = ["plugin:admin:*"]
+    assert EventManager(test_config).is_control("plugin:admin:reload")
+    
+    test_config["events"]["control_namespaces"] = ["invalid"]
+    with pytest.raises(ValueError):
+        EventManager(test_config)
+
+@pytest.mark.asyncio
+async def test_distributed_control_lane(test_config: Dict):
+    """Test that control events skip the auto-batch and arrive once."""
+    test_config["events"].update({
+        "protocol": "ipc", "port": "test-control",
+        "batch_size": 100, "batch_interval": 10.0,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    received = []
+    manager.subscribe("*:*:*", lambda event: received.append(event.namespace))
+    await manager.start()
+    await asyncio.sleep(0.1)  # Allow the SUB filters to propagate
+    
+    try:
+        await manager.emit(Event.create("plugin:fs_monitor:modified"))
+        await manager.emit(Event.create("core:plugin:loaded"))
+        for _ in range(50):
+            if "core:plugin:loaded" in received:
+                break
+            await asyncio.sleep(0.02)
+        # The data event is still waiting in the auto-batch
+        assert received.count("core:plugin:loaded") == 1
+        assert "plugin:fs_monitor:modified" not in received
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("protocol,threshold,zero_copy", [
+    ("inproc", 0, False), ("ipc", 0, False), ("ipc", 0, True), ("ipc", 1024, False),
+])
+async def test_distributed_blobs(test_config: Dict, protocol: str, threshold: int, zero_copy: bool):
+    """Test that blobs arrive as memoryviews, inline or via shared memory."""
+    test_config["events"].update({
+        "protocol": protocol, "port": f"test-blobs-{threshold}-{zero_copy}",
+        "blob_shm_threshold": threshold, "blob_zero_copy": zero_copy,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    received = []
+    manager.subscribe("test:blob:*", received.append)
+    await manager.start()
+    await asyncio.sleep(0.1)  # Allow the SUB filters to propagate
+    
+    data = b"\x00\x01" * 100000
+    try:
+        await manager.emit(Event.create("test:blob:event", payload={"n": 1}, blobs={"diff": data}))
+        await manager.emit(Event.create("test:blob:event", payload={"n": 2}))
+        for _ in range(50):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.02)
+        
+        assert [event.payload["n"] for event in received] == [1, 2]
+        assert isinstance(received[0].blobs["diff"], memoryview)
+        assert received[0].blobs["diff"] == data
+        assert received[1].blobs == {}
+        if threshold:
+            assert manager._blob_store.exported == 1
+        else:
+            # Zero-copy receives keep inline blobs as views of the ZMQ frames
+            assert isinstance(received[0].blobs["diff"].obj, zmq.Frame) == zero_copy
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_limited_events_never_serialized(test_config: Dict, tmp_path: Path, monkeypatch):
+    """Test that suppressed events skip dispatch, serialization and logging."""
+    test_config["events"]["limits"] = [{"pattern": "plugin:fs_monitor:*", "every": 4}]
+    log_path = tmp_path / "events.log"
+    manager = EventManager(test_config, log_path)
+    await manager.start()
+    
+    encoded = []
+    original = JSONCodec.encode
+    monkeypatch.setattr(
+        JSONCodec, "encode", lambda self, event: encoded.append(event) or original(self, event)
+    )
+    
+    received = []
+    manager.subscribe("plugin:fs_monitor:*", received.append)
+    for i in range(6):
+        await manager.emit(Event.create("plugin:fs_monitor:modified", payload={"i": i}))
+    await manager.emit_many(
+        Event.create("plugin:fs_monitor:modified", payload={"i": i}) for i in range(6, 10)
+    )
+    await manager.stop()
+    
+    assert [event.payload["i"] for event in received] == [0, 4, 8]
+    assert [event.payload["i"] for event in encoded if event.namespace.startswith("plugin")] == [0, 4, 8]
+    assert log_path.read_text().count("plugin:fs_monitor:modified") == 3
+    assert manager.limit_stats()[0]["sampled_out"] == 7
+
+@pytest.mark.asyncio
+async def test_manager_stats(event_manager: EventManager):
+    """Test the counters and histograms recorded for namespaces and subscribers."""
+    async def slow(event: Event):
+        await asyncio.sleep(0.01)
+    
+    def fail(event: Event):
+        raise RuntimeError("boom")
+    
+    event_manager.subscribe("test:stats:*", slow, queue_size=2, overflow="drop_newest")
+    event_manager.subscribe("test:stats:event", fail)
+    for _ in range(5):
+        await event_manager.emit(Event.create("test:stats:event"))
+    await event_manager.join()
+    
+    stats = event_manager.stats()
+    namespace = stats["namespaces"]["test:stats:event"]
+    assert namespace["emitted"] == 5
+    assert namespace["errors"] == 5
+    # Nothing is drained while emitting, so the queue of two overflows
+    assert namespace["dropped"] == 3
+    assert namespace["delivered"] == 7
+    assert namespace["callback"]["count"] == 7
+    assert namespace["callback"]["max"] >= 0.01
+    assert namespace["latency"]["count"] == 7
+    
+    slow_stats, fail_stats = stats["subscriptions"]
+    assert slow_stats["callback_time"]["p50"] >= 0.008
+    assert fail_stats["errors"] == 5
+    json.dumps(stats)
+
+@pytest.mark.asyncio
+async def test_latency_from_event_time(event_manager: EventManager):
+    """Test that latency runs from the event's timestamp, also for inline delivery."""
+    event_manager.subscribe("test:latency:*", lambda event: None, queue_size=0)
+    event = Event.create("test:latency:event")
+    event.time -= 0.05
+    await event_manager.emit(event)
+    await event_manager.join()
+    
+    latency = event_manager.stats()["namespaces"]["test:latency:event"]["latency"]
+    assert latency["count"] == 1
+    assert latency["max"] >= 0.05
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", ["thread", "process"])
+async def test_executor_subscription(test_config: Dict, executor: str):
+    """Test offloading callbacks to the manager's pools."""
+    test_config["events"]["thread_pool_size"] = 2
+    test_config["events"]["process_pool_size"] = 1
+    manager = EventManager(test_config)
+    await manager.start()
+    
+    results = []
+    manager.subscribe(
+        "test:executor:*",
+        payload_total,
+        executor=executor,
+        on_result=lambda event, result: results.append(result)
+    )
+    await manager.emit(Event.create("test:executor:sum", payload={"values": [1, 2, 3]}))
+    await manager.emit(Event.create("test:executor:sum", payload={"values": None}))
+    await manager.join()
+    
+    assert results == [6]
+    assert manager.stats()["namespaces"]["test:executor:sum"]["errors"] == 1
+    assert list(manager._executors) == [executor]
+    await manager.stop()
+    assert manager._executors == {}
+
+def test_invalid_executor_subscription(test_config: Dict):
+    """Test rejecting unknown executors and unpicklable process callbacks."""
+    manager = EventManager(test_config)
+    with pytest.raises(ValueError):
+        manager.subscribe("test:executor:*", payload_total, executor="gpu")
+    with pytest.raises(ValueError):
+        manager.subscribe("test:executor:*", lambda event: None, executor="process")
+    assert manager._executors == {}
+
+@pytest.mark.asyncio
+async def test_where_filter(event_manager: EventManager):
+    """Test that subscriptions only receive events passing their filter."""
+    received = []
+    event_manager.subscribe(
+        "plugin:fs_monitor:*",
+        received.append,
+        where='path startswith "src/" and not is_directory'
+    )
+    for path, is_directory in [("src/a.py", False), ("docs/b.md", False), ("src/c", True)]:
+        await event_manager.emit(Event.create(
+            "plugin:fs_monitor:modified",
+            payload={"path": path, "is_directory": is_directory}
+        ))
+    await event_manager.join()
+    
+    assert [event.payload["path"] for event in received] == ["src/a.py"]
+    assert event_manager.stats()["subscriptions"][0]["filtered"] == 2
+    with pytest.raises(ValueError):
+        event_manager.subscribe("plugin:fs_monitor:*", received.append, where="path ==")
+
+@pytest.mark.asyncio
+async def test_distributed_unmatched_events_not_decoded(test_config: Dict, monkeypatch):
+    """Test that messages let through by prefix filtering are not decoded."""
+    test_config["events"].update({"protocol": "inproc", "port": "test-unmatched"})
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    await manager.start()
+    
+    decoded = []
+    original = JSONCodec.decode
+    monkeypatch.setattr(
+        JSONCodec, "decode", lambda self, data: decoded.append(data) or original(self, data)
+    )
+    
+    received = []
+    # Subscribes to the "plugin:" prefix on the socket
+    manager.subscribe("plugin:*:created", received.append)
+    await asyncio.sleep(0.1)
+    try:
+        await manager.emit(Event.create("plugin:fs_monitor:modified"))
+        await manager.emit(Event.create("plugin:fs_monitor:created"))
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert [event.namespace for event in received] == ["plugin:fs_monitor:created"]
+        assert len(decoded) == 1
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_distributed_compression(test_config: Dict):
+    """Test that large events are compressed on the wire and restored."""
+    test_config["events"].update({
+        "protocol": "inproc", "port": "test-compression", "compress_threshold": 1024,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = False
+    received = []
+    manager.subscribe("test:compress:*", received.append)
+    await manager.start()
+    await asyncio.sleep(0.1)  # Allow the SUB filters to propagate
+    
+    files = [f"src/module_{i}.py" for i in range(500)]
+    try:
+        await manager.emit(Event.create("test:compress:event", payload={"n": 1}))
+        await manager.emit(Event.create("test:compress:event", payload={"n": 2, "files": files}))
+        await manager.emit(Event.create(
+            "test:compress:event", payload={"n": 3, "files": files}, blobs={"diff": b"\x00" * 10}
+        ))
+        for _ in range(50):
+            if len(received) == 3:
+                break
+            await asyncio.sleep(0.02)
+        
+        assert [event.payload["n"] for event in received] == [1, 2, 3]
+        assert received[1].payload["files"] == files
+        assert received[2].blobs["diff"] == b"\x00" * 10
+        compression = manager.stats()["compression"]
+        assert compression["messages"] == 2
+        assert compression["bytes_out"] < compression["bytes_in"] / 2
+    finally:
+        await manager.stop()
+
+def test_compression_defaults(test_config: Dict):
+    """Test that compression is on by default only for tcp to other hosts."""
+    assert EventManager(test_config)._compressor.threshold == 0
+    test_config["events"]["host"] = "10.0.0.5"
+    assert EventManager(test_config)._compressor.threshold == 65536
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_events(event_manager: EventManager):
+    """Test that stop delivers queued events and reports the drain."""
+    received = []
+    
+    async def callback(event: Event):
+        await asyncio.sleep(0.001)
+        received.append(event)
+    
+    event_manager.subscribe("test:drain:*", callback)
+    for i in range(20):
+        await event_manager.emit(Event.create("test:drain:event", payload={"i": i}))
+    report = await event_manager.stop()
+    
+    assert len(received) == 20
+    assert report["delivered"] >= 1
+    assert report["dropped"] == 0
+    assert report["cancelled"] == 0
+    assert not report["timed_out"]
+
+@pytest.mark.asyncio
+async def test_shutdown_delivered_after_pending_events(test_config: Dict):
+    """Test that events held before stop() arrive ahead of the shutdown event."""
+    test_config["events"]["coalesce"] = [
+        {"pattern": "plugin:fs:*", "key": "path", "window": 10}
+    ]
+    manager = EventManager(test_config)
+    await manager.start()
+    
+    received = []
+    manager.subscribe("*:*:*", lambda event: received.append(event.namespace))
+    await manager.emit(Event.create("plugin:fs:modified", payload={"path": "a.py"}))
+    await manager.stop()
+    
+    assert received == ["plugin:fs:modified", "core:system:shutdown"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("local", [True, False])
+async def test_stop_deadline(test_config: Dict, local: bool):
+    """Test that a stuck subscriber cannot delay stop beyond the deadline."""
+    test_config["events"].update({
+        "protocol": "inproc", "port": f"test-drain-{local}", "drain_timeout": 0.2,
+    })
+    manager = EventManager(test_config)
+    manager._local_mode = local
+    await manager.start()
+    
+    async def stuck(event: Event):
+        await asyncio.sleep(60)
+    
+    manager.subscribe("test:drain:*", stuck, timeout=0)
+    await asyncio.sleep(0.05)
+    for i in range(5):
+        await manager.emit(Event.create("test:drain:event", payload={"i": i}))
+    await asyncio.sleep(0.05)
+    report = await asyncio.wait_for(manager.stop(), timeout=2)
+    
+    assert report["timed_out"]
+    assert report["duration"] < 1
+    assert report["cancelled"] == 1
+    assert report["dropped"] == 4
+    assert manager.publisher is None and manager._subscriber_task is None
+
+async def start_peers(test_config: Dict, port: str, **settings):
+    """Start a broker and two distributed managers connected through it."""
+    test_config["events"].update({
+        "protocol": "inproc", "port": port, "broker": True, "heartbeat_interval": 0.05,
+        **settings,
+    })
+    broker = EventBroker(test_config)
+    await broker.start()
+    managers = [EventManager(test_config), EventManager(test_config)]
+    for manager in managers:
+        manager._local_mode = False
+        await manager.start()
+    return broker, managers
+
+async def wait_until(condition, timeout: float = 2.0) -> None:
+    """Poll a condition until it holds or the timeout expires."""
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+
+@pytest.mark.asyncio
+async def test_heartbeats_track_peers(test_config: Dict):
+    """Test that managers see each other's heartbeats and notice silence."""
+    broker, (first, second) = await start_peers(test_config, "test-heartbeat")
+    try:
+        await wait_until(lambda: first.peer in second.peer_stats()["peers"]
+                         and second.peer in first.peer_stats()["peers"])
+        peers = second.stats()["heartbeat"]["peers"]
+        assert peers[first.peer]["lag"] < 1
+        assert not peers[first.peer]["stale"]
+        
+        await first.stop()
+        await wait_until(lambda: second.peer_stats()["peers"][first.peer]["stale"])
+        assert second.peer_stats()["peers"][first.peer]["stale"]
+    finally:
+        await first.stop()
+        await second.stop()
+        await broker.stop()
+
+@pytest.mark.asyncio
+async def test_heartbeats_not_dispatched(test_config: Dict):
+    """Test that heartbeats are handled internally, not delivered to subscribers."""
+    broker, (first, second) = await start_peers(test_config, "test-heartbeat-private")
+    received = []
+    try:
+        second.subscribe("*:*:*", received.append)
+        await wait_until(lambda: first.peer in second.peer_stats()["peers"])
+        # Several heartbeat intervals
+        await asyncio.sleep(0.2)
+        await first.emit(Event.create("plugin:test:event", {"value": 1}))
+        await wait_until(lambda: received)
+        
+        assert [event.namespace for event in received] == ["plugin:test:event"]
+    finally:
+        await first.stop()
+        await second.stop()
+        await broker.stop()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["warn", "shed", "disconnect"])
+async def test_slow_consumer_policy(test_config: Dict, policy: str):
+    """Test detecting a lagging consumer and applying its policy."""
+    broker, (publisher, consumer) = await start_peers(
+        test_config, f"test-slow-{policy}",
+        slow_consumer_lag=1.0, slow_consumer_policy=policy
+    )
+    received = []
+    notices = []
+    consumer.subscribe("test:slow:*", received.append)
+    consumer.subscribe("core:system:slow_consumer", notices.append)
+    socket = consumer.subscriber
+    try:
+        await wait_until(lambda: publisher.peer in consumer.peer_stats()["peers"])
+        
+        # Heartbeats now look ten seconds old on arrival
+        wall = consumer._peers._wall
+        consumer._peers._wall = lambda: wall() + 10
+        await wait_until(lambda: notices)
+        assert notices[0].payload["slow"]
+        assert notices[0].payload["peer"] == consumer.peer
+        
+        if policy == "shed":
+            await publisher.emit(Event.create("test:slow:event", payload={"n": 1}))
+            await wait_until(lambda: consumer.event_stats.namespace("test:slow:event").dropped)
+            assert received == []
+        elif policy == "disconnect":
+            await wait_until(lambda: consumer.subscriber is not socket)
+            assert consumer.subscriber is not socket
+        else:
+            assert consumer.peer_stats()["slow"]
+        
+        # Once heartbeats arrive in time again, events flow
+        consumer._peers._wall = wall
+        await wait_until(lambda: not consumer.peer_stats()["slow"])
+        await asyncio.sleep(0.1)
+        await publisher.emit(Event.create("test:slow:event", payload={"n": 2}))
+        await wait_until(lambda: received)
+        assert [event.payload["n"] for event in received] == [2]
+    finally:
+        await publisher.stop()
+        await consumer.stop()
+        await broker.stop()
+
+def test_invalid_slow_consumer_policy(test_config: Dict):
+    """Test rejecting unknown slow consumer policies."""
+    test_config["events"]["slow_consumer_policy"] = "ignore"
+    with pytest.raises(ValueError):
+        EventManager(test_config)
+
+@pytest.mark.asyncio
+async def test_duplicate_events_dropped(test_config: Dict, tmp_path: Path):
+    """Test that repeated idempotency keys skip dispatch and logging."""
+    log_path = tmp_path / "events.log"
+    manager = EventManager(test_config, log_path)
+    await manager.start()
+    
+    received = []
+    manager.subscribe("core:file:*", received.append)
+    await manager.emit(Event.create("core:file:created", payload={"n": 1}, idempotency_key="a"))
+    await manager.emit(Event.create("core:file:created", payload={"n": 2}, idempotency_key="a"))
+    await manager.emit(Event.create("core:file:deleted", payload={"n": 3}, idempotency_key="a"))
+    await manager.emit_many([
+        Event.create("core:file:created", payload={"n": 4}, idempotency_key="b"),
+        Event.create("core:file:created", payload={"n": 5}, idempotency_key="b"),
+        Event.create("core:file:created", payload={"n": 6}),
+        Event.create("core:file:created", payload={"n": 7}),
+    ])
+    await manager.stop()
+    
+    assert [event.payload["n"] for event in received] == [1, 3, 4, 6, 7]
+    assert log_path.read_text().count("core:file:") == 5
+    assert manager.event_stats.namespace("core:file:created").duplicates == 2
+    stats = manager.stats()["dedup"]["emit"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+
+@pytest.mark.asyncio
+async def test_duplicates_from_peers_dropped(test_config: Dict):
+    """Test that duplicates published by different peers are delivered once."""
+    broker, (first, second) = await start_peers(
+        test_config, "test-dedup", heartbeat_interval=0
+    )
+    received = []
+    second.subscribe("test:dedup:*", received.append)
+    try:
+        await asyncio.sleep(0.1)
+        for manager in (first, second, first):
+            await manager.emit(Event.create("test:dedup:event", idempotency_key="a"))
+        await manager.emit(Event.create("test:dedup:event", idempotency_key="b"))
+        await wait_until(lambda: len(received) == 2)
+        await asyncio.sleep(0.05)
+        
+        assert [event.idempotency_key for event in received] == ["a", "b"]
+        assert second.dedup_stats()["receive"]["hits"] == 1
+        assert first.dedup_stats()["emit"]["hits"] == 1
+    finally:
+        await first.stop()
+        await second.stop()
+        await broker.stop()
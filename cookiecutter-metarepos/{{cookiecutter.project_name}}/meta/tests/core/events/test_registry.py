@@ -0,0 +1,67 @@
+"""
+Tests for the event namespace registry.
+"""
+import sys
+
+import pytest
+
+from core.events import CORE_EVENTS, Event, NamespaceRegistry, namespace_registry
+from core.events.registry import check_namespace
+
+def test_register_assigns_ids():
+    """Test that namespaces are numbered once, in registration order."""
+    registry = NamespaceRegistry()
+    
+    assert registry.register("test:registry:first") == 0
+    assert registry.register("test:registry:second") == 1
+    assert registry.register("test:registry:first") == 0
+    assert registry.id("test:registry:second") == 1
+    assert registry.id("test:registry:missing") is None
+    assert registry.name(1) == "test:registry:second"
+    assert len(registry) == 2
+    with pytest.raises(ValueError):
+        registry.name(2)
+
+def test_registered_namespaces_interned():
+    """Test that a registered namespace is the interned string."""
+    registry = NamespaceRegistry()
+    namespace = "".join(["test:", "registry:", "interned"])
+    registry.register(namespace)
+    
+    assert registry.name(0) is sys.intern(namespace)
+
+def test_validate_registers_valid_namespaces(monkeypatch):
+    """Test that each namespace is only checked once."""
+    registry = NamespaceRegistry()
+    checked = []
+    monkeypatch.setattr(
+        "core.events.registry.check_namespace",
+        lambda namespace: checked.append(namespace) or check_namespace(namespace)
+    )
+    
+    for _ in range(3):
+        assert registry.validate("test:registry:event")
+        assert not registry.validate("invalid:namespace")
+    
+    assert checked.count("test:registry:event") == 1
+    assert checked.count("invalid:namespace") == 3
+    assert "invalid:namespace" not in registry
+
+def test_full_registry():
+    """Test that a full registry still validates but registers nothing more."""
+    registry = NamespaceRegistry(max_size=1)
+    registry.register("test:registry:first")
+    
+    assert registry.validate("test:registry:second")
+    assert "test:registry:second" not in registry
+    with pytest.raises(ValueError):
+        registry.register("test:registry:second")
+    with pytest.raises(ValueError):
+        NamespaceRegistry().register("invalid:namespace")
+
+def test_core_events_preregistered():
+    """Test that core namespaces are registered at import."""
+    assert all(namespace in namespace_registry for namespace in CORE_EVENTS)
+    
+    event = Event.create("core:file:created")
+    assert namespace_registry.name(event.namespace_id) is event.namespace
@@ -0,0 +1,98 @@
+"""
+Tests for reading events back from the event log.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from core.events import Event, EventLogReader, JSONCodec
+
+def write_log(path: Path, events) -> None:
+    """Write events to a log file the way EventLogWriter does."""
+    codec = JSONCodec()
+    with open(path, "ab") as f:
+        for event in events:
+            f.write(codec.serialize(event) + b"\n")
+
+def make_events(count: int, namespace: str = "test:replay:event"):
+    """Create events one second apart."""
+    start = datetime(2024, 1, 1)
+    return [
+        Event(namespace, start + timedelta(seconds=i), {}, {"seq": i})
+        for i in range(count)
+    ]
+
+def test_read_all(tmp_path: Path):
+    """Test reading every event with its offset."""
+    log_path = tmp_path / "events.log"
+    write_log(log_path, make_events(3))
+    
+    records = list(EventLogReader(log_path).read())
+    assert [offset for offset, _, _ in records] == [0, 1, 2]
+    assert [event.payload["seq"] for _, _, event in records] == [0, 1, 2]
+
+def test_read_since_offset(tmp_path: Path):
+    """Test replaying from an offset."""
+    log_path = tmp_path / "events.log"
+    write_log(log_path, make_events(5))
+    
+    records = list(EventLogReader(log_path).read(offset=3))
+    assert [event.payload["seq"] for _, _, event in records] == [3, 4]
+
+def test_read_since_timestamp(tmp_path: Path):
+    """Test replaying from a datetime or epoch seconds, whole or not."""
+    log_path = tmp_path / "events.log"
+    events = make_events(5)
+    write_log(log_path, events)
+    reader = EventLogReader(log_path)
+    
+    since = events[2].timestamp
+    assert [e.payload["seq"] for _, _, e in reader.read(since=since)] == [2, 3, 4]
+    
+    epoch = (events[3].timestamp - datetime(1970, 1, 1)).total_seconds()
+    assert [e.payload["seq"] for _, _, e in reader.read(since=epoch)] == [3, 4]
+    # Whole seconds are a time too, not an offset
+    assert [e.payload["seq"] for _, _, e in reader.read(since=int(epoch))] == [3, 4]
+
+def test_read_filters_pattern(tmp_path: Path):
+    """Test that only events matching the pattern are replayed."""
+    log_path = tmp_path / "events.log"
+    write_log(log_path, make_events(2, "test:replay:a") + make_events(2, "test:other:b"))
+    
+    records = list(EventLogReader(log_path).read("test:replay:*"))
+    assert [event.namespace for _, _, event in records] == ["test:replay:a"] * 2
+    # Offsets still count every record in the log
+    assert list(EventLogReader(log_path).read("test:other:*"))[0][0] == 2
+
+def test_read_rotated_backups(tmp_path: Path):
+    """Test that rotated backups are read oldest first."""
+    log_path = tmp_path / "events.log"
+    events = make_events(6)
+    write_log(log_path.with_suffix(".2"), events[:2])
+    write_log(log_path.with_suffix(".1"), events[2:4])
+    write_log(log_path, events[4:])
+    
+    records = list(EventLogReader(log_path, backup_count=5).read())
+    assert [event.payload["seq"] for _, _, event in records] == list(range(6))
+
+def test_read_skips_other_lines(tmp_path: Path):
+    """Test that log handler messages sharing the file are skipped."""
+    log_path = tmp_path / "events.log"
+    log_path.write_text("2024-01-01 00:00:00 - core.events - INFO - started\n")
+    write_log(log_path, make_events(1))
+    
+    records = list(EventLogReader(log_path).read())
+    assert len(records) == 1
+    assert records[0][0] == 0
+    assert records[0][1] == JSONCodec().serialize(records[0][2])
+
+def test_read_invalid_since(tmp_path: Path):
+    """Test rejecting an invalid starting point."""
+    reader = EventLogReader(tmp_path / "events.log")
+    with pytest.raises(ValueError):
+        list(reader.read(offset=-1))
+    with pytest.raises(ValueError):
+        list(reader.read(offset=1.5))
+    with pytest.raises(ValueError):
+        list(reader.read(since="2024-01-01"))
@@ -0,0 +1,182 @@
+"""
+Tests for request/reply calls between plugins.
+"""
+import asyncio
+from typing import Dict
+
+import pytest
+import pytest_asyncio
+
+from core.events import RPCClient, RPCError, RPCServer, RPCTimeout
+from core.events.rpc import CALL
+
+@pytest_asyncio.fixture
+async def rpc(test_config: Dict, request: pytest.FixtureRequest):
+    """Provide a started RPC server and a client connected to it."""
+    # Closed inproc sockets release their address asynchronously, so every
+    # test binds its own
+    test_config["events"].update({"protocol": "inproc", "port": f"test-rpc-{request.node.name}"})
+    server = RPCServer(test_config)
+    client = RPCClient(test_config)
+    await server.start()
+    await client.start()
+    yield server, client
+    await client.stop()
+    await server.stop()
+
+@pytest.mark.asyncio
+async def test_call(rpc):
+    """Test calling plain and coroutine handlers."""
+    server, client = rpc
+    server.register("test:math:add", lambda params: params["a"] + params["b"])
+    
+    async def templates(params):
+        return ["python", "node"]
+    
+    server.register("project_gen:templates:list", templates)
+    
+    assert await client.call("test:math:add", {"a": 1, "b": 2}) == 3
+    assert await client.call("project_gen:templates:list") == ["python", "node"]
+    assert server.calls == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_calls(rpc):
+    """Test that replies are matched to calls when they arrive out of order."""
+    server, client = rpc
+    
+    async def sleep(params):
+        await asyncio.sleep(params["delay"])
+        return params["delay"]
+    
+    server.register("test:rpc:sleep", sleep)
+    delays = [0.05, 0.01, 0.03, 0.0]
+    results = await asyncio.gather(
+        *(client.call("test:rpc:sleep", {"delay": delay}) for delay in delays)
+    )
+    assert results == delays
+    assert client.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_call_errors(rpc):
+    """Test that handler failures and unknown methods raise RPCError."""
+    server, client = rpc
+    
+    def fail(params):
+        raise RuntimeError("boom")
+    
+    server.register("test:rpc:fail", fail)
+    with pytest.raises(RPCError, match="RuntimeError: boom"):
+        await client.call("test:rpc:fail")
+    with pytest.raises(RPCError, match="Unknown RPC method"):
+        await client.call("test:rpc:missing")
+    assert server.errors == 2
+
+@pytest.mark.asyncio
+async def test_call_timeout_cancels_handler(rpc):
+    """Test that a timed out call cancels the remote handler."""
+    server, client = rpc
+    started = asyncio.Event()
+    
+    async def hang(params):
+        started.set()
+        await asyncio.sleep(10)
+    
+    server.register("test:rpc:hang", hang)
+    with pytest.raises(RPCTimeout):
+        await client.call("test:rpc:hang", timeout=0.05)
+    
+    assert started.is_set()
+    for _ in range(50):
+        if server.cancelled:
+            break
+        await asyncio.sleep(0.01)
+    assert server.cancelled == 1
+    assert server.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_call_cancels_handler(rpc):
+    """Test that cancelling the calling task cancels the remote handler."""
+    server, client = rpc
+    started = asyncio.Event()
+    
+    async def hang(params):
+        started.set()
+        await asyncio.sleep(10)
+    
+    server.register("test:rpc:hang", hang)
+    call = asyncio.create_task(client.call("test:rpc:hang"))
+    await started.wait()
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    
+    for _ in range(50):
+        if server.cancelled:
+            break
+        await asyncio.sleep(0.01)
+    assert server.cancelled == 1
+
+@pytest.mark.asyncio
+async def test_undecodable_method_name(rpc):
+    """Test that a non-UTF-8 method name gets an error reply, not a dead server."""
+    server, client = rpc
+    server.register("test:math:add", lambda params: params["a"] + params["b"])
+    
+    reply = asyncio.get_running_loop().create_future()
+    client._pending[b"raw"] = reply
+    await client._socket.send_multipart([b"", CALL, b"raw", b"\xff\xfe", b""])
+    with pytest.raises(RPCError, match="Unknown RPC method"):
+        await asyncio.wait_for(reply, 1)
+    
+    assert await client.call("test:math:add", {"a": 1, "b": 2}) == 3
+
+@pytest.mark.asyncio
+async def test_failed_cancellation_logged(rpc, monkeypatch, caplog):
+    """Test that a cancellation that cannot be sent is reported."""
+    _, client = rpc
+    
+    def fail(frames):
+        sent = asyncio.get_running_loop().create_future()
+        sent.set_exception(RuntimeError("socket closed"))
+        return sent
+    
+    monkeypatch.setattr(client._socket, "send_multipart", fail)
+    client._cancel(b"1")
+    await asyncio.sleep(0)
+    
+    assert "Failed to send RPC cancellation: socket closed" in caplog.text
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, body", [(b"ok", b"{not json"), (b"error", b"{}")])
+async def test_malformed_reply(rpc, monkeypatch, caplog, status: bytes, body: bytes):
+    """Test that a malformed reply fails its call without stopping the client."""
+    server, client = rpc
+    server.register("test:math:add", lambda params: params["a"] + params["b"])
+    
+    send = server._socket.send_multipart
+    
+    def corrupt(frames):
+        monkeypatch.setattr(server._socket, "send_multipart", send)
+        return send(frames[:3] + [status, body])
+    
+    monkeypatch.setattr(server._socket, "send_multipart", corrupt)
+    with pytest.raises(RPCError, match="Malformed RPC reply"):
+        await client.call("test:math:add", {"a": 1, "b": 2}, timeout=1)
+    
+    assert "Dropping malformed RPC reply" in caplog.text
+    assert await client.call("test:math:add", {"a": 1, "b": 2}, timeout=1) == 3
+
+def test_register_twice(test_config: Dict):
+    """Test that a method can only have one handler."""
+    server = RPCServer(test_config)
+    server.register("test:rpc:method", print)
+    with pytest.raises(ValueError):
+        server.register("test:rpc:method", print)
+    server.unregister("test:rpc:method")
+    server.register("test:rpc:method", print)
+
+@pytest.mark.asyncio
+async def test_call_before_start(test_config: Dict):
+    """Test that calling requires a started client."""
+    with pytest.raises(RuntimeError):
+        await RPCClient(test_config).call("test:rpc:method")
@@ -1,11 +1,13 @@
 """
 Tests for event schema functionality.
 """
-from datetime import datetime
+import pickle
+import sys
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from core.events.schema import Event, validate_event_namespace
+from core.events.schema import Event, validate_event_namespace, validate_subscription_pattern
 
 def test_event_creation():
     """Test basic event creation."""
@@ -67,6 +69,17 @@ def test_validate_event_namespace():
     assert not validate_event_namespace("invalid:name$space:here")
     assert not validate_event_namespace(":empty:parts:")
 
+def test_validate_subscription_pattern():
+    """Test subscription pattern validation."""
+    assert validate_subscription_pattern("core:system:start")
+    assert validate_subscription_pattern("plugin:fs_monitor:*")
+    assert validate_subscription_pattern("core:*:*")
+    assert validate_subscription_pattern("*:*:*")
+    
+    assert not validate_subscription_pattern("core:*")
+    assert not validate_subscription_pattern("core:sys*:start")
+    assert not validate_subscription_pattern("core:**:start")
+
 def test_event_without_optional_fields():
     """Test event creation without optional fields."""
     event = Event(
@@ -96,4 +109,38 @@ def test_event_with_empty_fields():
 def test_invalid_event_namespace():
     """Test event creation with invalid namespace."""
     with pytest.raises(ValueError):
-        Event.create("invalid:namespace")
\ No newline at end of file
+        Event.create("invalid:namespace")
+
+def test_event_is_compact():
+    """Test that events use slots, intern namespaces and defer empty fields."""
+    event = Event.create("test:event:created")
+    
+    assert not hasattr(event, "__dict__")
+    assert event.namespace is sys.intern("test:event:created")
+    assert isinstance(event.time, float)
+    assert event._metadata is None and event._payload is None
+    assert event.timestamp == datetime(1970, 1, 1) + timedelta(seconds=event.time)
+
+def test_event_timestamp_conversion():
+    """Test that datetimes, including aware ones, are stored as epoch seconds."""
+    naive = Event("test:event:created", datetime(2024, 1, 2, 3, 4, 5, 678901))
+    aware = Event(
+        "test:event:created",
+        datetime(2024, 1, 2, 4, 4, 5, 678901, tzinfo=timezone(timedelta(hours=1)))
+    )
+    
+    assert naive.timestamp == datetime(2024, 1, 2, 3, 4, 5, 678901)
+    assert aware.time == naive.time
+    assert naive == aware
+    
+    untimed = Event("test:event:created", None)
+    assert untimed.to_dict()["timestamp"] is None
+    assert Event.from_dict(untimed.to_dict()) == untimed
+
+def test_event_pickle_round_trip():
+    """Test that events survive pickling, e.g. for process pools."""
+    event = Event.create("test:event:created", payload={"n": 1}, metadata={"m": 2})
+    restored = pickle.loads(pickle.dumps(event))
+    
+    assert restored == event
+    assert restored.payload == {"n": 1}
@@ -0,0 +1,43 @@
+"""
+Tests for event statistics.
+"""
+import pytest
+
+from core.events.stats import EventStats, Histogram
+
+def test_histogram_percentiles():
+    """Test percentiles within the power-of-two bucket bounds."""
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.record(0.0001)
+    for _ in range(10):
+        histogram.record(0.01)
+    
+    assert histogram.count == 100
+    assert 0.0001 <= histogram.percentile(0.5) < 0.0002
+    assert histogram.percentile(0.99) == 0.01
+    assert histogram.max == 0.01
+    assert histogram.summary()["mean"] == pytest.approx(0.00109)
+
+def test_histogram_extremes():
+    """Test empty histograms and durations beyond the last bucket."""
+    histogram = Histogram()
+    assert histogram.percentile(0.99) == 0.0
+    assert histogram.summary()["count"] == 0
+    
+    histogram.record(0.0)
+    histogram.record(1e6)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(1.0) == 1e6
+
+def test_event_stats_by_namespace():
+    """Test that statistics are kept per namespace."""
+    stats = EventStats()
+    stats.namespace("test:stats:b").emitted += 2
+    stats.namespace("test:stats:a").dropped += 1
+    
+    data = stats.to_dict()
+    assert list(data) == ["test:stats:a", "test:stats:b"]
+    assert data["test:stats:b"]["emitted"] == 2
+    assert data["test:stats:a"]["latency"]["count"] == 0
@@ -0,0 +1,35 @@
+"""
+Tests for event transport helpers.
+"""
+import pytest
+
+from core.events import shared_context
+from core.events.transport import event_address, rpc_address
+
+def test_event_address():
+    """Test the publisher address for each protocol."""
+    assert event_address({"events": {"port": 5555}}) == "tcp://127.0.0.1:5555"
+    assert event_address({"events": {"port": 5555, "protocol": "ipc"}}) == (
+        "ipc:///tmp/metarepos-events-5555"
+    )
+    assert event_address({"events": {"port": 5555, "protocol": "inproc"}}) == (
+        "inproc://metarepos-events-5555"
+    )
+    with pytest.raises(ValueError):
+        event_address({"events": {"protocol": "udp"}})
+
+def test_rpc_address():
+    """Test the RPC server address for each protocol."""
+    assert rpc_address({"events": {"port": 5555}}) == "tcp://127.0.0.1:5557"
+    assert rpc_address({"events": {"port": 5555, "protocol": "inproc"}}) == (
+        "inproc://metarepos-rpc-5555"
+    )
+    assert rpc_address({"events": {"rpc_address": "tcp://10.0.0.1:6000"}}) == (
+        "tcp://10.0.0.1:6000"
+    )
+    with pytest.raises(ValueError):
+        rpc_address({"events": {"protocol": "udp"}})
+
+def test_shared_context_is_singleton():
+    """Test that every component gets the same context."""
+    assert shared_context() is shared_context()
@@ -0,0 +1,63 @@
+"""
+Tests for the namespace trie.
+"""
+import pytest
+
+from core.events.trie import NamespaceTrie, zmq_prefix
+
+@pytest.fixture
+def trie() -> NamespaceTrie:
+    """Provide a trie with a mix of exact and wildcard patterns."""
+    trie = NamespaceTrie()
+    trie.add("plugin:fs_monitor:modified", "exact")
+    trie.add("plugin:fs_monitor:*", "component")
+    trie.add("core:*:*", "category")
+    trie.add("*:*:*", "all")
+    return trie
+
+def test_exact_and_wildcard_matching(trie: NamespaceTrie):
+    """Test that every matching pattern is returned."""
+    assert sorted(trie.match("plugin:fs_monitor:modified")) == ["all", "component", "exact"]
+    assert sorted(trie.match("plugin:fs_monitor:created")) == ["all", "component"]
+    assert sorted(trie.match("core:system:startup")) == ["all", "category"]
+    assert trie.match("plugin:project_gen:created") == ["all"]
+
+def test_no_match_for_different_depth():
+    """Test that patterns only match namespaces of the same depth."""
+    trie = NamespaceTrie()
+    trie.add("core:system:*", "value")
+    
+    assert trie.match("core:system") == []
+    assert trie.match("core:system:startup:extra") == []
+
+def test_remove(trie: NamespaceTrie):
+    """Test removing values and pruning empty branches."""
+    assert len(trie) == 4
+    assert trie.remove("plugin:fs_monitor:*", "component")
+    assert not trie.remove("plugin:fs_monitor:*", "component")
+    assert not trie.remove("missing:pattern:here", "value")
+    
+    assert sorted(trie.match("plugin:fs_monitor:created")) == ["all"]
+    assert len(trie) == 3
+    
+    trie.remove("plugin:fs_monitor:modified", "exact")
+    assert "plugin" not in trie._root.children
+
+def test_zmq_prefix():
+    """Test conversion of patterns to ZMQ subscription prefixes."""
+    assert zmq_prefix("core:system:startup") == "core:system:startup"
+    assert zmq_prefix("plugin:fs_monitor:*") == "plugin:fs_monitor:"
+    assert zmq_prefix("core:*:*") == "core:"
+    assert zmq_prefix("core:*:startup") == "core:"
+    assert zmq_prefix("*:*:*") == ""
+
+def test_matches_cached_until_patterns_change(trie: NamespaceTrie):
+    """Test that repeated lookups reuse the dispatch table."""
+    first = trie.match("core:system:startup")
+    assert trie.match("core:system:startup") is first
+    
+    trie.add("core:system:*", "component")
+    assert sorted(trie.match("core:system:startup")) == ["all", "category", "component"]
+    
+    trie.remove("core:system:*", "component")
+    assert sorted(trie.match("core:system:startup")) == ["all", "category"]
@@ -0,0 +1,123 @@
+"""
+Tests for the group-commit event log writer.
+"""
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from core.events import Event, EventLogWriter
+
+def make_events(count: int, size: int = 0):
+    """Create numbered test events."""
+    return [
+        Event.create("test:writer:event", payload={"index": i, "data": "x" * size})
+        for i in range(count)
+    ]
+
+@pytest.mark.asyncio
+async def test_write_is_deferred(tmp_path: Path):
+    """Test that write only queues events until a flush."""
+    log_path = tmp_path / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=10)
+    await writer.start()
+    
+    writer.write(make_events(3))
+    assert writer.pending == 3
+    assert log_path.read_bytes() == b""
+    
+    await writer.flush()
+    lines = log_path.read_text().splitlines()
+    assert [json.loads(line)["payload"]["index"] for line in lines] == [0, 1, 2]
+    assert writer.stats() == {
+        "pending": 0,
+        "written": 3,
+        "batches": 1,
+        "size": log_path.stat().st_size,
+    }
+    await writer.stop()
+
+@pytest.mark.asyncio
+async def test_periodic_flush(tmp_path: Path):
+    """Test that queued events are written after the flush interval."""
+    log_path = tmp_path / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=0.01)
+    await writer.start()
+    
+    writer.write(make_events(2))
+    await asyncio.sleep(0.1)
+    
+    assert len(log_path.read_text().splitlines()) == 2
+    await writer.stop()
+
+@pytest.mark.asyncio
+async def test_full_batch_triggers_write(tmp_path: Path):
+    """Test that reaching the batch size wakes the writer early."""
+    log_path = tmp_path / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=10, batch_size=5)
+    await writer.start()
+    
+    writer.write(make_events(5))
+    await asyncio.sleep(0.1)
+    
+    assert writer.written == 5
+    await writer.stop()
+
+@pytest.mark.asyncio
+async def test_stop_writes_pending_events(tmp_path: Path):
+    """Test that stopping the writer flushes queued events."""
+    log_path = tmp_path / "logs" / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=10)
+    await writer.start()
+    
+    writer.write(make_events(4))
+    await writer.stop()
+    
+    assert len(log_path.read_text().splitlines()) == 4
+
+@pytest.mark.asyncio
+async def test_size_rotation(tmp_path: Path):
+    """Test that the log is rotated using the size tracked in memory."""
+    log_path = tmp_path / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=10, max_size=500)
+    await writer.start()
+    
+    for event in make_events(5, size=200):
+        writer.write([event])
+        await writer.flush()
+    await writer.stop()
+    
+    assert (tmp_path / "events.1").exists()
+    assert log_path.stat().st_size <= 500
+
+@pytest.mark.asyncio
+async def test_group_fsync(tmp_path: Path, monkeypatch):
+    """Test that fsync is issued once per batch."""
+    synced = []
+    monkeypatch.setattr("core.events.writer.os.fsync", synced.append)
+    
+    writer = EventLogWriter(tmp_path / "events.log", flush_interval=10, fsync=True)
+    await writer.start()
+    writer.write(make_events(10))
+    await writer.flush()
+    await writer.stop()
+    
+    assert len(synced) == 1
+
+@pytest.mark.asyncio
+async def test_unencodable_event_skipped(tmp_path: Path, caplog):
+    """Test that an event that cannot be encoded does not lose its batch."""
+    log_path = tmp_path / "events.log"
+    writer = EventLogWriter(log_path, flush_interval=10)
+    await writer.start()
+    
+    first, last = make_events(2)
+    bad = Event.create("test:writer:event", payload={"path": tmp_path})
+    writer.write([first, bad, last])
+    await writer.flush()
+    await writer.stop()
+    
+    lines = log_path.read_text().splitlines()
+    assert [json.loads(line)["payload"]["index"] for line in lines] == [0, 1]
+    assert "Failed to log event test:writer:event" in caplog.text